@@ -1,4 +1,15 @@
-function writeNamespace(namespaceName, saveDir)
+function generationInfo = writeNamespace(namespaceName, saveDir)
+% writeNamespace - Write the classes of a namespace to +types/+<namespace>.
+%
+% Class files are only written if their content changed, so existing files
+% (and MATLAB's caches of them) are kept when a namespace is generated
+% again.
+%
+% Returns a struct with the fields Namespace, NumGenerated (number of class
+% files written), NumUnchanged (number of class files kept) and ElapsedTime
+% (in seconds).
+timer = tic();
+
 %check/load dependency namespaces
 Namespace = schemes.loadNamespace(namespaceName, saveDir);
 
@@ -10,6 +21,8 @@ if ~isfolder(classFileDir)
 end
 
 classes = keys(Namespace.registry);
+numGenerated = 0;
+numUnchanged = 0;
 pregenerated = containers.Map; %generated nodes and props for faster dependency resolution
 for i=1:length(classes)
     className = classes{i};
@@ -21,15 +34,34 @@ for i=1:length(classes)
             [~, superClassProps{iSuper-1}, ~] =  file.processClass(processed(iSuper).type, Namespace, pregenerated);
         end
 
-        fid = fopen(fullfile(classFileDir, [className '.m']), 'W');
-        % Create cleanup object to close to file in case the write operation fails.
-        fileCleanupObj = onCleanup(@(id) fclose(fid));
-        fwrite(fid, file.fillClass(className, Namespace, processed, ...
-            classprops, inherited, superClassProps), 'char');
+        classDefinition = char(file.fillClass(className, Namespace, processed, ...
+            classprops, inherited, superClassProps));
+        if writeIfChanged(fullfile(classFileDir, [className '.m']), classDefinition)
+            numGenerated = numGenerated + 1;
+        else
+            numUnchanged = numUnchanged + 1;
+        end
     else
         % pass
     end
 end
+
+generationInfo = struct( ...
+    'Namespace', Namespace.name, ...
+    'NumGenerated', numGenerated, ...
+    'NumUnchanged', numUnchanged, ...
+    'ElapsedTime', toc(timer));
+end
+
+function isWritten = writeIfChanged(filePath, content)
+% writeIfChanged - Write a file unless it already has the given content.
+isWritten = ~isfile(filePath) || ~strcmp(fileread(filePath), content);
+if isWritten
+    fid = fopen(filePath, 'W');
+    % Create cleanup object to close to file in case the write operation fails.
+    fileCleanupObj = onCleanup(@(id) fclose(fid));
+    fwrite(fid, content, 'char');
+end
 end
 
 function writeNamespaceVersion(classFileDir, version)
@@ -51,6 +83,10 @@ function writeNamespaceVersion(classFileDir, version)
         classFileDir, ...
         matnwb.common.constant.VERSIONFILE);
     
+    if isfile(namespaceVersionFilename) ...
+            && strcmp(fileread(namespaceVersionFilename), functionDefinition)
+        return
+    end
     fid = fopen(namespaceVersionFilename, 'wt');
     fwrite(fid, functionDefinition);
     fclose(fid);
@@ -4,6 +4,10 @@ classdef LazyArray < handle
 % DataStub owns the public lazy dataset API exposed by MatNWB, while
 % LazyArray implementations encapsulate storage-specific metadata
 % discovery and indexed reads.
+%
+% Implementations which support chunked datasets can serve reads from
+% io.backend.ChunkCache by implementing getChunkSize and readRegion, and
+% calling readFromChunkCache when canReadFromChunkCache is true.
 
     properties (SetAccess = protected)
         % Filename - The path name of a file containing the dataset
@@ -90,6 +94,117 @@ classdef LazyArray < handle
         end
     end
 
+    methods (Access = protected) % Chunk cache support
+        function chunkSize = getChunkSize(obj) %#ok<MANU>
+        % getChunkSize - Chunk size of the dataset, or empty if the dataset
+        % is not chunked.
+            chunkSize = [];
+        end
+
+        function data = readRegion(obj, start, count) %#ok<INUSD>
+        % readRegion - Read the block of count elements starting at start
+        % (1-indexed, MATLAB dimension order).
+            data = [];
+            io.backend.base.LazyArray.throwNotImplemented("readRegion")
+        end
+
+        function keyPrefix = getChunkCacheKeyPrefix(obj)
+        % getChunkCacheKeyPrefix - Prefix of the keys of the chunks of the
+        % dataset in io.backend.ChunkCache.
+            keyPrefix = obj.Filename + "|" + obj.DatasetPath + "|";
+        end
+
+        function tf = canReadFromChunkCache(obj, selections)
+        % canReadFromChunkCache - Check whether a load_mat_style selection
+        % can be served by the chunk cache. This requires an enabled cache,
+        % a chunked numeric dataset, one selection per dimension and a read
+        % touching a limited number of chunks which fit in the cache.
+            cache = io.backend.ChunkCache.instance();
+            tf = false;
+            if ~cache.isEnabled() || length(selections) ~= length(obj.dims)
+                return
+            end
+            numericTypes = {'double', 'single', 'int8', 'uint8', 'int16', ...
+                'uint16', 'int32', 'uint32', 'int64', 'uint64'};
+            if ~ischar(obj.dataType) || ~any(strcmp(obj.dataType, numericTypes))
+                return
+            end
+            chunkSize = obj.getChunkSize();
+            if isempty(chunkSize)
+                return
+            end
+            numChunks = 1;
+            for iDimension = 1:length(selections)
+                selection = selections{iDimension};
+                if ischar(selection)
+                    numChunks = numChunks * ceil(obj.dims(iDimension) / chunkSize(iDimension));
+                else
+                    numChunks = numChunks * numel(unique(ceil(selection(:) / chunkSize(iDimension))));
+                end
+            end
+            bytesPerElement = numel(typecast(zeros(1, obj.dataType), 'uint8'));
+            tf = numChunks > 0 && numChunks <= cache.MaxChunksPerRead ...
+                && numChunks * prod(chunkSize) * bytesPerElement <= cache.MaxMemory;
+        end
+
+        function data = readFromChunkCache(obj, selections)
+        % readFromChunkCache - Read a selection (one index vector or ':' per
+        % dimension) chunk by chunk, using cached chunks where available.
+        % Returns an array with one dimension per selection.
+            cache = io.backend.ChunkCache.instance();
+            dims = obj.dims;
+            chunkSize = obj.getChunkSize();
+            rank = length(dims);
+
+            indices = selections;
+            chunkIndices = cell(1, rank);
+            touchedChunks = cell(1, rank);
+            for iDimension = 1:rank
+                if ischar(indices{iDimension})
+                    indices{iDimension} = 1:dims(iDimension);
+                end
+                indices{iDimension} = indices{iDimension}(:);
+                chunkIndices{iDimension} = ceil(indices{iDimension} / chunkSize(iDimension));
+                touchedChunks{iDimension} = unique(chunkIndices{iDimension});
+            end
+
+            dataSize = cellfun('length', indices);
+            if isscalar(dataSize)
+                dataSize = [dataSize 1];
+            end
+            data = zeros(dataSize, obj.dataType);
+
+            chunkGrid = cell(1, rank);
+            [chunkGrid{:}] = ndgrid(touchedChunks{:});
+            chunkGrid = cellfun(@(c) c(:), chunkGrid, 'UniformOutput', false);
+            chunkGrid = [chunkGrid{:}];
+
+            keyPrefix = obj.getChunkCacheKeyPrefix();
+            dataIndices = cell(1, rank);
+            chunkDataIndices = cell(1, rank);
+            for iChunk = 1:size(chunkGrid, 1)
+                chunk = chunkGrid(iChunk, :);
+                start = (chunk - 1) .* chunkSize + 1;
+                key = keyPrefix + sprintf('%d,', chunk);
+                [chunkData, isCached] = cache.get(key);
+                if ~isCached
+                    chunkData = obj.readRegion(start, min(chunkSize, dims - start + 1));
+                    cache.put(key, chunkData);
+                end
+                for iDimension = 1:rank
+                    dataIndices{iDimension} = chunkIndices{iDimension} == chunk(iDimension);
+                    chunkDataIndices{iDimension} = ...
+                        indices{iDimension}(dataIndices{iDimension}) - start(iDimension) + 1;
+                end
+                if rank == 1
+                    data(dataIndices{1}) = chunkData(chunkDataIndices{1});
+                else
+                    data(dataIndices{:}) = chunkData(chunkDataIndices{:});
+                end
+            end
+        end
+    end
+
     methods (Access = protected)
         function setSizeInfo(obj, dims, maxDims)
             obj.dims_ = dims;
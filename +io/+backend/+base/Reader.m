@@ -117,6 +117,14 @@ classdef Reader < handle
             datasetValue = [];
             io.backend.base.Reader.throwNotImplemented("readDatasetValue")
         end
+
+        function close(obj) %#ok<MANU>
+        % close - Release resources held for reading, e.g. open files.
+        %
+        % The reader can still be used after it is closed. Default no-op.
+        % Concrete backends can override when they hold resources between
+        % reads.
+        end
     end
 
     methods (Static, Access = private)
@@ -1,18 +1,52 @@
 classdef HDF5LazyArray < io.backend.base.LazyArray
 % HDF5LazyArray - HDF5-backed lazy dataset access implementation.
+%
+% File and dataset identifiers are shared with other lazy arrays for the
+% same file through io.backend.hdf5.HDF5HandlePool. Every read marks the
+% file as used, so the pool can close it after the read unless it keeps
+% files open. Reads of chunked numeric datasets are served from
+% io.backend.ChunkCache when it is enabled.
+
+    properties (Access = private, Transient)
+        % Pool - Handle pool the file is registered with, or [] if the lazy
+        % array has not accessed the file yet. Not saved, so lazy arrays
+        % which are loaded from a MAT file or sent to parallel workers
+        % register the file with the pool of their own MATLAB session.
+        Pool = []
+
+        % PoolKey - Key of the file in Pool.
+        PoolKey (1,1) string = missing
+    end
+
+    properties (Access = private)
+        % ChunkSize - Chunk size of the dataset, [] if it is not chunked
+        % or NaN if it has not been read yet.
+        ChunkSize double = NaN
+    end
 
     methods
-        function obj = HDF5LazyArray(filename, path, dims, dataType)
+        function obj = HDF5LazyArray(filename, path, dims, dataType, maxDims)
             arguments
                 filename (1,1) string
                 path (1,1) string
                 dims double = []
                 dataType = []
+                maxDims double = [] % Only used if dims is given
             end
             obj@io.backend.base.LazyArray(filename, path, dims, dataType);
+            if ~isempty(dims) && ~isempty(maxDims)
+                obj.setSizeInfo(dims, maxDims);
+            end
+        end
+
+        function delete(obj)
+            if ~isempty(obj.Pool) && isvalid(obj.Pool)
+                obj.Pool.release(obj.PoolKey);
+            end
         end
 
         function refreshSizeInfo(obj)
+            fileUse = obj.useFile(); %#ok<NASGU>
             spaceId = obj.getSpace();
             [dims, maxDims] = io.space.getSize(spaceId);
             H5S.close(spaceId);
@@ -20,15 +54,13 @@ classdef HDF5LazyArray < io.backend.base.LazyArray
         end
 
         function dataType = resolveDataType(obj)
-            fileId = H5F.open(obj.Filename);
-            datasetId = H5D.open(fileId, obj.DatasetPath);
+            fileUse = obj.useFile(); %#ok<NASGU>
+            datasetId = obj.getDatasetId();
             typeId = H5D.get_type(datasetId);
 
             dataType = io.getMatType(typeId);
 
             H5T.close(typeId);
-            H5D.close(datasetId);
-            H5F.close(fileId);
         end
 
         data = load_h5_style(obj, varargin)
@@ -36,13 +68,61 @@ classdef HDF5LazyArray < io.backend.base.LazyArray
         data = load_mat_style(obj, varargin)
     end
 
+    methods (Access = protected)
+        function chunkSize = getChunkSize(obj)
+            if isequaln(obj.ChunkSize, NaN)
+                fileUse = obj.useFile(); %#ok<NASGU>
+                obj.ChunkSize = io.internal.h5.getChunkSize(obj.getDatasetId());
+            end
+            chunkSize = obj.ChunkSize;
+        end
+
+        function data = readRegion(obj, start, count)
+            fileUse = obj.useFile(); %#ok<NASGU>
+            spaceId = obj.getSpace();
+            spaceCleanup = onCleanup(@() H5S.close(spaceId));
+            H5S.select_hyperslab(spaceId, 'H5S_SELECT_SET', ...
+                fliplr(start) - 1, [], fliplr(count), []);
+            memorySpaceId = H5S.create_simple(length(count), fliplr(count), []);
+            memorySpaceCleanup = onCleanup(@() H5S.close(memorySpaceId));
+            data = H5D.read(obj.getDatasetId(), 'H5ML_DEFAULT', ...
+                memorySpaceId, spaceId, 'H5P_DEFAULT');
+        end
+
+        function keyPrefix = getChunkCacheKeyPrefix(obj)
+            % Use the file key of the pool, so the chunks are invalidated
+            % with the identifiers of the file.
+            keyPrefix = io.backend.hdf5.HDF5HandlePool.getFileKey(obj.Filename) ...
+                + "|" + obj.DatasetPath + "|";
+        end
+    end
+
     methods (Access = private)
+        function pool = getPool(obj)
+        % getPool - Get the shared handle pool, and register the file with
+        % it if the lazy array has not done so yet. The pool is replaced
+        % if the shared pool was cleared, e.g. with clear classes.
+            pool = io.backend.hdf5.HDF5HandlePool.instance();
+            if isempty(obj.Pool) || ~isvalid(obj.Pool) || obj.Pool ~= pool
+                obj.PoolKey = pool.register(obj.Filename);
+                obj.Pool = pool;
+            end
+        end
+
+        function cleanupObj = useFile(obj)
+        % useFile - Mark the file as used by a read in the handle pool until
+        % the returned onCleanup object is deleted.
+            cleanupObj = obj.getPool().use(obj.PoolKey);
+        end
+
+        function datasetId = getDatasetId(obj)
+        % getDatasetId - Get the pooled identifier of the dataset. The
+        % identifier is owned by the pool and must not be closed.
+            datasetId = obj.getPool().getDataset(obj.PoolKey, obj.DatasetPath);
+        end
+
         function spaceId = getSpace(obj)
-            fileId = H5F.open(obj.Filename);
-            datasetId = H5D.open(fileId, obj.DatasetPath);
-            spaceId = H5D.get_space(datasetId);
-            H5D.close(datasetId);
-            H5F.close(fileId);
+            spaceId = H5D.get_space(obj.getDatasetId());
         end
     end
 end
@@ -19,16 +19,14 @@ function data = load_h5_style(obj, varargin)
 
     if isstruct(data)
         % Compound type - data loaded as struct by h5read
-        fid = H5F.open(obj.Filename);
-        did = H5D.open(fid, obj.DatasetPath);
+        fileUse = obj.useFile(); %#ok<NASGU>
+        did = obj.getDatasetId();
         fsid = H5D.get_space(did);
         % Bug: This will read all the data
         data = H5D.read(did, 'H5ML_DEFAULT', fsid, fsid,...
             'H5P_DEFAULT');
         data = io.parseCompound(did, data);
         H5S.close(fsid);
-        H5D.close(did);
-        H5F.close(fid);
     else
         % Non-compound types - apply type-specific post-processing
 
@@ -9,7 +9,6 @@ function data = load_mat_style(obj, varargin)
 
     %% Select from Space
     dataDimensions = obj.dims;
-    spaceId = obj.getSpace();
     userSelection = varargin;
 
     selectionErrorId = 'NWB:DataStub:Load:InvalidSelection';
@@ -41,8 +40,19 @@ function data = load_mat_style(obj, varargin)
         data = obj.load_mat_style(1);
         data = getEmptyRepresentation(data);
         return
+    end
+
+    % Keep the file open for all reads of this load
+    fileUse = obj.useFile(); %#ok<NASGU>
+
+    if obj.canReadFromChunkCache(userSelection)
+        data = obj.readFromChunkCache(userSelection);
+        data = reshape(data, getExpectedSize(dataDimensions, userSelection));
+        return
+    end
 
-    elseif isscalar(userSelection) && ~ischar(userSelection{1})
+    spaceId = obj.getSpace();
+    if isscalar(userSelection) && ~ischar(userSelection{1})
         % linear index into the fast dimension.
         orderedSelection = unique(userSelection{1});
 
@@ -66,11 +76,24 @@ function data = load_mat_style(obj, varargin)
             dataDimensions = [dataDimensions, 1];
         end
 
-        [points{:}] = ind2sub(dataDimensions, orderedSelection);
         readSpaceId = H5S.copy(spaceId);
         H5S.select_none(readSpaceId);
-        H5S.select_elements(readSpaceId, 'H5S_SELECT_SET', ...
-            cell2mat(flipud(points)) - 1);
+        % Select contiguous runs and regular strides as hyperslabs, and
+        % fall back to a point selection for scattered indices. Both read
+        % the elements in the order of orderedSelection.
+        hyperslabs = io.space.planLinearSelection(orderedSelection, dataDimensions);
+        if isempty(hyperslabs)
+            [points{:}] = ind2sub(dataDimensions, orderedSelection);
+            H5S.select_elements(readSpaceId, 'H5S_SELECT_SET', ...
+                cell2mat(flipud(points)) - 1);
+        else
+            for iHyperslab = 1:length(hyperslabs)
+                hyperslab = hyperslabs(iHyperslab);
+                H5S.select_hyperslab(readSpaceId, 'H5S_SELECT_OR', ...
+                    fliplr(hyperslab.start) - 1, fliplr(hyperslab.stride), ...
+                    fliplr(hyperslab.count), fliplr(hyperslab.block));
+            end
+        end
         memorySpaceId = H5S.create_simple(length(selectionDimensions), ...
             selectionDimensions, selectionDimensions);
     else
@@ -81,23 +104,15 @@ function data = load_mat_style(obj, varargin)
     H5S.close(spaceId);
 
     %% Read Data
-    fileId = H5F.open(obj.Filename);
-    datasetId = H5D.open(fileId, obj.DatasetPath);
+    datasetId = obj.getDatasetId();
     data = H5D.read(datasetId, 'H5ML_DEFAULT', memorySpaceId, readSpaceId, 'H5P_DEFAULT');
 
     %% Retype Data
     data = hdf2mat(datasetId, data);
-    H5D.close(datasetId);
-    H5F.close(fileId);
     H5S.close(memorySpaceId);
 
     %% Reshape Data
     expectedSize = getExpectedSize(dataDimensions, userSelection);
-    openSelectionIndices = find(cellfun('isclass', userSelection, 'char'));
-    for iDimension = 1:length(openSelectionIndices)
-        % for open selection ':', select the entire range of that dimension.
-        userSelection{iDimension} = 1:dataDimensions(iDimension);
-    end
 
     if isstruct(data)
         % for compound datatypes, reshape for all data in the
@@ -178,42 +193,33 @@ end
 function reordered = reorderLoadedData(data, selections)
     % dataset loading does not account for duplicate or unordered
     % indices so we have to re-order everything here.
-    % we presume data is the indexed values of a unique(ind)
+    % we presume data is the indexed values of a unique(ind) along each
+    % dimension, so indexing with the positions of each selected index in
+    % its unique indices restores the order and duplicates of the selection.
     if isempty(data)
         reordered = data;
         return;
     end
 
-    indexKey = cell(size(selections));
-    isSelectionNormal = false(size(selections)); % that is, without duplicates or out of order.
-    for i = 1:length(indexKey)
-        indexKey{i} = unique(selections{i});
-        isSelectionNormal = isequal(indexKey{i}, selections{i});
+    dataIndices = cell(size(selections));
+    isSelectionNormal = true; % that is, without duplicates or out of order.
+    for i = 1:length(selections)
+        if ischar(selections{i})
+            dataIndices{i} = ':'; % open selection, data is in order.
+            continue;
+        end
+        [uniqueSelection, ~, dataIndices{i}] = unique(selections{i});
+        isSelectionNormal = isSelectionNormal ...
+            && isequal(uniqueSelection(:), selections{i}(:));
     end
-    if all(isSelectionNormal)
+    if isSelectionNormal
         reordered = data;
         return;
     end
-    indexKeyIndexMax = cellfun('length', indexKey);
-    if isscalar(indexKeyIndexMax)
-        reordered = repmat(data(1), indexKeyIndexMax, 1);
+    if isscalar(dataIndices)
+        reordered = data(dataIndices{1});
     else
-        reordered = repmat(data(1), indexKeyIndexMax);
-    end
-    indexKeyIndex = ones(size(selections));
-    while true
-        selectionIndex = cell(size(selections));
-        for iSelection = 1:length(selections)
-            selectionIndex{iSelection} = selections{iSelection} == indexKey{iSelection}(indexKeyIndex(iSelection));
-        end
-        indexKeyIndexArguments = num2cell(indexKeyIndex);
-        reordered(selectionIndex{:}) = data(indexKeyIndexArguments{:});
-        indexKeyIndexNextIndex = find(indexKeyIndexMax ~= indexKeyIndex, 1, 'last');
-        if isempty(indexKeyIndexNextIndex)
-            break;
-        end
-        indexKeyIndex(indexKeyIndexNextIndex) = indexKeyIndex(indexKeyIndexNextIndex) + 1;
-        indexKeyIndex((indexKeyIndexNextIndex+1):end) = 1;
+        reordered = data(dataIndices{:});
     end
 end
 
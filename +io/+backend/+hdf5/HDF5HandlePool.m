@@ -0,0 +1,424 @@
+classdef HDF5HandlePool < handle
+% HDF5HandlePool - Process-wide pool of open HDF5 file and dataset identifiers.
+%
+% HDF5LazyArray objects get their file and dataset identifiers from this
+% pool, and HDF5Reader objects get their file identifier from it. The
+% identifiers of a file are shared by all lazy arrays and readers for that
+% file.
+%
+% By default (KeepFilesOpen is false), a file is closed as soon as no read
+% is using it, i.e. after every load of a lazy array and when nwbRead or
+% the loading of a lazy group is done. Identifiers are still shared within
+% a read, e.g. by all the chunk reads of one load.
+%
+% If KeepFilesOpen is true, files stay open between reads, so repeated
+% reads do not reopen the file. A file then stays open while lazy arrays
+% (e.g. the DataStubs of an NwbFile) or readers using it exist, and is
+% closed when the last of them is deleted. While a file is open, it can not
+% be written by other means than nwbExport (e.g. h5write or h5writeatt),
+% deleted on Windows or written by other processes. Close the files with
+% clear to allow this:
+%
+%   pool = io.backend.hdf5.HDF5HandlePool.instance();
+%   pool.KeepFilesOpen = true;
+%   ... % read data
+%   pool.clear() % Close all files before writing them otherwise
+%
+% The number of open files and datasets is bounded by MaxOpenFiles and
+% MaxOpenDatasets. When a limit is exceeded, the least recently used
+% identifiers are closed. They are reopened on demand, so eviction only
+% costs a new open.
+%
+% Chunked datasets are opened with an HDF5 chunk cache sized from their
+% chunk shape, large enough to hold two layers of chunks along the last
+% (slowest in MATLAB order) dimension, e.g. two time chunks over all
+% channels of an ElectricalSeries. Its size is bounded by MaxChunkCacheSize.
+%
+% Files are opened read-only. A file can not be opened for writing while
+% it is open in the pool, so code that opens a file for writing must call
+% invalidate first. HDF5Writer (used by nwbExport) does this. Invalidating
+% a file also removes its chunks from io.backend.ChunkCache.
+%
+% Usage:
+%   pool = io.backend.hdf5.HDF5HandlePool.instance();
+%   pool.KeepFilesOpen = true % Keep files open between reads
+%   pool.invalidate(filename) % Close all identifiers of a file
+%   pool.clear()              % Close all identifiers
+%
+% See also: io.backend.hdf5.HDF5LazyArray
+
+    properties
+        % KeepFilesOpen - Whether files stay open between reads. Default
+        % is false, which closes a file when no read is using it.
+        KeepFilesOpen (1,1) logical = false
+
+        % MaxOpenFiles - Maximum number of files to keep open.
+        MaxOpenFiles (1,1) double {mustBeInteger, mustBePositive} = 32
+
+        % MaxOpenDatasets - Maximum number of datasets to keep open (in all files).
+        MaxOpenDatasets (1,1) double {mustBeInteger, mustBePositive} = 256
+
+        % MaxChunkCacheSize - Maximum size in bytes of the HDF5 chunk cache
+        % of an open dataset.
+        MaxChunkCacheSize (1,1) double {mustBeNonnegative} = 32 * 2^20
+    end
+
+    properties (SetAccess = private)
+        % NumFileOpens - Number of times a file was opened by the pool.
+        NumFileOpens (1,1) double = 0
+
+        % NumDatasetOpens - Number of times a dataset was opened by the pool.
+        NumDatasetOpens (1,1) double = 0
+
+        % NumDatasetReuses - Number of requests served by an open dataset.
+        NumDatasetReuses (1,1) double = 0
+    end
+
+    properties (Dependent, SetAccess = private)
+        NumOpenFiles
+        NumOpenDatasets
+    end
+
+    properties (Access = private)
+        % Files - Map of file key to a struct with the fields FileId,
+        % Datasets, RefCount, UseCount and LastUsed. UseCount is the number
+        % of reads using the file (see beginUse). Datasets maps a dataset path to a
+        % struct with the fields Id and LastUsed. LastUsed is the value of
+        % AccessCounter at the last use of the file or dataset.
+        Files containers.Map
+
+        OpenDatasetCount (1,1) double = 0
+        AccessCounter (1,1) double = 0
+    end
+
+    methods (Static)
+        function pool = instance()
+        % instance - Get the pool shared by all lazy arrays in this MATLAB session.
+            persistent sharedPool
+            if isempty(sharedPool) || ~isvalid(sharedPool)
+                sharedPool = io.backend.hdf5.HDF5HandlePool();
+            end
+            pool = sharedPool;
+        end
+
+        function key = getFileKey(filename)
+        % getFileKey - Get the key which identifies a file in the pool.
+        %
+        % The key is the canonical path of the file: absolute, without . and
+        % .. folders, with symbolic links resolved and, on Windows, with the
+        % case of the existing file. Lazy arrays for the same file therefore
+        % share identifiers even if they were created with different paths.
+        % Without Java, the key is the absolute path of the file.
+            arguments
+                filename (1,1) string
+            end
+            key = filename;
+            isAbsolute = startsWith(key, ["/", "\"]) || ...
+                ~isempty(regexp(key, '^[A-Za-z]:', 'once'));
+            if ~isAbsolute
+                key = string(fullfile(pwd, key));
+            end
+            try
+                key = string(java.io.File(char(key)).getCanonicalPath());
+            catch
+                % Keep the absolute path
+            end
+        end
+    end
+
+    methods
+        function obj = HDF5HandlePool()
+            obj.Files = containers.Map('KeyType', 'char', 'ValueType', 'any');
+        end
+
+        function delete(obj)
+            obj.clear();
+        end
+
+        function num = get.NumOpenFiles(obj)
+            num = 0;
+            fileEntries = obj.Files.values();
+            for i = 1:numel(fileEntries)
+                num = num + ~isempty(fileEntries{i}.FileId);
+            end
+        end
+
+        function num = get.NumOpenDatasets(obj)
+            num = obj.OpenDatasetCount;
+        end
+    end
+
+    methods
+        function key = register(obj, filename)
+        % register - Register a user (e.g. a lazy array) of a file.
+        %
+        % Returns the key of the file in the pool, which must be used for
+        % getDataset and for the matching call to release. Registering does
+        % not open the file.
+            key = char(obj.getFileKey(filename));
+            if obj.Files.isKey(key)
+                fileEntry = obj.Files(key);
+            else
+                fileEntry = struct( ...
+                    'FileId', [], ...
+                    'Datasets', containers.Map('KeyType', 'char', 'ValueType', 'any'), ...
+                    'RefCount', 0, ...
+                    'UseCount', 0, ...
+                    'LastUsed', 0);
+            end
+            fileEntry.RefCount = fileEntry.RefCount + 1;
+            obj.Files(key) = fileEntry;
+        end
+
+        function release(obj, key)
+        % release - Unregister a user of a file. The file is closed when it
+        % has no users left.
+            key = char(key);
+            if ~obj.Files.isKey(key)
+                return % The pool was invalidated or cleared
+            end
+            fileEntry = obj.Files(key);
+            fileEntry.RefCount = fileEntry.RefCount - 1;
+            if fileEntry.RefCount > 0
+                obj.Files(key) = fileEntry;
+            else
+                obj.closeFile(key);
+                obj.Files.remove(key);
+            end
+        end
+
+        function datasetId = getDataset(obj, key, datasetPath)
+        % getDataset - Get an open identifier for a dataset of a registered file.
+        %
+        % The identifier is owned by the pool and must not be closed by the
+        % caller. It stays valid until the next call to the pool.
+            key = char(key);
+            datasetPath = char(datasetPath);
+            assert(obj.Files.isKey(key), 'NWB:HDF5HandlePool:FileNotRegistered', ...
+                'File "%s" is not registered in the HDF5 handle pool.', key)
+
+            obj.AccessCounter = obj.AccessCounter + 1;
+            fileEntry = obj.Files(key);
+            fileEntry.LastUsed = obj.AccessCounter;
+
+            if fileEntry.Datasets.isKey(datasetPath)
+                datasetEntry = fileEntry.Datasets(datasetPath);
+                datasetEntry.LastUsed = obj.AccessCounter;
+                fileEntry.Datasets(datasetPath) = datasetEntry; % Datasets is a handle
+                obj.Files(key) = fileEntry;
+                obj.NumDatasetReuses = obj.NumDatasetReuses + 1;
+                datasetId = datasetEntry.Id;
+                return
+            end
+
+            fileEntry = obj.openFile(key, fileEntry);
+
+            datasetId = obj.openDataset(fileEntry.FileId, datasetPath);
+            obj.NumDatasetOpens = obj.NumDatasetOpens + 1;
+            fileEntry.Datasets(datasetPath) = struct( ...
+                'Id', datasetId, 'LastUsed', obj.AccessCounter);
+            obj.OpenDatasetCount = obj.OpenDatasetCount + 1;
+
+            obj.evict(key, datasetPath);
+        end
+
+        function fileId = getFile(obj, key)
+        % getFile - Get an open identifier for a registered file.
+        %
+        % The identifier is owned by the pool and must not be closed by the
+        % caller. It stays valid until the next call to the pool.
+            key = char(key);
+            assert(obj.Files.isKey(key), 'NWB:HDF5HandlePool:FileNotRegistered', ...
+                'File "%s" is not registered in the HDF5 handle pool.', key)
+
+            obj.AccessCounter = obj.AccessCounter + 1;
+            fileEntry = obj.Files(key);
+            fileEntry.LastUsed = obj.AccessCounter;
+            fileEntry = obj.openFile(key, fileEntry);
+            fileId = fileEntry.FileId;
+
+            obj.evict(key, '');
+        end
+
+        function cleanupObj = use(obj, key)
+        % use - Mark a registered file as used by a read until the returned
+        % onCleanup object is deleted. See beginUse.
+            obj.beginUse(key);
+            cleanupObj = onCleanup(@() obj.endUse(key));
+        end
+
+        function beginUse(obj, key)
+        % beginUse - Mark a registered file as used by a read.
+        %
+        % Unless KeepFilesOpen is true, the identifiers of the file are
+        % closed when the number of reads using it drops to zero with endUse.
+            key = char(key);
+            assert(obj.Files.isKey(key), 'NWB:HDF5HandlePool:FileNotRegistered', ...
+                'File "%s" is not registered in the HDF5 handle pool.', key)
+            fileEntry = obj.Files(key);
+            fileEntry.UseCount = fileEntry.UseCount + 1;
+            obj.Files(key) = fileEntry;
+        end
+
+        function endUse(obj, key)
+        % endUse - Unmark a file as used by a read, see beginUse.
+            key = char(key);
+            if ~obj.Files.isKey(key)
+                return % The pool was cleared or the file released
+            end
+            fileEntry = obj.Files(key);
+            fileEntry.UseCount = max(fileEntry.UseCount - 1, 0);
+            obj.Files(key) = fileEntry;
+            if fileEntry.UseCount == 0 && ~obj.KeepFilesOpen
+                obj.closeFile(key);
+            end
+        end
+
+        function invalidate(obj, filename)
+        % invalidate - Close all identifiers of a file.
+        %
+        % Lazy arrays using the file stay registered and reopen the file on
+        % their next read. Call this before opening the file for writing.
+            key = char(obj.getFileKey(filename));
+            if obj.Files.isKey(key)
+                obj.closeFile(key);
+            end
+            io.backend.ChunkCache.instance().invalidate([key '|']);
+        end
+
+        function clear(obj)
+        % clear - Close all identifiers of all files.
+            fileKeys = obj.Files.keys();
+            for i = 1:numel(fileKeys)
+                obj.closeFile(fileKeys{i});
+            end
+        end
+
+        function resetStatistics(obj)
+        % resetStatistics - Reset the open and reuse counters.
+            obj.NumFileOpens = 0;
+            obj.NumDatasetOpens = 0;
+            obj.NumDatasetReuses = 0;
+        end
+    end
+
+    methods (Access = private)
+        function evict(obj, activeKey, activeDatasetPath)
+        % evict - Close the least recently used identifiers until the pool
+        % is within its limits. The active file and dataset are never evicted.
+            fileKeys = obj.Files.keys();
+            fileEntries = obj.Files.values();
+
+            numToClose = obj.OpenDatasetCount - obj.MaxOpenDatasets;
+            if numToClose > 0
+                datasetFileKeys = {};
+                datasetPaths = {};
+                lastUsed = [];
+                for iFile = 1:numel(fileEntries)
+                    datasetEntries = fileEntries{iFile}.Datasets.values();
+                    datasetFileKeys = [datasetFileKeys, ...
+                        repmat(fileKeys(iFile), 1, numel(datasetEntries))]; %#ok<AGROW>
+                    datasetPaths = [datasetPaths, fileEntries{iFile}.Datasets.keys()]; %#ok<AGROW>
+                    lastUsed = [lastUsed, cellfun(@(e) e.LastUsed, datasetEntries)]; %#ok<AGROW>
+                end
+                isActive = strcmp(datasetFileKeys, activeKey) & strcmp(datasetPaths, activeDatasetPath);
+                lastUsed(isActive) = inf;
+                [~, order] = sort(lastUsed);
+                for i = 1:numToClose
+                    obj.closeDataset(datasetFileKeys{order(i)}, datasetPaths{order(i)});
+                end
+            end
+
+            isOpen = cellfun(@(e) ~isempty(e.FileId), fileEntries);
+            numToClose = sum(isOpen) - obj.MaxOpenFiles;
+            if numToClose > 0
+                lastUsed = cellfun(@(e) e.LastUsed, fileEntries);
+                lastUsed(~isOpen | strcmp(fileKeys, activeKey)) = inf;
+                [~, order] = sort(lastUsed);
+                for i = 1:numToClose
+                    obj.closeFile(fileKeys{order(i)});
+                end
+            end
+        end
+
+        function fileEntry = openFile(obj, key, fileEntry)
+        % openFile - Open the file of an entry if it is closed, and store the entry.
+            if isempty(fileEntry.FileId)
+                fileEntry.FileId = H5F.open(key, 'H5F_ACC_RDONLY', 'H5P_DEFAULT');
+                obj.NumFileOpens = obj.NumFileOpens + 1;
+            end
+            % Store the entry before opening any dataset, so the file is
+            % closed with the pool even if the dataset can not be opened.
+            obj.Files(key) = fileEntry;
+        end
+
+        function datasetId = openDataset(obj, fileId, datasetPath)
+        % openDataset - Open a dataset, with a chunk cache sized for its
+        % chunks if it is chunked.
+            datasetId = H5D.open(fileId, datasetPath, 'H5P_DEFAULT');
+            chunkSize = io.internal.h5.getChunkSize(datasetId);
+            if isempty(chunkSize)
+                return
+            end
+
+            spaceId = H5D.get_space(datasetId);
+            dims = io.space.getSize(spaceId);
+            H5S.close(spaceId);
+            typeId = H5D.get_type(datasetId);
+            chunkBytes = prod(chunkSize) * H5T.get_size(typeId);
+            H5T.close(typeId);
+
+            % Two layers of chunks along the last dimension
+            numChunks = 2 * prod(ceil(dims(1:end-1) ./ chunkSize(1:end-1)));
+            cacheSize = min(numChunks * chunkBytes, obj.MaxChunkCacheSize);
+            defaultCacheSize = 2^20;
+            if cacheSize <= defaultCacheSize
+                return
+            end
+            % HDF5 recommends a prime number of slots, about 100 times the
+            % number of chunks that fit in the cache.
+            numSlots = nextPrime(100 * ceil(cacheSize / chunkBytes));
+
+            dapl = H5P.create('H5P_DATASET_ACCESS');
+            daplCleanup = onCleanup(@() H5P.close(dapl));
+            preemptionPolicy = 0.75; % The HDF5 default
+            H5P.set_chunk_cache(dapl, numSlots, cacheSize, preemptionPolicy);
+            H5D.close(datasetId);
+            datasetId = H5D.open(fileId, datasetPath, dapl);
+        end
+
+        function closeDataset(obj, key, datasetPath)
+            fileEntry = obj.Files(key);
+            datasetEntry = fileEntry.Datasets(datasetPath);
+            closeId(datasetEntry.Id, @H5D.close);
+            fileEntry.Datasets.remove(datasetPath);
+            obj.OpenDatasetCount = obj.OpenDatasetCount - 1;
+        end
+
+        function closeFile(obj, key)
+            fileEntry = obj.Files(key);
+            datasetPaths = fileEntry.Datasets.keys();
+            for i = 1:numel(datasetPaths)
+                obj.closeDataset(key, datasetPaths{i});
+            end
+            if ~isempty(fileEntry.FileId)
+                closeId(fileEntry.FileId, @H5F.close);
+                fileEntry.FileId = [];
+                obj.Files(key) = fileEntry;
+            end
+        end
+    end
+end
+
+function p = nextPrime(n)
+    p = max(n, 2);
+    while ~isprime(p)
+        p = p + 1;
+    end
+end
+
+function closeId(id, closeFunction)
+    if H5I.is_valid(id)
+        closeFunction(id);
+    end
+end
@@ -0,0 +1,260 @@
+classdef HDF5InfoCache < handle
+% HDF5InfoCache - Persistent on-disk cache of the metadata tree of HDF5 files.
+%
+% nwbRead parses a file from the h5info structure of its root group, which
+% holds the types, paths and attribute values of all groups and the
+% descriptors of all datasets that DataStubs are created from. Building
+% this structure traverses the entire file and dominates the time it takes
+% to read large files. When HDF5Reader is created with UseInfoCache=true
+% (see nwbRead option UseParsedTreeCache), the structure is saved to a MAT
+% file in Folder, and reused when the same file is read again, also in
+% other MATLAB sessions.
+%
+% Cache entries are keyed by the identity of the file: its absolute path,
+% size, modification time (in milliseconds) and a hash of its first bytes,
+% which hold the HDF5 superblock. A file which is modified gets a new key,
+% so the stale entry is never used and is eventually evicted.
+%
+% The identity does not cover the whole content of the file. A stale entry
+% can still be used for a file which is modified in place without changing
+% its size or its first bytes, if the modification time is not updated or
+% is within the resolution of the file system's timestamps (e.g. 2 seconds
+% on FAT file systems). Call clear() after editing such a file, or read it
+% without the cache.
+%
+% The total size of the cache folder is bounded by MaxSize. When it is
+% exceeded, the least recently used entries are deleted.
+%
+% The default folder and size limit can be set with preferences:
+%   setpref('matnwb', 'ParsedTreeCacheFolder', folder)
+%   setpref('matnwb', 'ParsedTreeCacheMaxSize', numBytes)
+%
+% Usage:
+%   cache = io.backend.hdf5.HDF5InfoCache.instance();
+%   info = cache.read(filename) % h5info(filename), cached
+%   cache.clear()               % Delete all cache entries
+%
+% See also: io.backend.hdf5.HDF5Reader, nwbRead
+
+    properties
+        % Folder - Folder where cache entries are saved.
+        Folder (1,1) string
+
+        % MaxSize - Maximum total size of the cache entries in bytes.
+        MaxSize (1,1) double {mustBeNonnegative} = 256 * 2^20
+    end
+
+    properties (SetAccess = private)
+        % NumHits - Number of reads served from the cache.
+        NumHits (1,1) double = 0
+
+        % NumMisses - Number of reads which traversed the file.
+        NumMisses (1,1) double = 0
+    end
+
+    properties (Constant, Access = private)
+        % HeaderSize - Number of bytes at the start of the file which are
+        % part of the file identity.
+        HeaderSize = 4096
+
+        % Version - Format version of cache entries. Entries of another
+        % version are ignored.
+        Version = 2
+    end
+
+    methods (Static)
+        function cache = instance()
+        % instance - Get the cache shared by all readers in this MATLAB session.
+            persistent sharedCache
+            if isempty(sharedCache) || ~isvalid(sharedCache)
+                sharedCache = io.backend.hdf5.HDF5InfoCache();
+            end
+            cache = sharedCache;
+        end
+
+        function identity = getFileIdentity(filename)
+        % getFileIdentity - Get the properties which identify the current
+        % version of a file.
+            arguments
+                filename (1,1) string
+            end
+            fileInfo = dir(filename);
+            assert(isscalar(fileInfo) && ~fileInfo.isdir, ...
+                'NWB:HDF5InfoCache:FileNotFound', 'File "%s" not found.', filename)
+
+            filePath = io.backend.hdf5.HDF5HandlePool.getFileKey(filename);
+            identity = struct( ...
+                'Path', filePath, ...
+                'Size', fileInfo.bytes, ...
+                'Modified', getModificationTime(filePath, fileInfo), ...
+                'HeaderHash', matnwb.common.internal.computeHash( ...
+                    readHeader(filename, io.backend.hdf5.HDF5InfoCache.HeaderSize)), ...
+                'Version', io.backend.hdf5.HDF5InfoCache.Version);
+        end
+    end
+
+    methods
+        function obj = HDF5InfoCache(folder, maxSize)
+            arguments
+                folder (1,1) string = getpref('matnwb', 'ParsedTreeCacheFolder', ...
+                    fullfile(prefdir, 'matnwb', 'parsed_tree_cache'))
+                maxSize (1,1) double = getpref('matnwb', 'ParsedTreeCacheMaxSize', 256 * 2^20)
+            end
+            obj.Folder = folder;
+            obj.MaxSize = maxSize;
+        end
+
+        function info = read(obj, filename)
+        % read - Get the h5info structure of the root group of a file,
+        % from the cache if the file has been read before.
+            arguments
+                obj
+                filename (1,1) string
+            end
+            identity = obj.getFileIdentity(filename);
+            entryFile = obj.getEntryFile(identity);
+
+            info = obj.loadEntry(entryFile, identity);
+            if ~isempty(info)
+                obj.NumHits = obj.NumHits + 1;
+                return
+            end
+
+            obj.NumMisses = obj.NumMisses + 1;
+            info = h5info(filename);
+            obj.saveEntry(entryFile, identity, info);
+            obj.evict(entryFile);
+        end
+
+        function clear(obj)
+        % clear - Delete all cache entries.
+            entries = obj.listEntries();
+            for i = 1:numel(entries)
+                deleteEntry(fullfile(entries(i).folder, entries(i).name));
+            end
+        end
+
+        function resetStatistics(obj)
+        % resetStatistics - Reset the hit and miss counters.
+            obj.NumHits = 0;
+            obj.NumMisses = 0;
+        end
+    end
+
+    methods (Access = private)
+        function entryFile = getEntryFile(obj, identity)
+            key = matnwb.common.internal.computeHash(jsonencode(identity));
+            entryFile = fullfile(obj.Folder, key + ".mat");
+        end
+
+        function info = loadEntry(~, entryFile, identity)
+            info = [];
+            if ~isfile(entryFile)
+                return
+            end
+            try
+                entry = load(entryFile, 'identity', 'info');
+            catch
+                deleteEntry(entryFile) % Unreadable, e.g. partially written
+                return
+            end
+            if isequal(entry.identity, identity) % Guard against hash collisions
+                info = entry.info;
+                markAsUsed(entryFile)
+            end
+        end
+
+        function saveEntry(obj, entryFile, identity, info)
+            if obj.MaxSize == 0
+                return
+            end
+            if ~isfolder(obj.Folder)
+                mkdir(obj.Folder);
+            end
+            % Save to a temporary file first, so that other processes
+            % reading the same file never load a partially written entry.
+            [~, uniqueName] = fileparts(tempname);
+            temporaryFile = entryFile + "." + uniqueName + ".tmp";
+            try
+                save(temporaryFile, 'identity', 'info', '-mat', '-v7');
+                movefile(temporaryFile, entryFile, 'f');
+            catch ME
+                deleteEntry(temporaryFile)
+                warning('NWB:HDF5InfoCache:SaveFailed', ...
+                    'Failed to save cache entry for "%s":\n%s', identity.Path, ME.message)
+            end
+        end
+
+        function evict(obj, activeEntryFile)
+        % evict - Delete the least recently used entries until the cache
+        % is within its size limit. The active entry is deleted last.
+            entries = obj.listEntries();
+            if isempty(entries)
+                return
+            end
+            totalSize = sum([entries.bytes]);
+            if totalSize <= obj.MaxSize
+                return
+            end
+            lastUsed = [entries.datenum];
+            entryFiles = string(fullfile({entries.folder}, {entries.name}));
+            lastUsed(entryFiles == activeEntryFile) = inf;
+            [~, order] = sort(lastUsed);
+            for i = order
+                if totalSize <= obj.MaxSize
+                    break
+                end
+                deleteEntry(entryFiles(i))
+                totalSize = totalSize - entries(i).bytes;
+            end
+        end
+
+        function entries = listEntries(obj)
+            if isfolder(obj.Folder)
+                entries = dir(fullfile(obj.Folder, '*.mat'));
+            else
+                entries = struct('name', {}, 'folder', {}, 'bytes', {}, 'datenum', {});
+            end
+        end
+    end
+end
+
+function header = readHeader(filename, numBytes)
+    fid = fopen(filename, 'r');
+    assert(fid ~= -1, 'NWB:HDF5InfoCache:FileNotReadable', ...
+        'Could not open file "%s" for reading.', filename)
+    fileCleanup = onCleanup(@() fclose(fid));
+    header = fread(fid, numBytes, '*uint8');
+end
+
+function modified = getModificationTime(filePath, fileInfo)
+% getModificationTime - Modification time of a file in milliseconds since
+% the epoch. dir only reports whole seconds on some platforms. filePath
+% must be absolute, as Java resolves relative paths against its own
+% working folder and not the current folder of MATLAB.
+    try
+        modified = double(java.io.File(char(filePath)).lastModified());
+    catch
+        modified = 0;
+    end
+    if modified == 0 % Java is not available or could not read the file
+        modified = round((fileInfo.datenum - datenum(1970, 1, 1)) * 86400 * 1000);
+    end
+end
+
+function markAsUsed(entryFile)
+% markAsUsed - Update the modification time of an entry, which is used as
+% its last use time for eviction.
+    try
+        javaFile = java.io.File(char(entryFile));
+        javaFile.setLastModified(java.lang.System.currentTimeMillis());
+    catch
+        % Eviction falls back to the time the entry was saved
+    end
+end
+
+function deleteEntry(entryFile)
+    if isfile(entryFile)
+        delete(entryFile);
+    end
+end
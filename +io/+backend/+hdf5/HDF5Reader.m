@@ -3,10 +3,68 @@ classdef HDF5Reader < io.backend.base.Reader
     %
     % This reader is intentionally thin and delegates to the existing HDF5
     % utility functions used by matnwb today.
+    %
+    % readRootInfo traverses the file once and indexes the metadata of
+    % every group and dataset by path. Link targets are resolved from this
+    % index, and datasets which are not read eagerly become lazy arrays
+    % created from the indexed metadata, without opening the file.
+    %
+    % If the reader is created with UseInfoCache=true, readRootInfo gets the
+    % metadata from io.backend.hdf5.HDF5InfoCache, so the file is only
+    % traversed the first time it is read.
+
+    properties (SetAccess = private)
+        % UseInfoCache - Whether the metadata of the file is cached on disk.
+        UseInfoCache (1,1) logical = false
+    end
+
+    properties (Access = private)
+        % NodeIndex - Map of the path of every group and dataset in the
+        % file to its h5info structure.
+        NodeIndex containers.Map
+    end
+
+    properties (Access = private, Transient)
+        % Pool - HDF5 handle pool the file is registered with, or [] if the
+        % reader has not opened the file yet. Not saved, so readers which
+        % are loaded from a MAT file register the file again.
+        Pool = []
+
+        % PoolKey - Key of the file in Pool.
+        PoolKey (1,1) string = missing
+
+        % IsUsingFile - Whether the reader marked the file as used in the
+        % handle pool, which keeps it open until the reader is closed.
+        IsUsingFile (1,1) logical = false
+    end
 
     methods
-        function obj = HDF5Reader(filename)
+        function obj = HDF5Reader(filename, options)
+            arguments
+                filename (1,1) string
+                options.UseInfoCache (1,1) logical = false
+            end
             obj@io.backend.base.Reader(filename);
+            obj.UseInfoCache = options.UseInfoCache;
+            obj.NodeIndex = containers.Map('KeyType', 'char', 'ValueType', 'any');
+        end
+
+        function delete(obj)
+            obj.close();
+            if ~isempty(obj.Pool) && isvalid(obj.Pool)
+                obj.Pool.release(obj.PoolKey);
+            end
+        end
+
+        function close(obj)
+        % close - Let the handle pool close the file, unless it keeps files
+        % open. The file is opened again by the next read.
+            if obj.IsUsingFile
+                obj.IsUsingFile = false;
+                if isvalid(obj.Pool)
+                    obj.Pool.endUse(obj.PoolKey);
+                end
+            end
         end
 
         function version = getSchemaVersion(obj)
@@ -18,7 +76,13 @@ classdef HDF5Reader < io.backend.base.Reader
         end
 
         function node = readRootInfo(obj)
-            node = h5info(obj.Filename);
+            if obj.UseInfoCache
+                node = io.backend.hdf5.HDF5InfoCache.instance().read(obj.Filename);
+            else
+                node = h5info(obj.Filename);
+            end
+            obj.NodeIndex = containers.Map('KeyType', 'char', 'ValueType', 'any');
+            indexGroup(obj.NodeIndex, node);
         end
 
         function node = readNodeInfo(obj, nodePath)
@@ -26,7 +90,13 @@ classdef HDF5Reader < io.backend.base.Reader
                 obj
                 nodePath (1,1) string
             end
-            node = h5info(obj.Filename, char(nodePath));
+            nodePath = normalizePath(nodePath);
+            if obj.NodeIndex.isKey(nodePath)
+                node = obj.NodeIndex(nodePath);
+            else
+                % Not indexed, e.g. readRootInfo was not called yet
+                node = h5info(obj.Filename, nodePath);
+            end
         end
 
         function attributeValue = readAttributeValue(obj, attributeInfo, context)
@@ -48,13 +118,11 @@ classdef HDF5Reader < io.backend.base.Reader
                         end
                     end
                 case 'H5T_REFERENCE'
-                    fid = H5F.open(obj.Filename, 'H5F_ACC_RDONLY', 'H5P_DEFAULT');
-                    aid = H5A.open_by_name(fid, context, attributeInfo.Name);
+                    aid = H5A.open_by_name(obj.getFileId(), context, attributeInfo.Name);
                     tid = H5A.get_type(aid);
                     attributeValue = io.parseReference(aid, tid, attributeInfo.Value);
                     H5T.close(tid);
                     H5A.close(aid);
-                    H5F.close(fid);
                 case 'H5T_ENUM'
                     if io.isBool(attributeInfo.Datatype.Type)
                         attributeValue = io.internal.h5.postprocess.toLogical(attributeInfo.Value);
@@ -72,17 +140,19 @@ classdef HDF5Reader < io.backend.base.Reader
         end
 
         function datasetValue = readDatasetValue(obj, datasetInfo, datasetPath)
-            % Open an HDF5 dataset handle for reading the dataset value
-            fid = H5F.open(obj.Filename, 'H5F_ACC_RDONLY', 'H5P_DEFAULT');
-            fidCleanup = onCleanup(@() H5F.close(fid));
-
-            did = H5D.open(fid, datasetPath);
-            didCleanup = onCleanup(@() H5D.close(did));
-
             % Read and postprocess the dataset value, or create a lazy data proxy
             % when appropriate
             datatype = datasetInfo.Datatype;
             dataspace = datasetInfo.Dataspace;
+            isEagerRead = strcmp(datatype.Class, 'H5T_REFERENCE') ...
+                || strcmp(dataspace.Type, 'scalar');
+
+            if isEagerRead
+                % Open an HDF5 dataset handle for reading the dataset value
+                did = H5D.open(obj.getFileId(), datasetPath);
+                didCleanup = onCleanup(@() H5D.close(did));
+            end
+
             if strcmp(datatype.Class, 'H5T_REFERENCE')
                 % Load all H5T references. This is required, unfortunately also a
                 % bottleneck
@@ -119,29 +189,66 @@ classdef HDF5Reader < io.backend.base.Reader
                         datasetValue = io.parseCompound(did, datasetValue, isScalar);
                 end
             else % non scalar
-                sid = H5D.get_space(did);
-                pid = H5D.get_create_plist(did);
-                isChunked = H5P.get_layout(pid) == H5ML.get_constant_value('H5D_CHUNKED');
-
-                tid = H5D.get_type(did);
-                classId = H5T.get_class(tid);
-                isNumeric = classId == H5ML.get_constant_value('H5T_INTEGER') ...
-                    || classId == H5ML.get_constant_value('H5T_FLOAT');
-                if isChunked && isNumeric
-                    datasetValue = types.untyped.DataPipe('filename', obj.Filename, 'path', datasetPath);
-                elseif any(dataspace.Size == 0)
+                % Use the indexed metadata, so the dataset is not opened
+                isChunked = ~isempty(datasetInfo.ChunkSize);
+                isNumeric = any(strcmp(datatype.Class, {'H5T_INTEGER', 'H5T_FLOAT'}));
+                if any(dataspace.Size == 0) && ~(isChunked && isNumeric)
                     datasetValue = [];
                 else
                     matlabDataType = io.internal.h5.datatype.datatypeInfoToMatlabType(datatype, datasetInfo.Name);
                     lazyArray = io.backend.hdf5.HDF5LazyArray(...
-                        obj.Filename, datasetPath, dataspace.Size, matlabDataType);
-                    datasetValue = types.untyped.DataStub(...
-                        obj.Filename, datasetPath, [], [], lazyArray);
+                        obj.Filename, datasetPath, dataspace.Size, matlabDataType, dataspace.MaxSize);
+                    if isChunked && isNumeric
+                        datasetValue = types.untyped.DataPipe(...
+                            'filename', obj.Filename, 'path', datasetPath, 'lazyArray', lazyArray);
+                    else
+                        datasetValue = types.untyped.DataStub(...
+                            obj.Filename, datasetPath, [], [], lazyArray);
+                    end
                 end
-                H5T.close(tid);
-                H5P.close(pid);
-                H5S.close(sid);
             end
         end
     end
+
+    methods (Access = private)
+        function fileId = getFileId(obj)
+        % getFileId - Get the pooled read-only identifier of the file. The
+        % identifier is owned by the pool and must not be closed.
+            pool = io.backend.hdf5.HDF5HandlePool.instance();
+            if isempty(obj.Pool) || ~isvalid(obj.Pool) || obj.Pool ~= pool
+                obj.PoolKey = pool.register(obj.Filename);
+                obj.Pool = pool;
+                obj.IsUsingFile = false;
+            end
+            if ~obj.IsUsingFile
+                pool.beginUse(obj.PoolKey);
+                obj.IsUsingFile = true;
+            end
+            fileId = pool.getFile(obj.PoolKey);
+        end
+    end
+end
+
+function indexGroup(nodeIndex, groupInfo)
+% indexGroup - Add a group and all its datasets and subgroups to the index.
+    nodeIndex(groupInfo.Name) = groupInfo;
+    if strcmp(groupInfo.Name, '/')
+        prefix = '';
+    else
+        prefix = groupInfo.Name;
+    end
+    for i = 1:length(groupInfo.Datasets)
+        nodeIndex([prefix '/' groupInfo.Datasets(i).Name]) = groupInfo.Datasets(i);
+    end
+    for i = 1:length(groupInfo.Groups)
+        indexGroup(nodeIndex, groupInfo.Groups(i));
+    end
+end
+
+function nodePath = normalizePath(nodePath)
+% normalizePath - Remove repeated and trailing separators from an HDF5 path.
+    nodePath = regexprep(char(nodePath), '/+', '/');
+    if length(nodePath) > 1 && nodePath(end) == '/'
+        nodePath(end) = [];
+    end
 end
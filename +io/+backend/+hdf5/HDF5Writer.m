@@ -32,6 +32,7 @@ classdef HDF5Writer < io.backend.base.Writer
                 obj.H5FileId = fileReference;
                 obj.OwnsFileHandle = false;
             else
+                io.backend.hdf5.HDF5HandlePool.instance().invalidate(filename);
                 if isfile(obj.Filename)
                     if mode == "edit"
                         obj.H5FileId = H5F.open(filename, 'H5F_ACC_RDWR', 'H5P_DEFAULT');
@@ -54,6 +55,9 @@ classdef HDF5Writer < io.backend.base.Writer
         function close(obj)
             if obj.OwnsFileHandle && ~isempty(obj.H5FileId) && isvalid(obj.H5FileId)
                 H5F.close(obj.H5FileId);
+                % Identifiers opened while the file was open for writing
+                % would keep it open with write access.
+                io.backend.hdf5.HDF5HandlePool.instance().invalidate(obj.Filename);
             end
             obj.H5FileId = [];
         end
@@ -27,6 +27,7 @@ classdef BackendFactory
             arguments
                 filename (1,1) string
                 options.StorageBackend (1,1) string = "auto"
+                options.UseInfoCache (1,1) logical = false
             end
 
             storageBackend = io.backend.BackendFactory.normalizeStorageBackend(options.StorageBackend);
@@ -34,7 +35,8 @@ classdef BackendFactory
             switch storageBackend
                 case "auto"
                     if io.backend.BackendFactory.isHDF5File(filename)
-                        reader = io.backend.hdf5.HDF5Reader(filename);
+                        reader = io.backend.hdf5.HDF5Reader(filename, ...
+                            UseInfoCache=options.UseInfoCache);
                     else
                         error("NWB:BackendFactory:UnsupportedFormat", ...
                             "No supported reader found for `%s`.", filename)
@@ -44,7 +46,8 @@ classdef BackendFactory
                         error("NWB:BackendFactory:InvalidHDF5", ...
                             "`%s` is not a valid HDF5 file.", filename)
                     end
-                    reader = io.backend.hdf5.HDF5Reader(filename);
+                    reader = io.backend.hdf5.HDF5Reader(filename, ...
+                        UseInfoCache=options.UseInfoCache);
                 otherwise
                     error("NWB:BackendFactory:UnsupportedBackend", ...
                         "Unsupported backend `%s`.", storageBackend)
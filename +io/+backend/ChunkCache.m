@@ -0,0 +1,169 @@
+classdef ChunkCache < handle
+% ChunkCache - Process-wide cache of decoded dataset chunks.
+%
+% Lazy arrays of chunked numeric datasets can read whole chunks through
+% this cache instead of reading the selected elements directly. Repeated
+% and overlapping reads of the same chunks (e.g. sliding windows over an
+% ElectricalSeries) are then served from memory, without reading and
+% decompressing the chunks again.
+%
+% The cache is disabled by default. It is enabled by setting MaxMemory,
+% the memory budget for all cached chunks in bytes. When the budget is
+% exceeded, the least recently used chunks are removed.
+%
+% Usage:
+%   cache = io.backend.ChunkCache.instance();
+%   cache.MaxMemory = 512 * 2^20; % Enable, with a budget of 512 MiB
+%   data = timeSeries.data(:, 1:1000); % Reads and caches chunks
+%   data = timeSeries.data(:, 500:1500); % Partly served from the cache
+%   fprintf('%d hits, %d misses\n', cache.NumHits, cache.NumMisses)
+%
+% See also: io.backend.base.LazyArray, io.backend.hdf5.HDF5HandlePool
+
+    properties
+        % MaxMemory - Memory budget of the cache in bytes. 0 disables the cache.
+        MaxMemory (1,1) double {mustBeNonnegative} = 0
+
+        % MaxChunksPerRead - Maximum number of chunks a read may touch to be
+        % served by the cache. Larger reads bypass the cache.
+        MaxChunksPerRead (1,1) double {mustBeInteger, mustBePositive} = 4096
+    end
+
+    properties (SetAccess = private)
+        % NumHits - Number of chunks served from the cache.
+        NumHits (1,1) double = 0
+
+        % NumMisses - Number of chunks read because they were not cached.
+        NumMisses (1,1) double = 0
+
+        % MemoryUsed - Total size of the cached chunks in bytes.
+        MemoryUsed (1,1) double = 0
+    end
+
+    properties (Dependent, SetAccess = private)
+        NumChunks
+    end
+
+    properties (Access = private)
+        % Entries - Map of chunk key to a struct with the fields Data,
+        % NumBytes and LastUsed (the value of AccessCounter at the last use).
+        Entries containers.Map
+        AccessCounter (1,1) double = 0
+    end
+
+    methods (Static)
+        function cache = instance()
+        % instance - Get the cache shared by all lazy arrays in this MATLAB session.
+            persistent sharedCache
+            if isempty(sharedCache) || ~isvalid(sharedCache)
+                sharedCache = io.backend.ChunkCache();
+            end
+            cache = sharedCache;
+        end
+    end
+
+    methods
+        function obj = ChunkCache()
+            obj.Entries = containers.Map('KeyType', 'char', 'ValueType', 'any');
+        end
+
+        function set.MaxMemory(obj, value)
+            obj.MaxMemory = value;
+            obj.evict(); %#ok<MCSUP>
+        end
+
+        function num = get.NumChunks(obj)
+            num = obj.Entries.Count;
+        end
+
+        function tf = isEnabled(obj)
+            tf = obj.MaxMemory > 0;
+        end
+
+        function [data, isCached] = get(obj, key)
+        % get - Get a cached chunk. Returns [] and false if the chunk is not cached.
+            key = char(key);
+            isCached = obj.Entries.isKey(key);
+            if isCached
+                obj.AccessCounter = obj.AccessCounter + 1;
+                entry = obj.Entries(key);
+                entry.LastUsed = obj.AccessCounter;
+                obj.Entries(key) = entry;
+                obj.NumHits = obj.NumHits + 1;
+                data = entry.Data;
+            else
+                obj.NumMisses = obj.NumMisses + 1;
+                data = [];
+            end
+        end
+
+        function put(obj, key, data)
+        % put - Add a chunk to the cache.
+            key = char(key);
+            if obj.Entries.isKey(key)
+                obj.remove(key);
+            end
+            numBytes = getNumBytes(data);
+            if numBytes > obj.MaxMemory
+                return
+            end
+            obj.AccessCounter = obj.AccessCounter + 1;
+            obj.Entries(key) = struct( ...
+                'Data', data, 'NumBytes', numBytes, 'LastUsed', obj.AccessCounter);
+            obj.MemoryUsed = obj.MemoryUsed + numBytes;
+            obj.evict();
+        end
+
+        function invalidate(obj, keyPrefix)
+        % invalidate - Remove all chunks with keys starting with keyPrefix,
+        % e.g. all chunks of a file which is opened for writing.
+            allKeys = obj.Entries.keys();
+            isMatch = startsWith(allKeys, keyPrefix);
+            for key = allKeys(isMatch)
+                obj.remove(key{1});
+            end
+        end
+
+        function clear(obj)
+        % clear - Remove all chunks.
+            obj.Entries = containers.Map('KeyType', 'char', 'ValueType', 'any');
+            obj.MemoryUsed = 0;
+        end
+
+        function resetStatistics(obj)
+        % resetStatistics - Reset the hit and miss counters.
+            obj.NumHits = 0;
+            obj.NumMisses = 0;
+        end
+    end
+
+    methods (Access = private)
+        function remove(obj, key)
+            entry = obj.Entries(key);
+            obj.Entries.remove(key);
+            obj.MemoryUsed = obj.MemoryUsed - entry.NumBytes;
+        end
+
+        function evict(obj)
+        % evict - Remove the least recently used chunks until the cache is
+        % within its memory budget.
+            if obj.MemoryUsed <= obj.MaxMemory
+                return
+            end
+            allKeys = obj.Entries.keys();
+            lastUsed = cellfun(@(e) e.LastUsed, obj.Entries.values());
+            [~, order] = sort(lastUsed);
+            for i = order
+                if obj.MemoryUsed <= obj.MaxMemory
+                    break
+                end
+                obj.remove(allKeys{i});
+            end
+        end
+    end
+end
+
+function numBytes = getNumBytes(data) %#ok<INUSD>
+    info = whos('data');
+    numBytes = info.bytes;
+end
@@ -0,0 +1,22 @@
+function chunkSize = getChunkSize(datasetId)
+% getChunkSize - Get the chunk size of a dataset in MATLAB dimension order.
+%
+% Syntax:
+%   chunkSize = io.internal.h5.getChunkSize(datasetId)
+%
+% Output Arguments:
+%   chunkSize - Size of the chunks of the dataset, or empty if the dataset
+%   is not chunked.
+
+    arguments
+        datasetId {matnwb.common.compatibility.mustBeA(datasetId, "H5ML.id")}
+    end
+
+    chunkSize = [];
+    dcpl = H5D.get_create_plist(datasetId);
+    dcplCleanup = onCleanup(@() H5P.close(dcpl));
+    if H5P.get_layout(dcpl) == H5ML.get_constant_value('H5D_CHUNKED')
+        [~, h5ChunkSize] = H5P.get_chunk(dcpl);
+        chunkSize = fliplr(h5ChunkSize);
+    end
+end
@@ -40,6 +40,7 @@ function [fileId, fileCleanupObj] = openFile(fileName, permission)
             accessFlag = 'H5F_ACC_RDONLY';
         case "w"
             accessFlag = 'H5F_ACC_RDWR';
+            io.backend.hdf5.HDF5HandlePool.instance().invalidate(fileName);
     end
     fileId = H5F.open(fileName, accessFlag, 'H5P_DEFAULT');
     fileCleanupObj = onCleanup(@(fid) H5F.close(fileId));
@@ -5,6 +5,11 @@ function shapes = findShapes(indices)
 % A Block selection, for instance, indicates that the (step, stride, count)
 % method used by H5S should be used while Point selection indicates that
 % only one part of this dimension should be iterated over at a time.
+%
+% The sorted unique indices are split into runs with a constant step in a
+% single pass. Contiguous runs and regularly strided runs (of at least
+% three indices) become Blocks, and the remaining scattered indices become
+% Points.
 import io.space.shape.Block;
 import io.space.shape.Point;
 validateattributes(indices, {'numeric'}, {'nonnegative', 'finite'});
@@ -16,54 +21,63 @@ assert(isvector(indices),...
     'NWB:DataStub:FindShapes:InvalidShape',...
     'Indices cannot be matrices.');
 indices = unique(indices);
-shapes = {};
-while ~isempty(indices)
-    BlockSelection = findOptimalBlock(indices);
-    if BlockSelection.length <= 1
-        for i = 1:length(indices)
-            shapes{end+1} = Point(indices(i));
-        end
-        return;
+[runStarts, runStops, runSteps] = findRuns(indices);
+shapes = cell(1, length(runStarts));
+for i = 1:length(runStarts)
+    if runStarts(i) == runStops(i)
+        shapes{i} = Point(indices(runStarts(i)));
+    else
+        shapes{i} = Block('start', indices(runStarts(i)), ...
+            'step', runSteps(i), 'stop', indices(runStops(i)));
     end
-    indices = setdiff(indices, BlockSelection.range, 'stable');
-    shapes{end+1} = BlockSelection;
 end
 end
 
-function optimalBlock = findOptimalBlock(indices)
-import io.space.shape.Block;
-if iscolumn(indices)
-    indices = indices .';
-end
-stop = 1;
-start = 1;
-step = 1;
-count = 0;
-for stepInd = 2:length(indices)
-    tempStep = indices(stepInd) - indices(1);
-    idealRange = indices(1):tempStep:indices(end);
-    if length(idealRange) <= count
-        break;
-    end
-    rangeMatches = ismembc(idealRange, indices);
-    startInd = find(rangeMatches, 1);
-    stopInd = find(rangeMatches, 1, 'last');
-    splitPoints = find(~rangeMatches(startInd:stopInd)) + startInd - 1;
-    if ~isempty(splitPoints)
-        subStarts = [startInd (splitPoints + 1)];
-        subStops = [(splitPoints - 1) stopInd];
-        segment = subStops - subStarts + 1;
-        [~, largestSegInd] = max(segment(:));
-        startInd = subStarts(largestSegInd);
-        stopInd = subStops(largestSegInd);
+function [runStarts, runStops, runSteps] = findRuns(indices)
+% findRuns - Split sorted unique indices into runs with a constant step.
+% Runs are returned as positions in indices. A run of a single index is a
+% point. Runs are built greedily from the left, a strided run of two indices
+% is not worth a hyperslab and is split into points.
+numIndices = length(indices);
+steps = reshape(diff(indices), 1, []);
+% First position (in steps) of each segment of equal steps
+segmentStarts = [1, find(diff(steps) ~= 0) + 1];
+segmentStops = [segmentStarts(2:end) - 1, length(steps)];
+
+runStarts = zeros(1, numIndices);
+runStops = zeros(1, numIndices);
+runSteps = ones(1, numIndices);
+numRuns = 0;
+nextIndex = 1; % First index not assigned to a run
+for iSegment = 1:length(segmentStarts)
+    if isempty(steps)
+        break
     end
-    subCount = sum(rangeMatches(startInd:stopInd));
-    if subCount > count
-        start = idealRange(startInd);
-        stop = idealRange(stopInd);
-        step = tempStep;
-        count = subCount;
+    first = max(segmentStarts(iSegment), nextIndex);
+    last = segmentStops(iSegment) + 1; % A segment of n steps spans n+1 indices
+    step = steps(segmentStarts(iSegment));
+    if last - first >= 2 || (last - first == 1 && step == 1)
+        numRuns = numRuns + 1;
+        runStarts(numRuns) = first;
+        runStops(numRuns) = last;
+        runSteps(numRuns) = step;
+        nextIndex = last + 1;
+    else
+        % Too short for a block, the last index may start the next run
+        for iIndex = first:(last - 1)
+            numRuns = numRuns + 1;
+            runStarts(numRuns) = iIndex;
+            runStops(numRuns) = iIndex;
+        end
+        nextIndex = max(nextIndex, last);
     end
 end
-optimalBlock = Block('start', start, 'step', step, 'stop', stop);
-end
\ No newline at end of file
+for iIndex = nextIndex:numIndices
+    numRuns = numRuns + 1;
+    runStarts(numRuns) = iIndex;
+    runStops(numRuns) = iIndex;
+end
+runStarts = runStarts(1:numRuns);
+runStops = runStops(1:numRuns);
+runSteps = runSteps(1:numRuns);
+end
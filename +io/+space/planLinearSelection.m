@@ -0,0 +1,72 @@
+function hyperslabs = planLinearSelection(indices, dims)
+%PLANLINEARSELECTION Plan a selection of linear indices as hyperslabs.
+% hyperslabs = PLANLINEARSELECTION(indices, dims) returns a struct array
+% of hyperslabs which together select the elements at the (sorted, unique)
+% linear indices of an array of size dims. Each hyperslab has the fields
+% start, stride, count and block, which are vectors in MATLAB dimension
+% order with 1-indexed starts (see io.space.Shape/getSpaceSpec).
+%
+% Indices are split by position along the first non-singleton dimension
+% and by the subscripts of the remaining dimensions. Each part is segmented
+% with io.space.findShapes, so contiguous runs and regular strides become a
+% single hyperslab. Returns an empty struct if the indices are so scattered
+% that a point selection is cheaper (on average, a hyperslab would select
+% fewer than MINELEMENTSPERHYPERSLAB elements).
+MINELEMENTSPERHYPERSLAB = 4;
+
+validateattributes(dims, {'numeric'}, {'vector', 'nonnegative'});
+hyperslabs = struct('start', {}, 'stride', {}, 'count', {}, 'block', {});
+indices = unique(indices(:));
+if isempty(indices)
+    return;
+end
+if isscalar(dims)
+    dims = [dims 1];
+end
+rank = length(dims);
+
+splitDimension = find(dims > 1, 1);
+if isempty(splitDimension)
+    splitDimension = 1;
+end
+innerSize = prod(dims(1:splitDimension));
+innerIndices = mod(indices - 1, innerSize) + 1;
+outerIndices = floor((indices - 1) / innerSize) + 1;
+
+% indices are sorted, so each outer index is a contiguous range.
+groupStarts = [1; find(diff(outerIndices)) + 1];
+groupStops = [groupStarts(2:end) - 1; length(indices)];
+outerDims = [dims(splitDimension+1:end) 1 1]; % ind2sub requires two or more dims
+
+maxNumHyperslabs = floor(length(indices) / MINELEMENTSPERHYPERSLAB);
+shapes = cell(1, length(groupStarts));
+numHyperslabs = 0;
+for iGroup = 1:length(groupStarts)
+    shapes{iGroup} = io.space.findShapes( ...
+        innerIndices(groupStarts(iGroup):groupStops(iGroup)));
+    numHyperslabs = numHyperslabs + length(shapes{iGroup});
+    if numHyperslabs > maxNumHyperslabs
+        return; % point selection is cheaper
+    end
+end
+
+hyperslabs(numHyperslabs).start = [];
+iHyperslab = 0;
+for iGroup = 1:length(groupStarts)
+    outerSubscripts = cell(1, length(outerDims));
+    [outerSubscripts{:}] = ind2sub(outerDims, outerIndices(groupStarts(iGroup)));
+    outerSubscripts = [outerSubscripts{:}];
+    for iShape = 1:length(shapes{iGroup})
+        [start, stride, count, block] = shapes{iGroup}{iShape}.getSpaceSpec();
+        iHyperslab = iHyperslab + 1;
+        hyperslabs(iHyperslab).start = ...
+            [ones(1, splitDimension - 1), start, outerSubscripts(1:rank - splitDimension)];
+        hyperslabs(iHyperslab).stride = ...
+            [ones(1, splitDimension - 1), stride, ones(1, rank - splitDimension)];
+        hyperslabs(iHyperslab).count = ...
+            [ones(1, splitDimension - 1), count, ones(1, rank - splitDimension)];
+        hyperslabs(iHyperslab).block = ...
+            [ones(1, splitDimension - 1), block, ones(1, rank - splitDimension)];
+    end
+end
+end
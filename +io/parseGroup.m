@@ -1,7 +1,10 @@
-function parsed = parseGroup(filename, info, blacklist, reader)
+function parsed = parseGroup(filename, info, blacklist, reader, lazyGroups)
 % NOTE, group name is in path format so we need to parse that out.
 % parsed is either a containers.Map containing properties mapped to values OR a
 % typed value
+% If lazyGroups is true, typed subgroups are represented by
+% types.untyped.internal.LazyGroup placeholders which are parsed on first
+% access, see nwbRead.
 if nargin < 3
     blacklist = struct(...
         'attributes', {{'.specloc', 'object_id'}},...
@@ -10,6 +13,9 @@ end
 if nargin < 4
     reader = io.backend.BackendFactory.createReader(filename);
 end
+if nargin < 5
+    lazyGroups = false;
+end
 
 links = containers.Map;
 refs = containers.Map;
@@ -34,7 +40,15 @@ for i=1:length(info.Groups)
         continue;
     end
     [~, gname] = io.pathParts(group.Name);
-    subg = io.parseGroup(filename, group, blacklist, reader);
+    if lazyGroups
+        groupTypeInfo = io.getNeurodataTypeInfo(group.Attributes);
+    end
+    if lazyGroups && ~isempty(groupTypeInfo.typename)
+        subg = types.untyped.internal.LazyGroup( ...
+            filename, group, groupTypeInfo.typename, blacklist, reader);
+    else
+        subg = io.parseGroup(filename, group, blacklist, reader, lazyGroups);
+    end
     groupProperties(gname) = subg;
 end
 
@@ -49,9 +63,8 @@ for i=1:length(info.Links)
         'Please report!'], link.Type, fullPath)
     switch link.Type
         case {'soft link', 'hard link'}
+            % Resolved from the reader's metadata index, without reading the file
             S = reader.readNodeInfo(string(link.Value{1}));
-            % Suggested improvement: Use info structure if Link is located in the group (or
-            % subgroup) which is currently being parsed.
 
             typeInfo = io.getNeurodataTypeInfo(S.Attributes);
             fullTargetTypeName = typeInfo.typename;
@@ -76,6 +89,9 @@ else
         elided_gprops = elide(groupProperties, properties(Type.typename));
         groupProperties = [groupProperties; elided_gprops];
     end
+    % Only entries of sets can be loaded on access, the validators of named
+    % properties need the parsed group.
+    groupProperties = loadNamedProperties(Type.typename, groupProperties);
 
     typeProperties = [attributeProperties; datasetProperties; groupProperties; linkProperties];
     typeProperties = io.internal.eagerLoadProperties(Type.typename, typeProperties);
@@ -100,6 +116,18 @@ else
 end
 end
 
+function groupProperties = loadNamedProperties(typename, groupProperties)
+typeProperties = properties(typename);
+groupNames = keys(groupProperties);
+for i = 1:length(groupNames)
+    value = groupProperties(groupNames{i});
+    if isa(value, 'types.untyped.internal.LazyGroup') ...
+            && any(strcmp(groupNames{i}, typeProperties))
+        groupProperties(groupNames{i}) = value.load();
+    end
+end
+end
+
 %NOTE: SIDE EFFECTS ALTER THE SET
 function elided = elide(set, prop, prefix)
 %given raw data representation, match to closest property.
@@ -0,0 +1,27 @@
+function hash = computeHash(data)
+% computeHash - Return the SHA-256 hash of text or bytes as a hexadecimal string
+%
+% Text is encoded as UTF-8 before hashing.
+%
+% Example:
+%
+%   hash = matnwb.common.internal.computeHash('abc')
+%
+%   hash =
+%       "ba7816bf8f01cfea414140de5dae2223b00361a396177a9cb410ff61f20015ad"
+
+    arguments
+        data {matnwb.common.compatibility.mustBeA(data, ["char", "string", "uint8"])}
+    end
+
+    if ~isa(data, 'uint8')
+        data = unicode2native(char(data), 'UTF-8');
+    end
+
+    messageDigest = java.security.MessageDigest.getInstance('SHA-256');
+    if ~isempty(data)
+        messageDigest.update(typecast(data(:), 'int8'));
+    end
+    digest = typecast(messageDigest.digest(), 'uint8');
+    hash = string(lower(reshape(dec2hex(digest, 2).', 1, [])));
+end
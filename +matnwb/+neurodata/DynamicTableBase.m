@@ -3,13 +3,19 @@ classdef (Abstract) DynamicTableBase < handle
 %
 % This class owns handwritten DynamicTable behavior that the generated
 % schema class cannot express: row and column mutation helpers, row
-% retrieval, table conversion, table clearing, and DynamicTable consistency
-% validation.
+% retrieval, columnar scans, table conversion, table clearing, and
+% DynamicTable consistency validation.
 
     properties (Abstract)
         id
         colnames
     end
+
+    properties (Access = private, Transient)
+        % IndexDataCache - Map of the file path of a VectorIndex dataset to a
+        % struct with the fields Stub (the DataStub) and Data (its values).
+        IndexDataCache = []
+    end
     
     methods
         function addRow(obj, columnName, columnValue, options)
@@ -155,6 +161,61 @@ classdef (Abstract) DynamicTableBase < handle
             row = types.util.dynamictable.getRow(obj, rowIndices, nvPairs{:});
         end
 
+        function [result, rowIndices] = scan(obj, options)
+        % scan - Read selected columns and rows of the DynamicTable column by column.
+        %
+        % Syntax:
+        %  result = dynamicTable.scan() reads all columns, including the id
+        %  column, into a MATLAB table.
+        %
+        %  [result, rowIndices] = dynamicTable.scan(Name, Value) reads only
+        %  the projected columns of the selected rows, and returns the row
+        %  indices of the rows in result (see Input Arguments).
+        %
+        % Input Arguments:
+        %  - options (name-value pairs) -
+        %    Optional name-value pairs. Available options:
+        %
+        %    - columns (string) -
+        %      Names of the columns to read. Defaults to "id" followed by
+        %      the colnames of the table.
+        %
+        %    - rows (double) -
+        %      Row indices of the rows to read, e.g. a range of rows.
+        %      Defaults to all rows.
+        %
+        %    - where (containers.Map) -
+        %      Map of column names to tests. A function is evaluated on the
+        %      column values, any other value is tested for equality. Only
+        %      rows matching all tests are read.
+        %
+        %    - asTable (logical) -
+        %      If false, return a struct of column values instead of a
+        %      MATLAB table. Defaults to true.
+        %
+        % Output Arguments:
+        %  - result (table | struct) -
+        %    The values of the selected rows, one variable or field per
+        %    column.
+        %
+        %  - rowIndices (double) -
+        %    Row indices of the rows in result.
+        %
+        % Each column is read with a single bulk selection. See
+        % types.util.dynamictable.scan for details.
+
+            arguments
+                obj (1,1) {matnwb.common.validation.mustBeDynamicTable}
+                options.columns (1,:)
+                options.rows (1,:) double {mustBeInteger, mustBePositive}
+                options.where containers.Map
+                options.asTable (1,1) logical
+            end
+
+            nvPairs = namedargs2cell(options);
+            [result, rowIndices] = types.util.dynamictable.scan(obj, nvPairs{:});
+        end
+
         function table = toTable(obj, keepRegionsIndexed)
         % toTable - Convert the DynamicTable to a MATLAB table.
         %
@@ -203,6 +264,41 @@ classdef (Abstract) DynamicTableBase < handle
 
             types.util.dynamictable.checkConfig(obj);
         end
+
+        function values = getIndexValues(obj, vectorIndex, indices)
+        % getIndexValues - Read values of a VectorIndex column of this table.
+        %
+        % The data of a VectorIndex which is stored in a file is read once
+        % and cached, as the bounds of any row of a ragged column are read
+        % from it.
+
+            if ~isa(vectorIndex.data, 'types.untyped.DataStub')
+                if isa(vectorIndex.data, 'types.untyped.DataPipe')
+                    values = vectorIndex.data.load(indices);
+                else
+                    values = vectorIndex.data(indices);
+                end
+                return;
+            end
+
+            if isempty(obj.IndexDataCache)
+                obj.IndexDataCache = containers.Map('KeyType', 'char', 'ValueType', 'any');
+            end
+            stub = vectorIndex.data;
+            cacheKey = [stub.filename '|' stub.path];
+            isCached = false;
+            if obj.IndexDataCache.isKey(cacheKey)
+                cacheEntry = obj.IndexDataCache(cacheKey);
+                isCached = cacheEntry.Stub == stub;
+            end
+            if isCached
+                data = cacheEntry.Data;
+            else
+                data = stub.load();
+                obj.IndexDataCache(cacheKey) = struct('Stub', stub, 'Data', data);
+            end
+            values = data(indices);
+        end
     end
 
     methods (Access = private)
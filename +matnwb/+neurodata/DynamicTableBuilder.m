@@ -0,0 +1,504 @@
+classdef DynamicTableBuilder < handle
+% DynamicTableBuilder - Buffer rows of a DynamicTable and add them in one step.
+%
+% Adding rows with addRow concatenates every column and VectorIndex of the
+% table on each call, so building a table row by row takes time quadratic
+% in the number of rows. A DynamicTableBuilder keeps added rows in buffers
+% which grow geometrically, tracks the element counts of ragged columns as
+% rows are added, and appends all buffered rows to the table with a single
+% concatenation per column on commit. Building a table then takes time
+% linear in the number of rows.
+%
+% Rows are added with the same syntax and semantics as addRow: values are
+% validated against the types of the columns, ragged values add VectorIndex
+% columns as needed and ids default to the (0-based) row index. Batches of
+% rows can be added as a MATLAB table with addRows. The DynamicTable should
+% not be modified otherwise while the builder holds rows.
+%
+% Usage:
+%   builder = matnwb.neurodata.DynamicTableBuilder(nwb.units);
+%   for iUnit = 1:numUnits
+%       builder.addRow('spike_times', spikeTimes{iUnit});
+%   end
+%   builder.commit(); % Appends all rows to nwb.units
+%
+% See also: matnwb.neurodata.DynamicTableBase
+
+    properties (SetAccess = private)
+        % DynamicTable - The table which rows are added to.
+        DynamicTable
+
+        % NumRows - Number of buffered rows which are not yet committed.
+        NumRows (1,1) double = 0
+    end
+
+    properties (Access = private)
+        % TypeMap - Map of column names to the type of their values,
+        % see types.util.dynamictable.getTypeMap.
+        TypeMap
+
+        % ColumnIndices - Map of column names to their index in the
+        % per-column properties below.
+        ColumnIndices
+        ColumnNames (1,:) cell = {}
+        % NumExistingLevels - Number of VectorData and VectorIndex columns
+        % of each column which exist in the table.
+        NumExistingLevels (1,:) double = []
+        % NumLevels - Number of VectorData and VectorIndex columns needed
+        % for each column, including the buffered rows.
+        NumLevels (1,:) double = []
+        % AppendDimension - Dimension along which the data of each column
+        % is concatenated, NaN until the first value is added.
+        AppendDimension (1,:) double = []
+        ValueClasses (1,:) cell = {}
+        IsDataPipe (1,:) logical = logical([])
+        ColumnNumRows (1,:) double = []
+
+        % Buffers of all columns, which are grouped by column on commit.
+        % Pieces are VectorData values and Counts are VectorIndex element
+        % counts, each in the order they were added.
+        Pieces cell = cell(0, 1)
+        PieceColumns double = zeros(0, 1)
+        NumPieces (1,1) double = 0
+        Counts double = zeros(0, 1)
+        CountColumns double = zeros(0, 1)
+        CountLevels double = zeros(0, 1)
+        NumCounts (1,1) double = 0
+        Ids double = zeros(0, 1)
+
+        NumExistingRows (1,1) double = 0
+    end
+
+    methods
+        function obj = DynamicTableBuilder(dynamicTable)
+            arguments
+                dynamicTable (1,1) {matnwb.common.validation.mustBeDynamicTable}
+            end
+
+            assert(~isempty(dynamicTable.colnames), ...
+                'NWB:DynamicTable:AddRow:NoColumns',...
+                ['The `colnames` property of the DynamicTable needs to be ', ...
+                'populated with a cell array of column names before being ', ...
+                'able to add row data.'])
+            if isempty(dynamicTable.id)
+                types.util.dynamictable.internal.initDynamicTableId(dynamicTable);
+            end
+            assertIsEditable(dynamicTable)
+            if isa(dynamicTable, 'matnwb.neurodata.DynamicTableBase')
+                dynamicTable.ensureDynamicTableConsistency()
+            end
+
+            obj.DynamicTable = dynamicTable;
+            obj.reset();
+        end
+
+        function addRow(obj, varargin)
+        % addRow - Add a single row to the buffer.
+        %
+        % Syntax:
+        %  builder.addRow(columnName, columnValue, ..., columnNameN, columnValueN)
+        %  adds a row with a value for every column of the table.
+        %
+        %  builder.addRow(__, 'id', id) provides a custom id for the row.
+
+            assert(mod(length(varargin), 2) == 0, ...
+                'NWB:DynamicTable:AddRow:InvalidArguments', ...
+                'Column names and values must be given in pairs.');
+            names = cellfun(@char, varargin(1:2:end), 'UniformOutput', false);
+            values = varargin(2:2:end);
+
+            isId = strcmp(names, 'id');
+            if any(isId)
+                newId = values{find(isId, 1, 'last')};
+                validateattributes(newId, {'numeric'}, {'scalar'});
+            else
+                newId = obj.NumExistingRows + obj.NumRows;
+            end
+            names = names(~isId);
+            values = values(~isId);
+            obj.validateColumnNames(names);
+
+            for iColumn = 1:length(names)
+                obj.addValue(obj.getColumnIndex(names{iColumn}), values{iColumn});
+            end
+            obj.appendIds(double(newId));
+            obj.NumRows = obj.NumRows + 1;
+        end
+
+        function addRows(obj, rows)
+        % addRows - Add a batch of rows to the buffer.
+        %
+        % Syntax:
+        %  builder.addRows(rows) adds the rows of the MATLAB table rows,
+        %  which has a variable for every column of the DynamicTable and
+        %  optionally an 'id' variable. Each element of a cell variable is
+        %  the value of one row, as it would be given to addRow.
+        %
+        % Variables of scalar values per row are added in bulk.
+
+            arguments
+                obj (1,1) matnwb.neurodata.DynamicTableBuilder
+                rows table
+            end
+
+            names = rows.Properties.VariableNames;
+            numNewRows = height(rows);
+            isId = strcmp(names, 'id');
+            if any(isId)
+                newIds = double(rows.id);
+            else
+                newIds = obj.NumExistingRows + obj.NumRows + (0:numNewRows-1)';
+            end
+            names = names(~isId);
+            obj.validateColumnNames(names);
+
+            for iName = 1:length(names)
+                iColumn = obj.getColumnIndex(names{iName});
+                values = rows.(names{iName});
+                if obj.canAddInBulk(iColumn, values)
+                    obj.addBulkValues(iColumn, values);
+                    continue;
+                end
+                for iRow = 1:numNewRows
+                    if iscell(values)
+                        obj.addValue(iColumn, values{iRow});
+                    else
+                        obj.addValue(iColumn, values(iRow, :));
+                    end
+                end
+            end
+            obj.appendIds(reshape(newIds, [], 1));
+            obj.NumRows = obj.NumRows + numNewRows;
+        end
+
+        function commit(obj)
+        % commit - Append all buffered rows to the DynamicTable and clear the buffer.
+
+            if obj.NumRows == 0
+                return;
+            end
+            dynamicTable = obj.DynamicTable;
+            assertIsEditable(dynamicTable)
+
+            for iColumn = 1:length(obj.ColumnNames)
+                obj.commitColumn(iColumn);
+            end
+
+            newIds = obj.Ids(1:obj.NumRows);
+            if isa(dynamicTable.id.data, 'types.untyped.DataPipe')
+                dynamicTable.id.data.append(newIds);
+            else
+                dynamicTable.id.data = [double(dynamicTable.id.data); newIds];
+            end
+
+            obj.reset();
+        end
+    end
+
+    methods (Access = private)
+        function reset(obj)
+            dynamicTable = obj.DynamicTable;
+            obj.TypeMap = types.util.dynamictable.getTypeMap(dynamicTable);
+            obj.ColumnIndices = containers.Map('KeyType', 'char', 'ValueType', 'double');
+            obj.ColumnNames = {};
+            obj.NumExistingLevels = [];
+            obj.NumLevels = [];
+            obj.AppendDimension = [];
+            obj.ValueClasses = {};
+            obj.IsDataPipe = logical([]);
+            obj.ColumnNumRows = [];
+
+            obj.Pieces = cell(0, 1);
+            obj.PieceColumns = zeros(0, 1);
+            obj.NumPieces = 0;
+            obj.Counts = zeros(0, 1);
+            obj.CountColumns = zeros(0, 1);
+            obj.CountLevels = zeros(0, 1);
+            obj.NumCounts = 0;
+            obj.Ids = zeros(0, 1);
+            obj.NumRows = 0;
+
+            if isa(dynamicTable.id.data, 'types.untyped.DataPipe')
+                obj.NumExistingRows = dynamicTable.id.data.offset;
+            else
+                obj.NumExistingRows = length(dynamicTable.id.data);
+            end
+        end
+
+        function validateColumnNames(obj, names)
+            colnames = obj.DynamicTable.colnames;
+            if ischar(colnames)
+                colnames = {colnames};
+            end
+            invalidNames = setdiff(names, colnames);
+            assert(isempty(invalidNames),...
+                'NWB:DynamicTable:AddRow:InvalidColumns',...
+                'Invalid column name(s) { %s }', strjoin(invalidNames, ', '));
+            missingColumns = setdiff(colnames, names);
+            assert(isempty(missingColumns),...
+                'NWB:DynamicTable:AddRow:MissingColumns',...
+                'Missing columns { %s }', strjoin(missingColumns, ', '));
+        end
+
+        function iColumn = getColumnIndex(obj, name)
+            if obj.ColumnIndices.isKey(name)
+                iColumn = obj.ColumnIndices(name);
+                return;
+            end
+
+            iColumn = length(obj.ColumnNames) + 1;
+            obj.ColumnIndices(name) = iColumn;
+            obj.ColumnNames{iColumn} = name;
+
+            Vector = getVector(obj.DynamicTable, name);
+            if isempty(Vector)
+                numExistingLevels = 0;
+                isDataPipe = false;
+            else
+                numExistingLevels = length(getIndexChain(obj.DynamicTable, name));
+                isDataPipe = isa(Vector.data, 'types.untyped.DataPipe');
+            end
+            obj.NumExistingLevels(iColumn) = numExistingLevels;
+            obj.NumLevels(iColumn) = max(1, numExistingLevels);
+            obj.AppendDimension(iColumn) = NaN;
+            obj.ValueClasses{iColumn} = '';
+            obj.IsDataPipe(iColumn) = isDataPipe;
+            obj.ColumnNumRows(iColumn) = 0;
+        end
+
+        function addValue(obj, iColumn, value)
+        % addValue - Add the value of one row of a column, as addRawData does.
+            name = obj.ColumnNames{iColumn};
+            if obj.TypeMap.isKey(name)
+                value = types.util.dynamictable.internal.validateColumnValue( ...
+                    obj.TypeMap(name), value, name);
+            end
+            if isempty(obj.ValueClasses{iColumn})
+                obj.ValueClasses{iColumn} = class(value);
+            end
+
+            if obj.IsDataPipe(iColumn)
+                Vector = getVector(obj.DynamicTable, name);
+                depth = types.util.dynamictable.internal.getNestedDataDepth( ...
+                    value, 'dataPipeDimension', Vector.data.axis);
+            else
+                % validate shape for appending in memory.
+                types.util.dynamictable.internal.checkNestedShape(value);
+                depth = types.util.dynamictable.internal.getNestedDataDepth(value);
+            end
+
+            % add indices until it matches depth. Each buffered row has a
+            % single element in a new index.
+            while obj.NumLevels(iColumn) < depth
+                obj.NumLevels(iColumn) = obj.NumLevels(iColumn) + 1;
+                obj.appendCounts(iColumn, obj.NumLevels(iColumn), ...
+                    ones(obj.ColumnNumRows(iColumn), 1));
+            end
+
+            % wrap until available vector indices match depth.
+            for iLevel = (depth+1):obj.NumLevels(iColumn)
+                value = {value};
+            end
+
+            if ischar(value)
+                value = {value};
+            end
+
+            obj.addNestedValue(iColumn, obj.NumLevels(iColumn), value);
+            obj.ColumnNumRows(iColumn) = obj.ColumnNumRows(iColumn) + 1;
+            obj.updateTypeMap(name);
+        end
+
+        function numElements = addNestedValue(obj, iColumn, level, value)
+            if level > 1
+                if iscell(value) && ~iscellstr(value)
+                    numElements = length(value);
+                    for iEntry = 1:numElements
+                        obj.addNestedValue(iColumn, level - 1, value{iEntry});
+                    end
+                else
+                    numElements = obj.addNestedValue(iColumn, level - 1, value);
+                end
+                obj.appendCounts(iColumn, level, numElements);
+                return;
+            end
+
+            if ischar(value)
+                value = mat2cell(value, ones(size(value, 1), 1));
+            end % char matrices converted to cell arrays containing character vectors.
+
+            appendDimension = obj.getAppendDimension(iColumn, value);
+            if istable(value)
+                numElements = height(value);
+            else
+                numElements = size(value, appendDimension);
+            end
+            obj.appendPiece(iColumn, value);
+        end
+
+        function tf = canAddInBulk(obj, iColumn, values)
+            tf = obj.NumLevels(iColumn) == 1 && ~obj.IsDataPipe(iColumn) ...
+                && iscolumn(values) && ~isempty(values) ...
+                && ((isnumeric(values) || islogical(values)) || iscellstr(values));
+        end
+
+        function addBulkValues(obj, iColumn, values)
+        % addBulkValues - Add scalar values of many rows as one piece.
+            name = obj.ColumnNames{iColumn};
+            if obj.TypeMap.isKey(name)
+                values = types.util.dynamictable.internal.validateColumnValue( ...
+                    obj.TypeMap(name), values, name);
+            end
+            if isempty(obj.ValueClasses{iColumn})
+                obj.ValueClasses{iColumn} = class(values);
+            end
+
+            appendDimension = obj.getAppendDimension(iColumn, values(1));
+            pieceSize = ones(1, max(2, appendDimension));
+            pieceSize(appendDimension) = numel(values);
+            obj.appendPiece(iColumn, reshape(values, pieceSize));
+            obj.ColumnNumRows(iColumn) = obj.ColumnNumRows(iColumn) + numel(values);
+            obj.updateTypeMap(name);
+        end
+
+        function appendDimension = getAppendDimension(obj, iColumn, value)
+            appendDimension = obj.AppendDimension(iColumn);
+            if ~isnan(appendDimension)
+                return;
+            end
+            Vector = getVector(obj.DynamicTable, obj.ColumnNames{iColumn});
+            if obj.IsDataPipe(iColumn)
+                appendDimension = Vector.data.axis;
+            else
+                if isempty(Vector)
+                    columnData = [];
+                else
+                    columnData = Vector.data;
+                end
+                appendDimension = types.util.dynamictable.internal.getAppendDimension( ...
+                    columnData, value);
+            end
+            obj.AppendDimension(iColumn) = appendDimension;
+        end
+
+        function updateTypeMap(obj, name)
+        % updateTypeMap - Set the type of a new column from its first value,
+        % which later rows are validated against, as with addRow.
+            if obj.TypeMap.isKey(name)
+                return;
+            end
+            firstPiece = obj.Pieces{find(obj.PieceColumns(1:obj.NumPieces) ...
+                == obj.ColumnIndices(name), 1)};
+            if iscellstr(firstPiece)
+                typeName = 'cellstr';
+            elseif istable(firstPiece)
+                typeName = 'table';
+            else
+                typeName = class(firstPiece(1));
+            end
+            obj.TypeMap(name) = struct('type', typeName, 'dims', size(firstPiece));
+        end
+
+        function appendPiece(obj, iColumn, value)
+            if obj.NumPieces == length(obj.Pieces)
+                newCapacity = max(16, 2 * length(obj.Pieces));
+                obj.Pieces{newCapacity, 1} = [];
+                obj.PieceColumns(newCapacity, 1) = 0;
+            end
+            obj.NumPieces = obj.NumPieces + 1;
+            obj.Pieces{obj.NumPieces} = value;
+            obj.PieceColumns(obj.NumPieces) = iColumn;
+        end
+
+        function appendCounts(obj, iColumn, level, counts)
+            numNewCounts = length(counts);
+            if obj.NumCounts + numNewCounts > length(obj.Counts)
+                newCapacity = max([16, 2 * length(obj.Counts), obj.NumCounts + numNewCounts]);
+                obj.Counts(newCapacity, 1) = 0;
+                obj.CountColumns(newCapacity, 1) = 0;
+                obj.CountLevels(newCapacity, 1) = 0;
+            end
+            newIndices = obj.NumCounts + (1:numNewCounts);
+            obj.Counts(newIndices) = counts;
+            obj.CountColumns(newIndices) = iColumn;
+            obj.CountLevels(newIndices) = level;
+            obj.NumCounts = obj.NumCounts + numNewCounts;
+        end
+
+        function appendIds(obj, newIds)
+            numNewIds = length(newIds);
+            if obj.NumRows + numNewIds > length(obj.Ids)
+                obj.Ids(max([16, 2 * length(obj.Ids), obj.NumRows + numNewIds]), 1) = 0;
+            end
+            obj.Ids(obj.NumRows + (1:numNewIds)) = newIds;
+        end
+
+        function commitColumn(obj, iColumn)
+            dynamicTable = obj.DynamicTable;
+            name = obj.ColumnNames{iColumn};
+
+            if obj.NumExistingLevels(iColumn) == 0
+                types.util.dynamictable.internal.initVectorData( ...
+                    dynamicTable, name, obj.ValueClasses{iColumn});
+            end
+            indexChain = getIndexChain(dynamicTable, name);
+            for iLevel = (length(indexChain)+1):obj.NumLevels(iColumn)
+                indexChain{iLevel} = types.util.dynamictable.addVecInd( ...
+                    dynamicTable, indexChain{end});
+            end
+
+            isColumnPiece = obj.PieceColumns(1:obj.NumPieces) == iColumn;
+            newData = cat(obj.AppendDimension(iColumn), obj.Pieces{isColumnPiece});
+            Vector = getVector(dynamicTable, name);
+            if isa(Vector.data, 'types.untyped.DataPipe')
+                Vector.data.append(newData);
+            else
+                Vector.data = cat(obj.AppendDimension(iColumn), Vector.data, newData);
+            end
+
+            for iLevel = 2:obj.NumLevels(iColumn)
+                isLevelCount = obj.CountColumns(1:obj.NumCounts) == iColumn ...
+                    & obj.CountLevels(1:obj.NumCounts) == iLevel;
+                VectorIndex = getVector(dynamicTable, indexChain{iLevel});
+                newOffsets = types.util.dynamictable.internal.getLastIndexOffset(VectorIndex) ...
+                    + cumsum(obj.Counts(isLevelCount));
+                if isa(VectorIndex.data, 'types.untyped.DataPipe')
+                    VectorIndex.data.append(newOffsets);
+                else
+                    VectorIndex.data = [double(VectorIndex.data); newOffsets];
+                end
+            end
+        end
+    end
+end
+
+function Vector = getVector(dynamicTable, name)
+    if isprop(dynamicTable, name)
+        Vector = dynamicTable.(name);
+    elseif isprop(dynamicTable, 'vectorindex') && dynamicTable.vectorindex.isKey(name)
+        Vector = dynamicTable.vectorindex.get(name);
+    elseif dynamicTable.vectordata.isKey(name)
+        Vector = dynamicTable.vectordata.get(name);
+    else
+        Vector = [];
+    end
+end
+
+function indexChain = getIndexChain(dynamicTable, name)
+% getIndexChain - Names of a column and its VectorIndex columns, data first.
+    indexChain = {name};
+    while true
+        index = types.util.dynamictable.getIndex(dynamicTable, indexChain{end});
+        if isempty(index)
+            break;
+        end
+        indexChain{end+1} = index; %#ok<AGROW>
+    end
+end
+
+function assertIsEditable(dynamicTable)
+    assert(~isa(dynamicTable.id.data, 'types.untyped.DataStub'), ...
+        'NWB:DynamicTable:AddRow:Uneditable', ...
+        ['Cannot write to on-file Dynamic Tables without enabling data pipes. '...
+        'If this was produced with pynwb, please enable chunking for this table.']);
+end
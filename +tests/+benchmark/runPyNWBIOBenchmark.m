@@ -0,0 +1,386 @@
+function results = runPyNWBIOBenchmark(options)
+% runPyNWBIOBenchmark - Measure MatNWB/PyNWB round-trip throughput at scale.
+%
+% Syntax:
+%   results = tests.benchmark.runPyNWBIOBenchmark() runs every benchmark
+%   case for the default sizes and storage layouts and returns the results
+%   as a cell array of structs. The same results are written as JSON to
+%   the file "pynwb_io_benchmark.json" in the output folder.
+%
+%   results = tests.benchmark.runPyNWBIOBenchmark(Name, Value) specifies
+%   options using one or more name-value arguments.
+%
+% For every combination of case, size and layout, the benchmark
+%   1. writes a file with PyNWB and reads it with MatNWB, and
+%   2. writes a file with MatNWB and reads it with PyNWB.
+% Each step produces one result record with the fields case, operation,
+% library, layout, size_mb, bytes, file_bytes, seconds, mb_per_s, objects,
+% objects_per_s and peak_rss_mb. The Python side of the benchmark is
+% implemented in "+tests/+system/PyNWBIOBenchmark.py" and runs every step
+% in a fresh Python process using the interpreter in PYTHON_EXECUTABLE.
+%
+% Name-Value Arguments:
+%   - Cases (string) - Default: all cases. Any of "electrical_series",
+%     "two_photon_series" and "units".
+%
+%   - SizesMB (double) - Default: [1 10 100]. Nominal size of the main
+%     dataset in megabytes. Use values in the thousands for multi-GB runs.
+%
+%   - Layouts (string) - Default: all layouts. Any of "contiguous",
+%     "chunked" and "gzip". Contiguous datasets are held in memory in full
+%     when they are written.
+%
+%   - OutputFolder (string) - Default: a new temporary folder. Folder for
+%     the benchmark files and the JSON report.
+%
+%   - KeepFiles (logical) - Default: false. Whether to keep the benchmark
+%     NWB files after each step has been measured.
+%
+%   - UseFixtureCache (logical) - Default: false. Whether to reuse files
+%     written by PyNWB from the fixture cache (see FixtureCache.py). Each
+%     file is then built once and shared across runs; the write records of
+%     reused files are those of the run which built them and are marked
+%     with "cached": true.
+%
+% Note: peak_rss_mb for MatNWB records is the peak resident memory of the
+% MATLAB process so far (Linux only) and is therefore non-decreasing over
+% the course of a run.
+%
+% Usage:
+%  Example 1 - Benchmark electrical series up to 2 GB::
+%
+%    results = tests.benchmark.runPyNWBIOBenchmark( ...
+%        'Cases', "electrical_series", 'SizesMB', [10 100 2000]);
+
+    arguments
+        options.Cases (1,:) string {mustBeMember(options.Cases, ...
+            ["electrical_series", "two_photon_series", "units"])} = ...
+            ["electrical_series", "two_photon_series", "units"]
+        options.SizesMB (1,:) double {mustBePositive} = [1 10 100]
+        options.Layouts (1,:) string {mustBeMember(options.Layouts, ...
+            ["contiguous", "chunked", "gzip"])} = ["contiguous", "chunked", "gzip"]
+        options.OutputFolder (1,1) string = tempname
+        options.KeepFiles (1,1) logical = false
+        options.UseFixtureCache (1,1) logical = false
+    end
+
+    tests.util.setTestEnvironmentVariables()
+    pythonExecutable = string(getenv("PYTHON_EXECUTABLE"));
+    scriptPath = fullfile(misc.getMatnwbDir(), '+tests', '+system', 'PyNWBIOBenchmark.py');
+
+    outputFolder = options.OutputFolder;
+    if ~isfolder(outputFolder); mkdir(outputFolder); end
+
+    results = {};
+    for benchmarkCase = options.Cases
+        for sizeMB = options.SizesMB
+            for layout = options.Layouts
+                baseName = sprintf('%s.%gMB.%s', benchmarkCase, sizeMB, layout);
+
+                % PyNWB -> MatNWB
+                pyFile = fullfile(outputFolder, "PyNWB." + baseName + ".nwb");
+                writeArguments = ["write", benchmarkCase, string(sizeMB), layout, pyFile];
+                if options.UseFixtureCache
+                    writeArguments(end+1) = "--cache"; %#ok<AGROW>
+                end
+                % With the fixture cache, the file is read from the cache
+                % folder and the returned record holds its location
+                results{end+1} = runPython(pythonExecutable, scriptPath, writeArguments); %#ok<AGROW>
+                results{end+1} = readWithMatNWB(benchmarkCase, results{end}.filename); %#ok<AGROW>
+
+                % MatNWB -> PyNWB
+                matFile = fullfile(outputFolder, "MatNWB." + baseName + ".nwb");
+                results{end+1} = writeWithMatNWB(benchmarkCase, sizeMB, layout, matFile); %#ok<AGROW>
+                results{end+1} = runPython(pythonExecutable, scriptPath, ...
+                    ["read", benchmarkCase, matFile]); %#ok<AGROW>
+
+                if ~options.KeepFiles
+                    deleteIfExists(pyFile)
+                    deleteIfExists(matFile)
+                end
+            end
+        end
+    end
+
+    reportFile = fullfile(outputFolder, 'pynwb_io_benchmark.json');
+    fid = fopen(reportFile, 'w');
+    fileCleanup = onCleanup(@() fclose(fid));
+    fprintf(fid, '%s', jsonencode(results, 'PrettyPrint', true));
+    fprintf('Benchmark results written to "%s"\n', reportFile)
+end
+
+function record = runPython(pythonExecutable, scriptPath, arguments)
+    resultFile = string(tempname) + ".json";
+    resultCleanup = onCleanup(@() deleteIfExists(resultFile));
+    cmd = sprintf('"%s" "%s" %s --output "%s"', pythonExecutable, scriptPath, ...
+        strjoin("""" + arguments + """", " "), resultFile);
+    [status, cmdout] = system(cmd);
+    if status ~= 0
+        error('NWB:Benchmark:PythonFailed', ...
+            'PyNWB benchmark step "%s" failed:\n%s', arguments(1), cmdout)
+    end
+    record = jsondecode(fileread(resultFile));
+end
+
+function record = readWithMatNWB(benchmarkCase, filename)
+    startTime = tic;
+    nwb = nwbRead(filename, 'ignorecache');
+    dataStub = getDataset(nwb, benchmarkCase);
+    numBytes = readInBlocks(dataStub);
+    if benchmarkCase == "units"
+        numObjects = nwb.units.id.data.dims(1);
+    else
+        numObjects = dataStub.dims(end);
+    end
+    seconds = toc(startTime);
+    record = makeRecord(benchmarkCase, 'read', [], numBytes / 1e6, ...
+        filename, seconds, numBytes, numObjects);
+end
+
+function record = writeWithMatNWB(benchmarkCase, sizeMB, layout, filename)
+    startTime = tic;
+    nwb = NwbFile( ...
+        'session_description', 'a benchmark NWB File', ...
+        'identifier', 'BENCH123', ...
+        'session_start_time', '2018-12-02T12:57:27.371444-08:00', ...
+        'timestamps_reference_time', '2018-12-02T12:57:27.371444-08:00');
+
+    switch benchmarkCase
+        case "electrical_series"
+            numChannels = 384;
+            numSamples = max(1, floor(sizeMB * 1e6 / (numChannels * 2)));
+            [data, appendBlocks] = createData([numChannels, numSamples], 'int16', [64, 8192], layout);
+            numObjects = numSamples;
+            addElectricalSeries(nwb, data);
+        case "two_photon_series"
+            frameSize = [512, 512];
+            numFrames = max(1, floor(sizeMB * 1e6 / (prod(frameSize) * 2)));
+            [data, appendBlocks] = createData([frameSize, numFrames], 'uint16', [frameSize, 1], layout);
+            numObjects = numFrames;
+            addTwoPhotonSeries(nwb, data);
+        case "units"
+            spikesPerUnit = 10000;
+            numUnits = max(1, floor(sizeMB * 1e6 / (spikesPerUnit * 8)));
+            [data, appendBlocks] = createData([numUnits * spikesPerUnit, 1], 'double', [131072, 1], layout);
+            numObjects = numUnits;
+            addUnits(nwb, data, numUnits, spikesPerUnit);
+    end
+
+    nwbExport(nwb, filename);
+    for iBlock = 1:numel(appendBlocks)
+        data.append(appendBlocks{iBlock}());
+    end
+    seconds = toc(startTime);
+
+    info = h5info(filename, getDatasetPath(benchmarkCase));
+    numBytes = prod(info.Dataspace.Size) * info.Datatype.Size;
+    record = makeRecord(benchmarkCase, 'write', layout, sizeMB, ...
+        filename, seconds, numBytes, numObjects);
+end
+
+function [data, appendBlocks] = createData(dataSize, dataType, chunkSize, layout)
+% createData - Create data (or a DataPipe) with the requested layout.
+%
+%   Values are a function of the position along the appendable
+%   dimension, matching the data written by PyNWBIOBenchmark.py. For
+%   chunked layouts, only the first block is created up front and the
+%   remaining blocks are returned as function handles that generate the
+%   data to append after export, so the full dataset is never in memory.
+
+    if numel(dataSize) == 2 && dataSize(2) == 1
+        axis = 1; % Column vector
+    else
+        axis = numel(dataSize);
+    end
+    chunkSize = min(chunkSize, dataSize);
+    generate = @(first, last) generateBlock(dataSize, axis, first, last, dataType);
+
+    if layout == "contiguous"
+        data = generate(1, dataSize(axis));
+        appendBlocks = {};
+        return
+    end
+
+    if layout == "gzip"
+        compressionLevel = 3;
+    else
+        compressionLevel = -1;
+    end
+
+    otherDims = setdiff(1:numel(dataSize), axis);
+    elementBytes = prod(dataSize(otherDims)) * numel(typecast(cast(0, dataType), 'uint8'));
+    blockLength = max(chunkSize(axis), floor(256e6 / elementBytes / chunkSize(axis)) * chunkSize(axis));
+    blockStarts = 1:blockLength:dataSize(axis);
+    blockEnds = min(blockStarts + blockLength - 1, dataSize(axis));
+
+    data = types.untyped.DataPipe( ...
+        'data', generate(blockStarts(1), blockEnds(1)), ...
+        'maxSize', dataSize, ...
+        'axis', axis, ...
+        'chunkSize', chunkSize, ...
+        'compressionLevel', compressionLevel);
+
+    appendBlocks = cell(1, numel(blockStarts) - 1);
+    for iBlock = 2:numel(blockStarts)
+        appendBlocks{iBlock-1} = @() generate(blockStarts(iBlock), blockEnds(iBlock));
+    end
+end
+
+function block = generateBlock(dataSize, axis, first, last, dataType)
+    ramp = mod(first-1:last-1, 1000);
+    rampShape = ones(1, numel(dataSize));
+    rampShape(axis) = numel(ramp);
+    blockSize = dataSize;
+    blockSize(axis) = numel(ramp);
+    block = cast(repmat(reshape(ramp, rampShape), blockSize ./ rampShape), dataType);
+end
+
+function addElectricalSeries(nwb, data)
+    device = types.core.Device('description', 'benchmark probe');
+    nwb.general_devices.set('probe', device);
+    electrodeGroup = types.core.ElectrodeGroup( ...
+        'description', 'benchmark shank', ...
+        'location', 'CA1', ...
+        'device', types.untyped.SoftLink(device));
+    nwb.general_extracellular_ephys.set('shank0', electrodeGroup);
+
+    numChannels = size(data, 1);
+    electrodes = util.createElectrodeTable();
+    for iChannel = 1:numChannels
+        electrodes.addRow( ...
+            'location', {'CA1'}, ...
+            'group', types.untyped.ObjectView(electrodeGroup), ...
+            'group_name', {'shank0'});
+    end
+    nwb.general_extracellular_ephys_electrodes = electrodes;
+
+    electricalSeries = types.core.ElectricalSeries( ...
+        'data', data, ...
+        'starting_time', 0.0, ...
+        'starting_time_rate', 30000.0, ...
+        'electrodes', types.hdmf_common.DynamicTableRegion( ...
+            'data', (0:numChannels-1)', ...
+            'table', types.untyped.ObjectView(electrodes), ...
+            'description', 'all electrodes'));
+    nwb.acquisition.set('ElectricalSeries', electricalSeries);
+end
+
+function addTwoPhotonSeries(nwb, data)
+    device = types.core.Device('description', 'benchmark microscope');
+    nwb.general_devices.set('microscope', device);
+    imagingPlane = types.core.ImagingPlane( ...
+        'description', 'a fake ImagingPlane', ...
+        'optchan1', types.core.OpticalChannel( ...
+            'description', 'a fake OpticalChannel', ...
+            'emission_lambda', 3.14), ...
+        'device', types.untyped.SoftLink(device), ...
+        'excitation_lambda', 6.28, ...
+        'imaging_rate', 30.0, ...
+        'indicator', 'GFP', ...
+        'location', 'somewhere in the brain');
+    nwb.general_optophysiology.set('imgpln1', imagingPlane);
+
+    twoPhotonSeries = types.core.TwoPhotonSeries( ...
+        'data', data, ...
+        'data_unit', 'n.a.', ...
+        'imaging_plane', types.untyped.SoftLink(imagingPlane), ...
+        'starting_time', 0.0, ...
+        'starting_time_rate', 30.0);
+    nwb.acquisition.set('TwoPhotonSeries', twoPhotonSeries);
+end
+
+function addUnits(nwb, data, numUnits, spikesPerUnit)
+    spikeTimes = types.hdmf_common.VectorData( ...
+        'data', data, ...
+        'description', 'the spike times for each unit in seconds');
+    nwb.units = types.core.Units( ...
+        'colnames', {'spike_times'}, ...
+        'description', 'benchmark units', ...
+        'id', types.hdmf_common.ElementIdentifiers('data', int64(0:numUnits-1)'), ...
+        'spike_times', spikeTimes, ...
+        'spike_times_index', types.hdmf_common.VectorIndex( ...
+            'data', uint64(1:numUnits)' * spikesPerUnit, ...
+            'target', types.untyped.ObjectView(spikeTimes), ...
+            'description', 'Index for VectorData ''spike_times'''));
+end
+
+function dataStub = getDataset(nwb, benchmarkCase)
+    switch benchmarkCase
+        case "electrical_series"
+            dataStub = nwb.acquisition.get('ElectricalSeries').data;
+        case "two_photon_series"
+            dataStub = nwb.acquisition.get('TwoPhotonSeries').data;
+        case "units"
+            dataStub = nwb.units.spike_times.data;
+    end
+end
+
+function datasetPath = getDatasetPath(benchmarkCase)
+    switch benchmarkCase
+        case "electrical_series"
+            datasetPath = '/acquisition/ElectricalSeries/data';
+        case "two_photon_series"
+            datasetPath = '/acquisition/TwoPhotonSeries/data';
+        case "units"
+            datasetPath = '/units/spike_times';
+    end
+end
+
+function numBytes = readInBlocks(dataStub)
+% readInBlocks - Read a DataStub in blocks of about 64 MB along its last
+% dimension and return the number of bytes read.
+    dims = dataStub.dims;
+    rank = numel(dims);
+    numBytes = 0;
+    if rank == 1 || (rank == 2 && dims(2) == 1)
+        dims = [1, prod(dims)];
+        rank = 2;
+        loadBlock = @(first, last) dataStub.load_mat_style(first:last);
+    else
+        selection = arrayfun(@(n) 1:n, dims(1:rank-1), 'UniformOutput', false);
+        loadBlock = @(first, last) dataStub.load_mat_style(selection{:}, first:last);
+    end
+    blockLength = max(1, floor(64e6 / (prod(dims(1:rank-1)) * 8)));
+    for first = 1:blockLength:dims(rank)
+        last = min(first + blockLength - 1, dims(rank));
+        block = loadBlock(first, last);
+        blockInfo = whos('block');
+        numBytes = numBytes + blockInfo.bytes;
+    end
+end
+
+function record = makeRecord(benchmarkCase, operation, layout, sizeMB, filename, seconds, numBytes, numObjects)
+    fileInfo = dir(filename);
+    record = struct( ...
+        'case', char(benchmarkCase), ...
+        'operation', operation, ...
+        'library', 'matnwb', ...
+        'layout', char(layout), ...
+        'size_mb', sizeMB, ...
+        'filename', char(filename), ...
+        'file_bytes', fileInfo.bytes, ...
+        'bytes', numBytes, ...
+        'seconds', seconds, ...
+        'mb_per_s', numBytes / 1e6 / seconds, ...
+        'objects', numObjects, ...
+        'objects_per_s', numObjects / seconds, ...
+        'peak_rss_mb', getPeakResidentMemory(), ...
+        'versions', struct('matlab', version, 'matnwb', misc.getMatnwbVersion()));
+end
+
+function peakMB = getPeakResidentMemory()
+    peakMB = NaN; % Encoded as null in the JSON report
+    statusFile = '/proc/self/status';
+    if isfile(statusFile)
+        tokens = regexp(fileread(statusFile), 'VmHWM:\s*(\d+)\s*kB', 'tokens', 'once');
+        if ~isempty(tokens)
+            peakMB = str2double(tokens{1}) / 1e3;
+        end
+    end
+end
+
+function deleteIfExists(filename)
+    if isfile(filename)
+        delete(filename)
+    end
+end
@@ -5,7 +5,9 @@ classdef NwbClearGeneratedFixture < matlab.unittest.fixtures.Fixture
 %   generated classes for NWB types from the matnwb folder. When the fixture is 
 %   set up, all generated class files for NWB types are deleted. When the 
 %   fixture is torn down, generateCore is called to regenerate the classes for 
-%   NWB types of the latest NWB version
+%   NWB types of the latest NWB version. On the workers of a parallel test
+%   run (see nwbtest), the MatNWB root folder is left untouched because it
+%   is cleared and restored once for the whole run.
 %
 % See also matlab.unittest.fixtures.Fixture generateCore nwbClearGenerated
 
@@ -26,12 +28,25 @@ classdef NwbClearGeneratedFixture < matlab.unittest.fixtures.Fixture
     
     methods
         function setup(fixture)
+            if fixture.isParallelWorker() && ...
+                    strcmp(fixture.TypesOutputFolder, misc.getMatnwbDir())
+                % The MatNWB root folder is shared by all workers of a
+                % parallel run. nwbtest clears it before the run and
+                % regenerates the classes afterwards.
+                return
+            end
             fixture.addTeardown( ...
                 @() generateCore('savedir', fixture.TypesOutputFolder) )
             nwbClearGenerated(fixture.TypesOutputFolder)
         end
     end
 
+    methods (Static, Access = private)
+        function tf = isParallelWorker()
+            tf = strcmp(getenv('NWBTEST_PARALLEL_WORKER'), '1');
+        end
+    end
+
     methods (Access = protected)
         function tf = isCompatible(fixtureA, fixtureB)
             tf = strcmp(fixtureA.TypesOutputFolder, fixtureB.TypesOutputFolder);
@@ -0,0 +1,30 @@
+classdef PyNWBTestWorkerFixture < matlab.unittest.fixtures.Fixture
+% PyNWBTestWorkerFixture - Fixture for sharing one PyNWB test worker process.
+%
+% PyNWBTestWorkerFixture starts a tests.util.PyNWBTestWorker when the testing
+% framework sets up the fixture, so that all test classes sharing the fixture
+% run their Python-side tests in the same Python process and pay the cost of
+% importing pynwb only once per test session. The worker process is shut
+% down when the framework tears down the fixture.
+%
+% See also tests.util.PyNWBTestWorker tests.system.PyNWBIOTest
+
+    properties (SetAccess = private)
+        % Worker - The tests.util.PyNWBTestWorker shared by the test classes
+        Worker
+    end
+
+    methods
+        function setup(fixture)
+            % The Python executable is configured through the test
+            % environment file (see tests.fixtures.SetEnvironmentVariableFixture)
+            tests.util.setTestEnvironmentVariables()
+
+            pythonExecutable = getenv("PYTHON_EXECUTABLE");
+            moduleFolder = fullfile(misc.getMatnwbDir(), '+tests', '+system');
+
+            fixture.Worker = tests.util.PyNWBTestWorker(pythonExecutable, moduleFolder);
+            fixture.addTeardown(@() delete(fixture.Worker))
+        end
+    end
+end
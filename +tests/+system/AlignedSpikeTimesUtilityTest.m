@@ -105,5 +105,69 @@ classdef (SharedTestFixtures = {tests.fixtures.GenerateCoreFixture}) ...
                 'AbsTol', 1e-10 ...
             )
         end
+
+        function spikeTableTest(testCase)
+            file = NwbFile( ...
+                'session_start_time', '2021-01-01 00:00:00', ...
+                'identifier', 'ident1', ...
+                'session_description', 'test file' ...
+            );
+            trial_times = [1; 2; 3.5; 5];
+            file.intervals_trials = types.core.TimeIntervals( ...
+                'description', 'test trials', ...
+                'colnames', {'start_time', 'stop_time', 'cond'}, ...
+                'start_time', types.hdmf_common.VectorData( ...
+                    'description', 'start_times column', 'data', trial_times), ...
+                'stop_time', types.hdmf_common.VectorData( ...
+                    'description', 'stop_times column', 'data', trial_times + .5), ...
+                'cond', types.hdmf_common.VectorData( ...
+                    'description', 'condition column', 'data', [1; 2; 1; 2]), ...
+                'id', types.hdmf_common.ElementIdentifiers('data', (0:3)') ...
+            );
+            file.units = types.core.Units( ...
+                'description', 'test Units', ...
+                'colnames', {'spike_times'} ...
+            );
+            spike_times = {sort(6 * rand(50, 1)), [10; 11], [0.5; 1; 1.25; 2; 2.5; 5.5]};
+            for unit = 1:length(spike_times)
+                file.units.addRow('spike_times', spike_times{unit});
+            end
+            filename = 'MatNWB.spikeTableTest.nwb';
+            nwbExport(file, filename);
+            read_file = nwbRead(filename, 'ignorecache');
+
+            % all units, subset of trials
+            ST = util.loadTrialAlignedSpikeTable(read_file, ...
+                'before_time', 0.5, 'after_time', 0.75, ...
+                'conditions', containers.Map({'cond'}, {2}));
+            expected = getExpectedTable(spike_times, 1:3, trial_times, [2; 4], 0.5, 0.75);
+            testCase.verifyEqual(ST.unit, expected.unit);
+            testCase.verifyEqual(ST.trial, expected.trial);
+            testCase.verifyEqual(ST.time, expected.time, 'AbsTol', 1e-10);
+
+            % subset of units, spikes at the window bounds are included
+            ST = util.loadEventAlignedSpikeTable(read_file, [1.5; 2], ...
+                'units', [3 1], 'before_time', 0.5, 'after_time', 0.5);
+            expected = getExpectedTable(spike_times, [3 1], [1.5; 2], [1; 2], 0.5, 0.5);
+            testCase.verifyEqual(ST.unit, expected.unit);
+            testCase.verifyEqual(ST.trial, expected.trial);
+            testCase.verifyEqual(ST.time, expected.time, 'AbsTol', 1e-10);
+            testCase.verifyEqual(ST.time(ST.unit == 3 & ST.trial == 1), [-0.5; -0.25; 0.5]);
+        end
+    end
+end
+
+function expected = getExpectedTable(spike_times, units, event_times, events, before_time, after_time)
+    expected = struct('unit', zeros(0, 1), 'trial', zeros(0, 1), 'time', zeros(0, 1));
+    for unit = units
+        for event = reshape(events, 1, [])
+            ref_time = event_times(event);
+            times = spike_times{unit}( ...
+                spike_times{unit} >= ref_time - before_time & ...
+                spike_times{unit} <= ref_time + after_time) - ref_time;
+            expected.unit = [expected.unit; repmat(unit, length(times), 1)];
+            expected.trial = [expected.trial; repmat(event, length(times), 1)];
+            expected.time = [expected.time; times];
+        end
     end
-end
\ No newline at end of file
+end
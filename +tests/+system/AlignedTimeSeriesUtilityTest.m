@@ -0,0 +1,167 @@
+classdef (SharedTestFixtures = {tests.fixtures.GenerateCoreFixture}) ...
+        AlignedTimeSeriesUtilityTest < matlab.unittest.TestCase
+
+    properties (Constant)
+        Rate = 100
+        Data = (1:4)' * 10000 + (1:1000)
+    end
+
+    methods (TestMethodSetup)
+        function setupMethod(testCase)
+            testCase.applyFixture(matlab.unittest.fixtures.WorkingFolderFixture);
+        end
+    end
+
+    methods (Test)
+        function eventAlignedDataWithRate(testCase)
+            timeseries = types.core.TimeSeries( ...
+                'data', testCase.Data, ...
+                'data_unit', 'V', ...
+                'starting_time', 0, ...
+                'starting_time_rate', testCase.Rate);
+            readTimeseries = testCase.writeAndRead(timeseries);
+
+            window = [-0.25, 0.25];
+            times = [2.5; 1; 9.5; 2.5];
+            D = util.loadEventAlignedTimeSeriesData(readTimeseries, window, times);
+
+            startIndices = round((times + window(1)) * testCase.Rate) + 1;
+            testCase.verifySize(D, [4, 4, 50]);
+            testCase.verifyEqual(D, testCase.getExpected(startIndices, 50, 1, 1:4));
+
+            D = util.loadEventAlignedTimeSeriesData(readTimeseries, window, times, 3, [4 2]);
+            testCase.verifyEqual(D, testCase.getExpected(startIndices, 17, 3, [4 2]));
+
+            % in-memory data gives the same result
+            testCase.verifyEqual( ...
+                util.loadEventAlignedTimeSeriesData(timeseries, window, times, 3, [4 2]), D);
+        end
+
+        function eventAlignedDataMatchesLoadTimeSeriesData(testCase)
+            timeseries = types.core.TimeSeries( ...
+                'data', testCase.Data, ...
+                'data_unit', 'V', ...
+                'starting_time', 0, ...
+                'starting_time_rate', testCase.Rate);
+            readTimeseries = testCase.writeAndRead(timeseries);
+
+            window = [-0.25, 0.5];
+            times = [2.5; 1; 9; 0.25];
+            electrodeSelections = {[], 3, [4 2]};
+            for iSelection = 1:numel(electrodeSelections)
+                electrodes = electrodeSelections{iSelection};
+                D = util.loadEventAlignedTimeSeriesData( ...
+                    readTimeseries, window, times, 1, electrodes);
+                for i = 1:length(times)
+                    expected = util.loadTimeSeriesData( ...
+                        readTimeseries, window + times(i), 1, electrodes);
+                    if length(electrodes) > 1
+                        expected = expected';
+                    end
+                    testCase.verifyEqual(reshape(D(i, :, :), size(expected)), expected);
+                end
+            end
+        end
+
+        function windowOutsideOfDataIsAnError(testCase)
+            timeseries = types.core.TimeSeries( ...
+                'data', testCase.Data, ...
+                'data_unit', 'V', ...
+                'starting_time', 0, ...
+                'starting_time_rate', testCase.Rate);
+            readTimeseries = testCase.writeAndRead(timeseries);
+
+            testCase.verifyError( ...
+                @() util.loadEventAlignedTimeSeriesData(readTimeseries, [-0.25, 0.25], [2; 9.9]), ...
+                'NWB:LoadTimeSeries:InvalidTimeInterval');
+            testCase.verifyError( ...
+                @() util.loadEventAlignedTimeSeriesData(readTimeseries, [-0.25, 0.25], [0.1; 2]), ...
+                'NWB:LoadTimeSeries:InvalidTimeInterval');
+        end
+
+        function eventAlignedDataWithTimestamps(testCase)
+            timestamps = cumsum(0.005 + 0.01 * rand(1000, 1));
+            timeseries = types.core.TimeSeries( ...
+                'data', testCase.Data, ...
+                'data_unit', 'V', ...
+                'timestamps', timestamps);
+            readTimeseries = testCase.writeAndRead(timeseries);
+
+            window = [-0.05, 0.1];
+            times = timestamps([700; 20; 350]) + 0.001;
+            D = util.loadEventAlignedTimeSeriesData(readTimeseries, window, times, 1, 3);
+
+            numSamples = 0;
+            for i = 1:length(times)
+                numSamples = max(numSamples, nnz( ...
+                    timestamps >= times(i) + window(1) & timestamps <= times(i) + window(2)));
+            end
+            expected = NaN(length(times), 1, numSamples);
+            for i = 1:length(times)
+                isInWindow = timestamps >= times(i) + window(1) ...
+                    & timestamps <= times(i) + window(2);
+                expected(i, 1, 1:nnz(isInWindow)) = testCase.Data(3, isInWindow);
+            end
+            testCase.verifyEqual(D, expected);
+        end
+
+        function trialAlignedData(testCase)
+            file = NwbFile( ...
+                'session_start_time', '2021-01-01 00:00:00', ...
+                'identifier', 'ident1', ...
+                'session_description', 'test file');
+            startTimes = [1; 2; 3; 4];
+            file.intervals_trials = types.core.TimeIntervals( ...
+                'description', 'trials', ...
+                'colnames', {'start_time', 'stop_time', 'cond'}, ...
+                'start_time', types.hdmf_common.VectorData( ...
+                    'description', 'start times', 'data', startTimes), ...
+                'stop_time', types.hdmf_common.VectorData( ...
+                    'description', 'stop times', 'data', startTimes + 0.5), ...
+                'cond', types.hdmf_common.VectorData( ...
+                    'description', 'condition', 'data', [1; 2; 1; 2]), ...
+                'id', types.hdmf_common.ElementIdentifiers('data', (0:3)'));
+            file.acquisition.set('timeseries', types.core.TimeSeries( ...
+                'data', testCase.Data, ...
+                'data_unit', 'V', ...
+                'starting_time', 0, ...
+                'starting_time_rate', testCase.Rate));
+            nwbExport(file, 'trialAlignedData.nwb');
+            readFile = nwbRead('trialAlignedData.nwb', 'ignorecache');
+
+            window = [0, 0.25];
+            [D, tt] = util.loadTrialAlignedTimeSeriesData(readFile, ...
+                readFile.acquisition.get('timeseries'), window, 'stop_time', ...
+                containers.Map({'cond'}, {2}));
+
+            startIndices = round((startTimes([2; 4]) + 0.5) * testCase.Rate) + 1;
+            testCase.verifyEqual(D, testCase.getExpected(startIndices, 25, 1, 1:4));
+            testCase.verifyEqual(tt, linspace(0, 0.25, 25));
+        end
+    end
+
+    methods
+        function readTimeseries = writeAndRead(~, timeseries)
+            file = NwbFile( ...
+                'session_start_time', '2021-01-01 00:00:00', ...
+                'identifier', 'ident1', ...
+                'session_description', 'test file');
+            file.acquisition.set('timeseries', timeseries);
+            nwbExport(file, 'alignedTimeSeries.nwb');
+            readFile = nwbRead('alignedTimeSeries.nwb', 'ignorecache');
+            readTimeseries = readFile.acquisition.get('timeseries');
+        end
+
+        function expected = getExpected(testCase, startIndices, numSamples, downsampleFactor, electrodes)
+            numTimePoints = size(testCase.Data, 2);
+            expected = NaN(length(startIndices), length(electrodes), numSamples);
+            for i = 1:length(startIndices)
+                sampleIndices = startIndices(i) + (0:numSamples-1) * downsampleFactor;
+                isValid = sampleIndices >= 1 & sampleIndices <= numTimePoints;
+                expected(i, :, isValid) = reshape( ...
+                    testCase.Data(electrodes, sampleIndices(isValid)), ...
+                    [1, length(electrodes), nnz(isValid)]);
+            end
+        end
+    end
+end
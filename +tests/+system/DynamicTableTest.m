@@ -207,6 +207,42 @@ classdef DynamicTableTest < tests.system.RoundTripTest & tests.system.AmendTest
                 ActualTable.getRow([13, 19], 'useId', true));
         end
 
+        function scanRoundtripTest(testCase)
+            import matlab.unittest.fixtures.SuppressedWarningsFixture
+            suppressedWarningId = 'NWB:DynamicTable:VectorDataAmbiguousSize';
+            testCase.applyFixture(SuppressedWarningsFixture(suppressedWarningId))
+
+            filename = ['MatNWB.' testCase.className() '.testScan.nwb'];
+            nwbExport(testCase.file, filename);
+            ActualFile = nwbRead(filename, 'ignorecache');
+            ActualTable = ActualFile.intervals_trials;
+
+            % projection and row range
+            columns = {'start_time', 'randomvalues', 'stringdata'};
+            [scannedTable, rowIndices] = ActualTable.scan('columns', columns, 'rows', 3:12);
+            testCase.verifyEqual(scannedTable, ActualTable.getRow(3:12, 'columns', columns));
+            testCase.verifyEqual(rowIndices, (3:12)');
+
+            % scans of ragged columns give the same result with cached index data
+            testCase.verifyEqual( ...
+                ActualTable.scan('columns', columns, 'rows', 3:12), scannedTable);
+
+            % predicate pushdown
+            [scannedTable, rowIndices] = ActualTable.scan( ...
+                'columns', {'id', 'start_time'}, ...
+                'where', containers.Map({'start_time'}, {@(t) mod(t, 2) == 0}));
+            testCase.verifyEqual(rowIndices, (2:2:20)');
+            testCase.verifyEqual(scannedTable.start_time, (2:2:20)');
+            ids = primes(100)';
+            testCase.verifyEqual(double(scannedTable.id), ids(2:2:20));
+
+            % struct of columns
+            scannedColumns = ActualTable.scan('columns', {'randomvalues'}, ...
+                'rows', 5, 'asTable', false);
+            testCase.verifyEqual(scannedColumns.randomvalues, ...
+                ActualTable.getRow(5, 'columns', {'randomvalues'}).randomvalues);
+        end
+
         function toTableTest(testCase)
             % test DynamicTable toTable method.
             % 1. For a generic table, the toTable output should be very
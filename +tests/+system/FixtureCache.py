@@ -0,0 +1,194 @@
+"""
+Content-addressed cache for NWB files generated with PyNWB.
+
+Test and benchmark fixtures are identified by a key which is a hash of
+everything that determines their content: the source code that builds the
+file, the pynwb/hdmf/h5py versions and the NWB schema version. A file is
+built once per key and reused by later runs (and by every test that needs
+the same file) until it is evicted because the cache grew too large or the
+entry is too old.
+
+The cache is configured with environment variables:
+    MATNWB_FIXTURE_CACHE             Set to 1 to enable the cache (default: disabled).
+    MATNWB_FIXTURE_CACHE_DIR         Cache folder (default: <user cache folder>/matnwb/pynwb_fixtures).
+    MATNWB_FIXTURE_CACHE_MAX_MB      Maximum total size of the cache in MB (default: 4096).
+    MATNWB_FIXTURE_CACHE_MAX_AGE_DAYS  Maximum age of unused entries in days (default: 30).
+"""
+import functools
+import hashlib
+import inspect
+import json
+import os
+import shutil
+import tempfile
+import time
+
+import h5py
+import hdmf
+import pynwb
+
+DEFAULT_MAX_MB = 4096
+DEFAULT_MAX_AGE_DAYS = 30
+SUFFIX = '.nwb'
+
+
+def default_cache_dir():
+    root = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(root, 'matnwb', 'pynwb_fixtures')
+
+
+@functools.lru_cache(maxsize=None)
+def _environment_fingerprint():
+    return tuple(sorted(environment_fingerprint().items()))
+
+
+def environment_fingerprint():
+    """Versions which affect how PyNWB writes a file."""
+    try:
+        schema_version = pynwb.get_manager().type_map.namespace_catalog.get_namespace('core')['version']
+    except Exception:  # Fall back to the version bundled with pynwb
+        schema_version = getattr(pynwb, '__nwb_version__', 'unknown')
+    return {
+        'pynwb': pynwb.__version__,
+        'hdmf': hdmf.__version__,
+        'h5py': h5py.__version__,
+        'hdf5': h5py.version.hdf5_version,
+        'nwb_schema': schema_version,
+    }
+
+
+def make_key(*parts):
+    """
+    Return a hex digest for the given parts. Functions, methods and classes
+    contribute their source code; everything else contributes its repr.
+    The environment fingerprint is always included.
+    """
+    digest = hashlib.sha256()
+    for part in parts + (_environment_fingerprint(),):
+        if inspect.isroutine(part) or inspect.isclass(part):
+            text = inspect.getsource(part)
+        else:
+            text = repr(part)
+        digest.update(text.encode('utf-8'))
+        digest.update(b'\0')
+    return digest.hexdigest()
+
+
+class FixtureCache:
+    def __init__(self, directory=None, max_bytes=DEFAULT_MAX_MB * 1e6,
+                 max_age_seconds=DEFAULT_MAX_AGE_DAYS * 86400):
+        self.directory = directory or default_cache_dir()
+        self.max_bytes = max_bytes
+        self.max_age_seconds = max_age_seconds
+        os.makedirs(self.directory, exist_ok=True)
+
+    @classmethod
+    def from_environment(cls, enabled=None):
+        """
+        Create a cache configured by environment variables, or return None if disabled.
+
+        If enabled is None, MATNWB_FIXTURE_CACHE decides whether the cache is used.
+        """
+        if enabled is None:
+            enabled = os.environ.get('MATNWB_FIXTURE_CACHE', '0').strip().lower() in ('1', 'true', 'on')
+        if not enabled:
+            return None
+        max_mb = float(os.environ.get('MATNWB_FIXTURE_CACHE_MAX_MB') or DEFAULT_MAX_MB)
+        max_age_days = float(os.environ.get('MATNWB_FIXTURE_CACHE_MAX_AGE_DAYS') or DEFAULT_MAX_AGE_DAYS)
+        return cls(os.environ.get('MATNWB_FIXTURE_CACHE_DIR') or None,
+                   max_bytes=max_mb * 1e6, max_age_seconds=max_age_days * 86400)
+
+    def path(self, key):
+        return os.path.join(self.directory, key + SUFFIX)
+
+    def get(self, key):
+        """Return the path of the cached file for key, or None if it is not cached."""
+        path = self.path(key)
+        if not os.path.isfile(path):
+            return None
+        os.utime(path)  # Mark as recently used
+        return path
+
+    def get_or_create(self, key, build):
+        """
+        Return the path of the cached file for key, calling build(filename)
+        to create it first if needed. The file is built under a temporary
+        name and moved into place, so concurrent builders never expose a
+        partially written file.
+        """
+        path = self.get(key)
+        if path is not None:
+            return path
+        handle, temp_path = tempfile.mkstemp(suffix=SUFFIX, dir=self.directory, prefix='.building-')
+        os.close(handle)
+        os.remove(temp_path)
+        try:
+            build(temp_path)
+            os.replace(temp_path, self.path(key))
+        finally:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+        self.evict(keep=key)
+        return self.path(key)
+
+    def metadata_path(self, key):
+        return os.path.join(self.directory, key + '.json')
+
+    def get_metadata(self, key):
+        """Return the metadata stored with the cached file for key, or None."""
+        try:
+            with open(self.metadata_path(key)) as f:
+                return json.load(f)
+        except (FileNotFoundError, ValueError):
+            return None
+
+    def set_metadata(self, key, metadata):
+        """Store JSON-serializable metadata (e.g. how long the build took) with a cached file."""
+        with open(self.metadata_path(key), 'w') as f:
+            json.dump(metadata, f)
+
+    def fetch(self, key, build, destination):
+        """Copy the cached file for key (built if needed) to destination."""
+        shutil.copyfile(self.get_or_create(key, build), destination)
+        return destination
+
+    def entries(self):
+        """Return (path, size, last_used) for all cached files, oldest first."""
+        entries = []
+        for name in os.listdir(self.directory):
+            if not name.endswith(SUFFIX) or name.startswith('.'):
+                continue
+            path = os.path.join(self.directory, name)
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:  # Evicted concurrently
+                continue
+            entries.append((path, stat.st_size, stat.st_mtime))
+        return sorted(entries, key=lambda entry: entry[2])
+
+    def evict(self, keep=None):
+        """Remove entries older than the maximum age, then the least recently
+        used entries until the cache fits into its size budget."""
+        keep_path = self.path(keep) if keep else None
+        now = time.time()
+        entries = []
+        for path, size, last_used in self.entries():
+            if path != keep_path and now - last_used > self.max_age_seconds:
+                self._remove(path)
+            else:
+                entries.append((path, size, last_used))
+        total = sum(size for _, size, _ in entries)
+        for path, size, _ in entries:
+            if total <= self.max_bytes:
+                break
+            if path != keep_path:
+                self._remove(path)
+                total -= size
+
+    @staticmethod
+    def _remove(path):
+        for file_path in (path, path[:-len(SUFFIX)] + '.json'):
+            try:
+                os.remove(file_path)
+            except FileNotFoundError:
+                pass
@@ -0,0 +1,322 @@
+"""
+Round-trip throughput benchmarks for MatNWB/PyNWB interoperability.
+
+Each benchmark case builds one neurodata type at a requested size and
+storage layout, writes it with PyNWB or reads back a file written by
+MatNWB, and reports the timing as a JSON record. Every operation is meant
+to run in a fresh process so that the reported peak RSS belongs to that
+operation only. The MATLAB side is driven by tests.benchmark.runPyNWBIOBenchmark.
+
+Data is generated in bounded blocks and never held in memory as a whole, for
+every layout. Chunked datasets are written through SyntheticDataIterator.
+Contiguous datasets can not be written through an iterator (iterative writes
+need a chunked dataset), so they are allocated empty with the file and then
+filled in slabs of rows (see fill_contiguous_data), which is timed as part
+of the write.
+
+With --cache, written files are kept in the fixture cache (see FixtureCache.py)
+and reused by later runs. The record of a reused file is the record of the
+run which built it, marked with "cached": true, and its "filename" points to
+the file in the cache.
+
+Usage:
+    python PyNWBIOBenchmark.py write <case> <size_mb> <layout> <filename> [--cache] [--output result.json]
+    python PyNWBIOBenchmark.py read <case> <filename> [--output result.json]
+
+Cases:   electrical_series, two_photon_series, units
+Layouts: contiguous, chunked, gzip
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+from datetime import datetime
+
+import h5py
+import hdmf
+import numpy as np
+import pynwb
+from dateutil.tz import tzoffset
+from hdmf.backends.hdf5 import H5DataIO
+from hdmf.common import VectorData, VectorIndex
+from hdmf.data_utils import GenericDataChunkIterator
+from pynwb import NWBHDF5IO, NWBFile
+from pynwb.ecephys import ElectricalSeries
+from pynwb.misc import Units
+from pynwb.ophys import OpticalChannel, TwoPhotonSeries
+
+from FixtureCache import FixtureCache, make_key
+
+try:
+    import resource
+except ImportError:  # Not available on Windows
+    resource = None
+
+LAYOUTS = ('contiguous', 'chunked', 'gzip')
+GZIP_LEVEL = 3  # Same as the level used by MatNWB's default dataset configuration
+
+NUM_CHANNELS = 384
+FRAME_SHAPE = (512, 512)
+SPIKES_PER_UNIT = 10000
+
+# Chunk shapes in HDF5 (row-major) order. tests.benchmark.runPyNWBIOBenchmark
+# uses the same chunk shapes, in MATLAB order, when writing with MatNWB.
+CHUNK_SHAPES = {
+    'electrical_series': (8192, 64),
+    'two_photon_series': (1,) + FRAME_SHAPE,
+    'units': (131072,),
+}
+
+
+class SyntheticDataIterator(GenericDataChunkIterator):
+    """Generate deterministic data on demand so multi-GB chunked datasets
+    never have to be held in memory while writing."""
+
+    def __init__(self, shape, dtype, **kwargs):
+        self._shape = tuple(shape)
+        self._dtype = np.dtype(dtype)
+        super().__init__(**kwargs)
+
+    def _get_data(self, selection):
+        return synthetic_data(self._shape, self._dtype, selection)
+
+    def _get_maxshape(self):
+        return self._shape
+
+    def _get_dtype(self):
+        return self._dtype
+
+
+def synthetic_data(shape, dtype, selection=None):
+    """Values are a cheap function of the position along the first axis."""
+    if selection is None:
+        selection = tuple(slice(0, n) for n in shape)
+    first = selection[0]
+    block_shape = tuple(s.stop - s.start for s in selection)
+    ramp = np.arange(first.start, first.stop, dtype=np.float64)
+    ramp = ramp.reshape((-1,) + (1,) * (len(shape) - 1))
+    return np.broadcast_to(ramp % 1000, block_shape).astype(dtype)
+
+
+def wrap_data(case, shape, dtype, layout):
+    if layout == 'contiguous':
+        # Allocated without data, filled by fill_contiguous_data
+        return H5DataIO(shape=shape, dtype=dtype)
+    chunk_shape = tuple(min(c, n) for c, n in zip(CHUNK_SHAPES[case], shape))
+    iterator = SyntheticDataIterator(shape, dtype, chunk_shape=chunk_shape,
+                                     buffer_gb=0.25, display_progress=False)
+    if layout == 'gzip':
+        return H5DataIO(iterator, compression='gzip', compression_opts=GZIP_LEVEL)
+    return iterator
+
+
+def fill_contiguous_data(dataset, block_bytes=64e6):
+    """Write the synthetic data of a dataset in slabs of rows."""
+    row_bytes = max(1, dataset.dtype.itemsize * int(np.prod(dataset.shape[1:])))
+    rows_per_block = max(1, int(block_bytes // row_bytes))
+    for start in range(0, dataset.shape[0], rows_per_block):
+        stop = min(start + rows_per_block, dataset.shape[0])
+        selection = (slice(start, stop),) + tuple(slice(0, n) for n in dataset.shape[1:])
+        dataset[start:stop] = synthetic_data(dataset.shape, dataset.dtype, selection)
+
+
+def create_file():
+    tz = tzoffset(None, -8 * 60 * 60)
+    start_time = datetime(2018, 12, 2, 12, 57, 27, 371444, tzinfo=tz)
+    return NWBFile('a benchmark NWB File', 'BENCH123', start_time)
+
+
+def add_electrical_series(nwbfile, size_mb, layout):
+    num_samples = max(1, int(size_mb * 1e6 / (NUM_CHANNELS * 2)))
+    device = nwbfile.create_device('probe', 'benchmark probe')
+    group = nwbfile.create_electrode_group('shank0', 'benchmark shank', 'CA1', device)
+    for _ in range(NUM_CHANNELS):
+        nwbfile.add_electrode(location='CA1', group=group)
+    region = nwbfile.create_electrode_table_region(list(range(NUM_CHANNELS)), 'all electrodes')
+    data = wrap_data('electrical_series', (num_samples, NUM_CHANNELS), np.int16, layout)
+    es = ElectricalSeries(name='ElectricalSeries', data=data, electrodes=region,
+                          starting_time=0.0, rate=30000.0)
+    nwbfile.add_acquisition(es)
+    return num_samples
+
+
+def add_two_photon_series(nwbfile, size_mb, layout):
+    frame_bytes = FRAME_SHAPE[0] * FRAME_SHAPE[1] * 2
+    num_frames = max(1, int(size_mb * 1e6 / frame_bytes))
+    device = nwbfile.create_device('microscope', 'benchmark microscope')
+    oc = OpticalChannel('optchan1', 'a fake OpticalChannel', 3.14)
+    ip = nwbfile.create_imaging_plane('imgpln1', oc, description='a fake ImagingPlane',
+                                      device=device, excitation_lambda=6.28, indicator='GFP',
+                                      location='somewhere in the brain', imaging_rate=30.0)
+    data = wrap_data('two_photon_series', (num_frames,) + FRAME_SHAPE, np.uint16, layout)
+    tps = TwoPhotonSeries(name='TwoPhotonSeries', imaging_plane=ip, data=data, unit='n.a.',
+                          starting_time=0.0, rate=30.0)
+    nwbfile.add_acquisition(tps)
+    return num_frames
+
+
+def add_units(nwbfile, size_mb, layout):
+    num_units = max(1, int(size_mb * 1e6 / (SPIKES_PER_UNIT * 8)))
+    num_spikes = num_units * SPIKES_PER_UNIT
+    spike_times = wrap_data('units', (num_spikes,), np.float64, layout)
+    index = np.arange(1, num_units + 1, dtype=np.uint64) * SPIKES_PER_UNIT
+    spike_times_column = VectorData(name='spike_times', data=spike_times,
+                                    description='the spike times for each unit in seconds')
+    spike_times_index = VectorIndex(name='spike_times_index', data=index,
+                                    target=spike_times_column)
+    nwbfile.units = Units(name='units', id=list(range(num_units)),
+                          columns=[spike_times_column, spike_times_index])
+    return num_units
+
+
+CASES = {
+    'electrical_series': (add_electrical_series, lambda f: f.acquisition['ElectricalSeries'].data),
+    'two_photon_series': (add_two_photon_series, lambda f: f.acquisition['TwoPhotonSeries'].data),
+    'units': (add_units, lambda f: f.units.spike_times.data),
+}
+
+
+def read_dataset(dataset):
+    """Read a dataset in bounded blocks and return the number of bytes read."""
+    num_bytes = 0
+    if dataset.chunks is not None:
+        for selection in dataset.iter_chunks():
+            num_bytes += dataset[selection].nbytes
+    else:
+        rows_per_block = max(1, int(64e6 // max(1, dataset.dtype.itemsize * np.prod(dataset.shape[1:]))))
+        for start in range(0, dataset.shape[0], rows_per_block):
+            num_bytes += dataset[start:start + rows_per_block].nbytes
+    return num_bytes
+
+
+def write(case, size_mb, layout, filename):
+    add_container, _ = CASES[case]
+    start = time.perf_counter()
+    nwbfile = create_file()
+    num_objects = add_container(nwbfile, size_mb, layout)
+    with NWBHDF5IO(filename, mode='w') as io:
+        io.write(nwbfile)
+    if layout == 'contiguous':
+        with h5py.File(filename, 'r+') as f:
+            fill_contiguous_data(get_dataset_from_h5(case, f))
+    seconds = time.perf_counter() - start
+    with h5py.File(filename, 'r') as f:
+        dataset = get_dataset_from_h5(case, f)
+        num_bytes = dataset.size * dataset.dtype.itemsize
+    return make_record(case, 'write', layout, size_mb, filename, seconds, num_bytes, num_objects)
+
+
+def write_cached(case, size_mb, layout, filename):
+    """Like write, but build the file only once per cache key."""
+    # --cache enables the cache regardless of MATNWB_FIXTURE_CACHE
+    cache = FixtureCache.from_environment(enabled=True)
+    key = make_key('benchmark', case, size_mb, layout, CASES[case][0], wrap_data, synthetic_data,
+                   SyntheticDataIterator, fill_contiguous_data, create_file)
+    if cache.get(key) is not None and cache.get_metadata(key) is not None:
+        return dict(cache.get_metadata(key), cached=True, filename=cache.path(key))
+
+    def build(path):
+        build.record = write(case, size_mb, layout, path)
+
+    path = cache.get_or_create(key, build)
+    if not hasattr(build, 'record'):  # Built concurrently by another process
+        return dict(cache.get_metadata(key) or {}, cached=True, filename=path)
+    record = dict(build.record, filename=path, file_bytes=os.path.getsize(path))
+    cache.set_metadata(key, record)
+    return dict(record, cached=False)
+
+
+def read(case, filename):
+    _, get_dataset = CASES[case]
+    start = time.perf_counter()
+    with NWBHDF5IO(filename, mode='r') as io:
+        nwbfile = io.read()
+        num_bytes = read_dataset(get_dataset(nwbfile))
+        num_objects = len(nwbfile.units) if case == 'units' else len(get_dataset(nwbfile))
+    seconds = time.perf_counter() - start
+    return make_record(case, 'read', None, num_bytes / 1e6, filename, seconds, num_bytes, num_objects)
+
+
+def get_dataset_from_h5(case, f):
+    paths = {
+        'electrical_series': '/acquisition/ElectricalSeries/data',
+        'two_photon_series': '/acquisition/TwoPhotonSeries/data',
+        'units': '/units/spike_times',
+    }
+    return f[paths[case]]
+
+
+def peak_rss_mb():
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is reported in bytes on macOS and in kilobytes on Linux
+    return peak / 1e6 if sys.platform == 'darwin' else peak / 1e3
+
+
+def make_record(case, operation, layout, size_mb, filename, seconds, num_bytes, num_objects):
+    return {
+        'case': case,
+        'operation': operation,
+        'library': 'pynwb',
+        'layout': layout,
+        'size_mb': size_mb,
+        'filename': os.path.abspath(filename),
+        'file_bytes': os.path.getsize(filename),
+        'bytes': int(num_bytes),
+        'seconds': seconds,
+        'mb_per_s': num_bytes / 1e6 / seconds if seconds > 0 else None,
+        'objects': int(num_objects),
+        'objects_per_s': num_objects / seconds if seconds > 0 else None,
+        'peak_rss_mb': peak_rss_mb(),
+        'versions': {
+            'python': platform.python_version(),
+            'pynwb': pynwb.__version__,
+            'hdmf': hdmf.__version__,
+            'h5py': h5py.__version__,
+            'hdf5': h5py.version.hdf5_version,
+            'numpy': np.__version__,
+        },
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='MatNWB/PyNWB round-trip throughput benchmark.')
+    subparsers = parser.add_subparsers(dest='operation', required=True)
+
+    write_parser = subparsers.add_parser('write', help='Write a benchmark file with PyNWB.')
+    write_parser.add_argument('case', choices=sorted(CASES))
+    write_parser.add_argument('size_mb', type=float)
+    write_parser.add_argument('layout', choices=LAYOUTS)
+    write_parser.add_argument('filename')
+    write_parser.add_argument('--cache', action='store_true',
+                              help='Reuse the file from the fixture cache if it was built before.')
+
+    read_parser = subparsers.add_parser('read', help='Read a benchmark file with PyNWB.')
+    read_parser.add_argument('case', choices=sorted(CASES))
+    read_parser.add_argument('filename')
+
+    for p in (write_parser, read_parser):
+        p.add_argument('--output', default=None,
+                       help='Write the JSON result to this file instead of standard output.')
+
+    args = parser.parse_args(argv)
+    if args.operation == 'write' and args.cache:
+        record = write_cached(args.case, args.size_mb, args.layout, args.filename)
+    elif args.operation == 'write':
+        record = write(args.case, args.size_mb, args.layout, args.filename)
+    else:
+        record = read(args.case, args.filename)
+
+    text = json.dumps(record, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(text)
+    else:
+        print(text)
+
+
+if __name__ == '__main__':
+    main()
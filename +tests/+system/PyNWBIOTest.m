@@ -1,4 +1,6 @@
-classdef (SharedTestFixtures = {tests.fixtures.SetEnvironmentVariableFixture}) ...
+classdef (SharedTestFixtures = { ...
+        tests.fixtures.SetEnvironmentVariableFixture, ...
+        tests.fixtures.PyNWBTestWorkerFixture}) ...
         PyNWBIOTest < tests.system.RoundTripTest
     % Assumes PyNWB and unittest2 has been installed on the system.
     %
@@ -7,9 +9,15 @@ classdef (SharedTestFixtures = {tests.fixtures.SetEnvironmentVariableFixture}) .
     %
     % To install unittest2, execute:
     % $ pip install unittest2
+    %
+    % The Python side of each test runs in a single long-lived Python
+    % process which is shared by all test classes (see
+    % tests.fixtures.PyNWBTestWorkerFixture). Files are handed over between
+    % MatNWB and PyNWB in the test's own working folder, so test classes can
+    % run concurrently (see nwbtest's UseParallel option).
     methods(Test, TestTags={'UsesPython'})
         function testOutToPyNWB(testCase)
-            filename = ['MatNWB.' testCase.className() '.testOutToPyNWB.nwb'];
+            filename = testCase.interopFilename('MatNWB');
             nwbExport(testCase.file, filename);
             [status, cmdout] = testCase.runPyTest('testInFromMatNWB');
             if status
@@ -22,7 +30,7 @@ classdef (SharedTestFixtures = {tests.fixtures.SetEnvironmentVariableFixture}) .
             if status
                 testCase.assertFail(cmdout);
             end
-            filename = ['PyNWB.' testCase.className() '.testOutToMatNWB.nwb'];
+            filename = testCase.interopFilename('PyNWB');
             pyfile = nwbRead(filename, 'savedir', '.');
             pycontainer = testCase.getContainer(pyfile);
             matcontainer = testCase.getContainer(testCase.file);
@@ -38,13 +46,26 @@ classdef (SharedTestFixtures = {tests.fixtures.SetEnvironmentVariableFixture}) .
     
     methods
         function [status, cmdout] = runPyTest(testCase, testName)
-            tests.util.addFolderToPythonPath( fileparts(mfilename('fullpath')) )
-            
-            pythonExecutable = getenv("PYTHON_EXECUTABLE");
-            cmd = sprintf('"%s" -B -m unittest %s.%s.%s',...
-                pythonExecutable,...
-                'PyNWBIOTest', testCase.className(), testName);
-            [status, cmdout] = system(cmd);
+            workerFixture = testCase.getSharedTestFixtures( ...
+                'tests.fixtures.PyNWBTestWorkerFixture');
+            testId = sprintf('%s.%s', testCase.className(), testName);
+            [status, cmdout] = workerFixture.Worker.runTest(testId, pwd);
+        end
+
+        function filename = interopFilename(testCase, writer)
+        % interopFilename - Name of the file handed over between MatNWB and
+        % PyNWB. Must match interop_filename in PyNWBIOTest.py.
+            arguments
+                testCase
+                writer (1,1) string {mustBeMember(writer, ["MatNWB", "PyNWB"])}
+            end
+            if writer == "MatNWB"
+                testName = 'testOutToPyNWB';
+            else
+                testName = 'testOutToMatNWB';
+            end
+            filename = fullfile(pwd, sprintf('%s.%s.%s.nwb', ...
+                writer, testCase.className(), testName));
         end
     end
 end
@@ -1,6 +1,14 @@
 import unittest
 from datetime import datetime, timedelta
+import argparse
+import contextlib
+import io
+import itertools
+import json
+import multiprocessing
 import os.path
+import sys
+import tempfile
 import numpy as np
 from dateutil.tz import tzlocal, tzoffset
 import numpy.testing as npt
@@ -14,7 +22,131 @@ from pynwb.misc import Units
 from hdmf.backends.hdf5 import HDF5IO
 from hdmf.container import Container, Data
 
+from FixtureCache import FixtureCache, make_key
+
+# Upper bound for the number of bytes held in memory per array when
+# comparing datasets block by block
+COMPARISON_BLOCK_BYTES = 64 * 1024 ** 2
+
+
+def iter_aligned_blocks(shape, chunks=None, itemsize=8, max_block_bytes=COMPARISON_BLOCK_BYTES):
+    """
+    Yield tuples of slices which tile an array of the given shape.
+
+    Blocks are aligned to the HDF5 chunk shape (or to single rows along the
+    first axis for contiguous data) and grown along the first axis by whole
+    chunks as long as a block stays below max_block_bytes.
+    """
+    shape = tuple(shape)
+    if not shape:
+        yield ()
+        return
+    block = list(chunks) if chunks else [1] + list(shape[1:])
+    slab_bytes = itemsize * block[0] * int(np.prod(block[1:], dtype=np.int64))
+    block[0] = min(shape[0], block[0] * max(1, max_block_bytes // max(1, slab_bytes)))
+    for starts in itertools.product(*(range(0, n, b) for n, b in zip(shape, block))):
+        yield tuple(slice(start, min(start + b, n)) for start, b, n in zip(starts, block, shape))
+
+
+def _has_identical_storage(dataset1, dataset2):
+    """True if the raw chunks of two datasets can be compared byte for byte."""
+    if not (isinstance(dataset1, h5py.Dataset) and isinstance(dataset2, h5py.Dataset)):
+        return False
+    if dataset1.chunks is None or dataset1.chunks != dataset2.chunks:
+        return False
+    properties = ('shape', 'dtype', 'compression', 'compression_opts', 'shuffle', 'fletcher32', 'scaleoffset')
+    return all(getattr(dataset1, p) == getattr(dataset2, p) for p in properties)
+
+
+def _read_raw_chunk(dataset, offset):
+    try:
+        return dataset.id.read_direct_chunk(offset)
+    except (KeyError, OSError, ValueError):  # Chunk is not allocated
+        return None
+
+
+def _first_mismatch_in_block(block1, block2, atol):
+    """Return the index of the first differing element in two blocks, or None."""
+    block1 = np.asarray(block1)
+    block2 = np.asarray(block2)
+    if block1.dtype.kind in 'fc' or block2.dtype.kind in 'fc':
+        with np.errstate(invalid='ignore', over='ignore'):
+            different = ~(np.abs(block1 - block2) < atol)
+            different &= ~(block1 == block2)  # Matching infinities
+            different &= ~(np.isnan(block1) & np.isnan(block2))
+    else:
+        different = block1 != block2
+    different = np.broadcast_to(different, np.broadcast_shapes(block1.shape, block2.shape))
+    flat_index = np.flatnonzero(different)
+    if flat_index.size == 0:
+        return None
+    return np.unravel_index(flat_index[0], different.shape)
+
+
+def find_first_mismatch(array1, array2, atol=1.5e-7):
+    """
+    Compare two array-likes (h5py datasets, NumPy arrays or lists) block by
+    block with a vectorized absolute tolerance.
+
+    Datasets are never read into memory in full. When both arguments are
+    datasets with the same chunk layout and filters, chunks whose stored
+    bytes are identical are skipped without being decompressed.
+
+    Returns None if the arrays are equal within the tolerance, otherwise a
+    tuple of (index, value1, value2) for the first differing element.
+    """
+    if not isinstance(array1, h5py.Dataset):
+        array1 = np.asarray(array1)
+    if not isinstance(array2, h5py.Dataset):
+        array2 = np.asarray(array2)
+    if array1.shape != array2.shape and array2.shape != () and array1.shape != ():
+        raise AssertionError(f'Array shapes differ: {array1.shape} != {array2.shape}')
+
+    # Blocks follow the layout of the non-scalar argument, preferably a dataset
+    reference = max((array1, array2), key=lambda a: (len(a.shape), isinstance(a, h5py.Dataset)))
+    compare_raw_chunks = _has_identical_storage(array1, array2)
+    if compare_raw_chunks:
+        blocks = reference.iter_chunks()
+    else:
+        blocks = iter_aligned_blocks(reference.shape, getattr(reference, 'chunks', None),
+                                     reference.dtype.itemsize)
+
+    for selection in blocks:
+        if compare_raw_chunks:
+            offset = tuple(s.start for s in selection)
+            raw_chunk = _read_raw_chunk(array1, offset)
+            if raw_chunk is not None and raw_chunk == _read_raw_chunk(array2, offset):
+                continue
+        block1 = array1[selection] if array1.shape != () else array1[()]
+        block2 = array2[selection] if array2.shape != () else array2[()]
+        index = _first_mismatch_in_block(block1, block2, atol)
+        if index is not None:
+            block_shape = np.broadcast_shapes(np.shape(block1), np.shape(block2))
+            global_index = tuple(int(s.start + i) for s, i in zip(selection, index))
+            return (global_index,
+                    np.broadcast_to(block1, block_shape)[index],
+                    np.broadcast_to(block2, block_shape)[index])
+    return None
+
+
+def interop_filename(class_name, writer, scratch_dir=None):
+    '''
+    Name of the file handed over between MatNWB and PyNWB for a test class.
+
+    writer is either 'MatNWB' or 'PyNWB'. PyNWBIOTest.m uses the same names,
+    so both sides only need to agree on the scratch folder of a test.
+    '''
+    test_name = {'MatNWB': 'testOutToPyNWB', 'PyNWB': 'testOutToMatNWB'}[writer]
+    filename = f'{writer}.{class_name}.{test_name}.nwb'
+    return os.path.join(scratch_dir, filename) if scratch_dir else filename
+
+
 class PyNWBIOTest(unittest.TestCase):
+    # Folder for the files exchanged with MatNWB. Defaults to the current
+    # folder and is set per test by run_test so that tests running
+    # concurrently in different folders never share a file.
+    scratch_dir = None
+
     def setUp(self):
         #tzoffset requires offset in seconds
         tz = tzoffset(None, -8 * 60 * 60)
@@ -32,7 +164,7 @@ class PyNWBIOTest(unittest.TestCase):
         return self.__container
 
     def testInFromMatNWB(self):
-        filename = 'MatNWB.' + self.__class__.__name__ + '.testOutToPyNWB.nwb'
+        filename = interop_filename(self.__class__.__name__, 'MatNWB', self.scratch_dir)
         with HDF5IO(filename, manager=get_manager(), mode='r+') as io:
             matfile = io.read()
             matcontainer = self.getContainer(matfile)
@@ -41,10 +173,21 @@ class PyNWBIOTest(unittest.TestCase):
             self.assertContainerEqual(matcontainer, pycontainer, ignoreFields=["was_generated_by"])
 
     def testOutToMatNWB(self):
-        filename = 'PyNWB.' + self.__class__.__name__ + '.testOutToMatNWB.nwb'
+        filename = interop_filename(self.__class__.__name__, 'PyNWB', self.scratch_dir)
+        cache = FixtureCache.from_environment()
+        if cache is None:
+            self.writeFile(filename)
+        else:
+            # The written file only depends on the code that builds it and on
+            # the library and schema versions, so it can be reused across runs
+            key = make_key(self.__class__.__name__, self.__class__.addContainer,
+                           PyNWBIOTest.setUp, PyNWBIOTest.writeFile)
+            cache.fetch(key, self.writeFile, filename)
+        self.assertTrue(os.path.isfile(filename))
+
+    def writeFile(self, filename):
         with HDF5IO(filename, manager=get_manager(), mode='w') as io:
             io.write(self.file)
-        self.assertTrue(os.path.isfile(filename))
 
     def addContainer(self, file):
         raise unittest.SkipTest('Cannot run test unless addContainer is implemented')
@@ -84,8 +227,8 @@ class PyNWBIOTest(unittest.TestCase):
                         if len(field1) == 0:
                             continue
                         if isinstance(field1[0], float):
-                                for v1, v2 in zip(field1, field2):
-                                    self.assertAlmostEqual(v1, v2, places=6)
+                            # Same tolerance as assertAlmostEqual with places=6
+                            self.assertArrayAlmostEqual(field1, field2, atol=5e-7)
                         else:
                             self.assertTrue(np.array_equal(field1, field2))
                 elif isinstance(field1, dict) and len(field1) and isinstance(next(iter(field1.values())), Container):
@@ -101,7 +244,9 @@ class PyNWBIOTest(unittest.TestCase):
                     self.assertDataEqual(field1, field2)
                 elif isinstance(field1, Data) or isinstance(field2, Data):
                     self.assertTrue(np.array_equal(field1.data, field2))
-                elif isinstance(field1, (float, np.float32, np.float16, h5py.Dataset)):
+                elif isinstance(field1, h5py.Dataset) or isinstance(field2, h5py.Dataset):
+                    self.assertArrayAlmostEqual(field1, field2)
+                elif isinstance(field1, (float, np.float32, np.float16)):
                     npt.assert_almost_equal(field1, field2)
                 elif isinstance(field1, datetime):
                     self.assertTrue(isinstance(field2, datetime))
@@ -111,6 +256,16 @@ class PyNWBIOTest(unittest.TestCase):
                 else:
                     self.assertEqual(field1, field2)
 
+    def assertArrayAlmostEqual(self, array1, array2, atol=1.5e-7):
+        '''
+        Streaming replacement for npt.assert_almost_equal which compares
+        h5py datasets chunk by chunk with bounded memory
+        '''
+        mismatch = find_first_mismatch(array1, array2, atol=atol)
+        if mismatch is not None:
+            index, value1, value2 = mismatch
+            self.fail(f'Arrays differ at index {index}: {value1!r} != {value2!r} (atol={atol})')
+
     def assertDataEqual(self, data1, data2):
         self.assertEqual(type(data1), type(data2))
         self.assertEqual(len(data1), len(data2))
@@ -221,3 +376,158 @@ class UnitTimesIOTest(PyNWBIOTest):
                                  spike_times=[11])
     def getContainer(self, file):
         return file.units
+
+
+def _iter_tests(suite):
+    for test in suite:
+        if isinstance(test, unittest.TestSuite):
+            yield from _iter_tests(test)
+        else:
+            yield test
+
+
+def run_test(test_name, scratch_dir=None):
+    """
+    Run a single test (e.g. 'TimeSeriesIOTest.testOutToMatNWB') and return a
+    dictionary describing the outcome.
+
+    Files are read from and written to scratch_dir if it is given, so that
+    one process can serve test methods which each run in their own folder.
+    """
+    suite = unittest.defaultTestLoader.loadTestsFromName(test_name, sys.modules[__name__])
+    for test in _iter_tests(suite):
+        test.scratch_dir = scratch_dir
+    stream = io.StringIO()
+    # Anything the tests print must not end up in the worker's reply channel
+    with contextlib.redirect_stdout(sys.stderr):
+        result = unittest.TextTestRunner(stream=stream, verbosity=2).run(suite)
+
+    return {
+        'test': test_name,
+        'status': 0 if result.wasSuccessful() else 1,
+        'testsRun': result.testsRun,
+        'failures': [traceback for _, traceback in result.failures],
+        'errors': [traceback for _, traceback in result.errors],
+        'skipped': [reason for _, reason in result.skipped],
+        'output': stream.getvalue(),
+    }
+
+
+def run_worker(instream=sys.stdin, outstream=sys.stdout):
+    """
+    Serve test requests from a long-lived process so that pynwb, hdmf and the
+    type map are only loaded once per test session.
+
+    Requests and replies are JSON objects, one per line. A request has the
+    form {"test": "<Class>.<method>", "scratch_dir": "<folder>"} and is answered with
+    the dictionary returned by run_test. The request {"command": "shutdown"}
+    (or closing the input stream) stops the worker.
+    """
+    get_manager()  # Build the type map up front instead of on the first request
+    outstream.write(json.dumps({'status': 0, 'ready': True}) + '\n')
+    outstream.flush()
+
+    for line in instream:
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            request = json.loads(line)
+            if request.get('command') == 'shutdown':
+                break
+            reply = run_test(request['test'], request.get('scratch_dir'))
+        except Exception as e:
+            reply = {'test': None, 'status': 1, 'output': f'{type(e).__name__}: {e}'}
+        outstream.write(json.dumps(reply) + '\n')
+        outstream.flush()
+
+
+def list_test_classes():
+    """
+    Names of all test classes derived from PyNWBIOTest, at any depth.
+    """
+    names = []
+    pending = list(PyNWBIOTest.__subclasses__())
+    while pending:
+        cls = pending.pop(0)
+        if cls.__name__ not in names:
+            names.append(cls.__name__)
+        pending.extend(cls.__subclasses__())
+    return names
+
+
+def _missing_matnwb_result(class_name, scratch_dir, require_matnwb):
+    test_name = f'{class_name}.testInFromMatNWB'
+    message = (f'{test_name}: no file written by MatNWB at '
+               f'{interop_filename(class_name, "MatNWB", scratch_dir)}')
+    print(('FAIL: ' if require_matnwb else 'SKIP: ') + message, file=sys.stderr)
+    return {
+        'test': test_name,
+        'status': 1 if require_matnwb else 0,
+        'testsRun': 0,
+        'failures': [message] if require_matnwb else [],
+        'errors': [],
+        'skipped': [] if require_matnwb else [message],
+        'output': '',
+    }
+
+
+def _run_shard(shard):
+    class_name, scratch_dir, require_matnwb = shard
+    os.makedirs(scratch_dir, exist_ok=True)
+    results = [run_test(f'{class_name}.testOutToMatNWB', scratch_dir)]
+    if os.path.isfile(interop_filename(class_name, 'MatNWB', scratch_dir)):
+        results.append(run_test(f'{class_name}.testInFromMatNWB', scratch_dir))
+    else:
+        results.append(_missing_matnwb_result(class_name, scratch_dir, require_matnwb))
+    return results
+
+
+def run_parallel(scratch_root, class_names=None, processes=None, require_matnwb=False):
+    """
+    Run the Python side of the interop tests with one shard per test class,
+    spread over a pool of processes.
+
+    Every test class gets its own scratch folder, scratch_root/<Class>, for
+    the files it exchanges with MatNWB. This runner does not start MATLAB:
+    run PyNWBIOTest.m with the same scratch folders first so that
+    testInFromMatNWB has a file to read. A class without a MatNWB file is
+    reported as skipped, or as failed if require_matnwb is true.
+    """
+    class_names = class_names or list_test_classes()
+    shards = [(name, os.path.join(scratch_root, name), require_matnwb) for name in class_names]
+    with multiprocessing.Pool(processes) as pool:
+        shard_results = pool.map(_run_shard, shards)
+    return [result for results in shard_results for result in results]
+
+
+def _main_parallel(argv):
+    parser = argparse.ArgumentParser(description='Run PyNWBIOTest classes in parallel.')
+    parser.add_argument('--parallel', type=int, nargs='?', const=None, default=None, metavar='N',
+                        help='Number of worker processes (default: number of cores).')
+    parser.add_argument('--scratch-dir', default=None,
+                        help='Root folder for the per-class scratch folders (default: a new temporary folder).')
+    parser.add_argument('--require-matnwb', action='store_true',
+                        help='Fail testInFromMatNWB for classes without a file written by MatNWB '
+                             '(default: report them as skipped).')
+    parser.add_argument('classes', nargs='*', help='Test classes to run (default: all).')
+    args = parser.parse_args(argv)
+
+    scratch_root = args.scratch_dir or tempfile.mkdtemp(prefix='pynwb_interop_')
+    results = run_parallel(scratch_root, args.classes, args.parallel, args.require_matnwb)
+    skipped = [result['test'] for result in results if result['testsRun'] == 0 and result['skipped']]
+    if skipped:
+        print(f'WARNING: {len(skipped)} test(s) skipped because MatNWB has not written their files; '
+              'run PyNWBIOTest.m on the same scratch folder first or pass --require-matnwb.',
+              file=sys.stderr)
+    print(json.dumps({'scratch_dir': scratch_root, 'results': results}, indent=2))
+    return int(any(result['status'] for result in results))
+
+
+if __name__ == '__main__':
+    if '--worker' in sys.argv[1:]:
+        run_worker()
+    elif '--parallel' in sys.argv[1:]:
+        sys.exit(_main_parallel(sys.argv[1:]))
+    else:
+        unittest.main()
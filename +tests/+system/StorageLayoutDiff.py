@@ -0,0 +1,207 @@
+"""
+Compare the physical storage layout of the datasets in two NWB (HDF5) files.
+
+Round-trip tests only verify that values match. This tool reports, per
+dataset, how the two files store the data: contiguous or chunked layout,
+chunk shape, filters and their levels, fill value, and storage size versus
+logical size. Datasets where one file is much less space- or read-efficient
+than the other are flagged.
+
+Usage:
+    python StorageLayoutDiff.py MatNWB.file.nwb PyNWB.file.nwb [--all] [--json report.json]
+"""
+import argparse
+import json
+import sys
+
+import h5py
+import numpy as np
+
+LAYOUT_NAMES = {
+    h5py.h5d.COMPACT: 'compact',
+    h5py.h5d.CONTIGUOUS: 'contiguous',
+    h5py.h5d.CHUNKED: 'chunked',
+}
+if hasattr(h5py.h5d, 'VIRTUAL'):
+    LAYOUT_NAMES[h5py.h5d.VIRTUAL] = 'virtual'
+
+# Datasets smaller than this are too small for layout differences to matter
+DEFAULT_MIN_BYTES = 64 * 1024
+# Flag a dataset when one file needs this many times more storage or chunks
+DEFAULT_RATIO = 1.5
+# Chunks smaller than this make reads overhead-bound
+SMALL_CHUNK_BYTES = 16 * 1024
+
+
+def _fill_value(dataset):
+    try:
+        value = dataset.fillvalue
+    except (OSError, TypeError, ValueError):
+        return None
+    if isinstance(value, np.generic):
+        value = value.item()
+    if isinstance(value, bytes):
+        value = value.decode('utf-8', 'replace')
+    try:
+        json.dumps(value)
+    except TypeError:  # e.g. compound fill values
+        value = repr(value)
+    return value
+
+
+def describe_dataset(dataset):
+    """Return a JSON-serializable description of a dataset's storage layout."""
+    plist = dataset.id.get_create_plist()
+    layout = LAYOUT_NAMES.get(plist.get_layout(), 'unknown')
+
+    filters = []
+    for i in range(plist.get_nfilters()):
+        code, _, values, name = plist.get_filter(i)
+        filters.append({
+            'id': int(code),
+            'name': name.decode('ascii', 'replace') if isinstance(name, bytes) else str(name),
+            'parameters': [int(v) for v in values],
+        })
+
+    itemsize = dataset.dtype.itemsize
+    logical_bytes = int(dataset.size * itemsize) if dataset.shape is not None else 0
+    storage_bytes = int(dataset.id.get_storage_size())
+    chunk_bytes = None
+    num_chunks = None
+    if dataset.chunks is not None:
+        chunk_bytes = int(np.prod(dataset.chunks, dtype=np.int64) * itemsize)
+        num_chunks = int(np.prod([-(-n // c) for n, c in zip(dataset.shape, dataset.chunks)], dtype=np.int64))
+
+    return {
+        'shape': list(dataset.shape) if dataset.shape is not None else None,
+        'maxshape': [m if m is not None else -1 for m in dataset.maxshape] if dataset.maxshape else None,
+        'dtype': str(dataset.dtype),
+        'layout': layout,
+        'chunks': list(dataset.chunks) if dataset.chunks is not None else None,
+        'chunk_bytes': chunk_bytes,
+        'num_chunks': num_chunks,
+        'filters': filters,
+        'fill_value': _fill_value(dataset),
+        'logical_bytes': logical_bytes,
+        'storage_bytes': storage_bytes,
+        'storage_ratio': storage_bytes / logical_bytes if logical_bytes else None,
+    }
+
+
+def describe_file(filename):
+    """Return a dictionary mapping each dataset path in a file to its layout."""
+    layouts = {}
+
+    def visit(name, obj):
+        if isinstance(obj, h5py.Dataset):
+            layouts['/' + name] = describe_dataset(obj)
+
+    with h5py.File(filename, 'r') as f:
+        f.visititems(visit)
+    return layouts
+
+
+def _filter_summary(layout):
+    return [(f['name'], f['parameters']) for f in layout['filters']]
+
+
+def compare_layouts(layout1, layout2, ratio=DEFAULT_RATIO, min_bytes=DEFAULT_MIN_BYTES):
+    """
+    Compare the layouts of one dataset in two files and return a list of
+    (flag, message) tuples describing the relevant differences.
+    """
+    flags = []
+    for key in ('layout', 'chunks', 'dtype', 'fill_value'):
+        if layout1[key] != layout2[key]:
+            flags.append((key, f'{key}: {layout1[key]} != {layout2[key]}'))
+    if _filter_summary(layout1) != _filter_summary(layout2):
+        flags.append(('filters', f'filters: {_filter_summary(layout1)} != {_filter_summary(layout2)}'))
+
+    if max(layout1['logical_bytes'], layout2['logical_bytes']) < min_bytes:
+        return flags
+
+    # Space efficiency: one file needs considerably more bytes on disk
+    size1, size2 = layout1['storage_bytes'], layout2['storage_bytes']
+    if min(size1, size2) > 0 and max(size1, size2) / min(size1, size2) >= ratio:
+        larger = 1 if size1 > size2 else 2
+        flags.append(('space', f'file {larger} uses {max(size1, size2) / min(size1, size2):.2f}x '
+                               f'the storage ({size1} vs {size2} bytes)'))
+
+    # Read efficiency: many more (small) chunks mean more I/O and decompression calls
+    chunks1, chunks2 = layout1['num_chunks'], layout2['num_chunks']
+    if chunks1 and chunks2 and max(chunks1, chunks2) / min(chunks1, chunks2) >= ratio:
+        more = 1 if chunks1 > chunks2 else 2
+        flags.append(('read', f'file {more} splits the data into {max(chunks1, chunks2) / min(chunks1, chunks2):.1f}x '
+                              f'as many chunks ({chunks1} vs {chunks2})'))
+    for index, layout in ((1, layout1), (2, layout2)):
+        if layout['chunk_bytes'] is not None and layout['chunk_bytes'] < SMALL_CHUNK_BYTES \
+                and layout['num_chunks'] > 1:
+            flags.append(('read', f'file {index} uses small chunks of {layout["chunk_bytes"]} bytes'))
+    return flags
+
+
+def diff_files(filename1, filename2, ratio=DEFAULT_RATIO, min_bytes=DEFAULT_MIN_BYTES):
+    """
+    Diff the storage layout of all datasets in two files.
+
+    Returns a list of records, one per dataset path, each with the layouts in
+    both files (None if the dataset is missing) and the list of flags.
+    """
+    layouts1 = describe_file(filename1)
+    layouts2 = describe_file(filename2)
+    records = []
+    for path in sorted(set(layouts1) | set(layouts2)):
+        layout1, layout2 = layouts1.get(path), layouts2.get(path)
+        if layout1 is None or layout2 is None:
+            missing = 1 if layout1 is None else 2
+            flags = [('missing', f'dataset only exists in file {3 - missing}')]
+        else:
+            flags = compare_layouts(layout1, layout2, ratio=ratio, min_bytes=min_bytes)
+        records.append({
+            'path': path,
+            'file1': layout1,
+            'file2': layout2,
+            'flags': [{'flag': flag, 'message': message} for flag, message in flags],
+        })
+    return records
+
+
+def format_report(records, show_all=False):
+    lines = []
+    for record in records:
+        is_efficiency_issue = any(f['flag'] in ('space', 'read') for f in record['flags'])
+        if not (show_all and record['flags']) and not is_efficiency_issue:
+            continue
+        lines.append(record['path'])
+        for flag in record['flags']:
+            lines.append(f'    [{flag["flag"]}] {flag["message"]}')
+    if not lines:
+        lines.append('No storage layout issues found.')
+    return '\n'.join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Diff the storage layout of datasets in two NWB files.')
+    parser.add_argument('file1')
+    parser.add_argument('file2')
+    parser.add_argument('--ratio', type=float, default=DEFAULT_RATIO,
+                        help='Storage or chunk count ratio above which a dataset is flagged.')
+    parser.add_argument('--min-bytes', type=int, default=DEFAULT_MIN_BYTES,
+                        help='Ignore efficiency differences for datasets smaller than this.')
+    parser.add_argument('--all', action='store_true',
+                        help='Also list datasets that only differ in layout settings.')
+    parser.add_argument('--json', default=None, help='Write the full report as JSON to this file.')
+    args = parser.parse_args(argv)
+
+    records = diff_files(args.file1, args.file2, ratio=args.ratio, min_bytes=args.min_bytes)
+    print(format_report(records, show_all=args.all))
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump({'file1': args.file1, 'file2': args.file2, 'datasets': records}, f, indent=2)
+
+    has_issues = any(f['flag'] in ('space', 'read') for r in records for f in r['flags'])
+    return 1 if has_issues else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,43 @@
+classdef WriteNamespaceTest < matlab.unittest.TestCase
+% WriteNamespaceTest - Unit tests for incremental generation of classes.
+
+    properties
+        SaveDir (1,1) string
+    end
+
+    methods (TestMethodSetup)
+        function setupSaveDir(testCase)
+            % Generate into a temporary folder which is not on the path
+            F = testCase.applyFixture(matlab.unittest.fixtures.TemporaryFolderFixture);
+            testCase.SaveDir = F.Folder;
+        end
+    end
+
+    methods (Test)
+        function unchangedClassesAreNotWritten(testCase)
+            generationInfo = generateCore('savedir', testCase.SaveDir);
+            testCase.verifyEqual({generationInfo.Namespace}, {'hdmf-common', 'core'})
+            testCase.verifyGreaterThan([generationInfo.NumGenerated], 0)
+            testCase.verifyEqual([generationInfo.NumUnchanged], [0, 0])
+
+            generationInfo = generateCore('savedir', testCase.SaveDir);
+            testCase.verifyEqual([generationInfo.NumGenerated], [0, 0])
+            testCase.verifyGreaterThan([generationInfo.NumUnchanged], 0)
+        end
+
+        function modifiedClassIsWritten(testCase)
+            generateCore('savedir', testCase.SaveDir);
+
+            classFile = fullfile(testCase.SaveDir, '+types', '+core', 'TimeSeries.m');
+            expectedContent = fileread(classFile);
+            fid = fopen(classFile, 'w');
+            fwrite(fid, 'modified', 'char');
+            fclose(fid);
+
+            generationInfo = generateCore('savedir', testCase.SaveDir);
+            coreInfo = generationInfo(strcmp({generationInfo.Namespace}, 'core'));
+            testCase.verifyEqual(coreInfo.NumGenerated, 1)
+            testCase.verifyEqual(fileread(classFile), expectedContent)
+        end
+    end
+end
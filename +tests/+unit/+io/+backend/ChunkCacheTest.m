@@ -0,0 +1,86 @@
+classdef ChunkCacheTest < matlab.unittest.TestCase
+
+    properties
+        Cache
+    end
+
+    methods (TestMethodSetup)
+        function setup(testCase)
+            testCase.applyFixture(matlab.unittest.fixtures.WorkingFolderFixture);
+
+            testCase.Cache = io.backend.ChunkCache.instance();
+            testCase.Cache.clear();
+            testCase.Cache.resetStatistics();
+            testCase.addTeardown(@restoreMaxMemory, testCase.Cache, testCase.Cache.MaxMemory);
+            testCase.addTeardown(@() testCase.Cache.clear());
+            testCase.Cache.MaxMemory = 2^20;
+        end
+    end
+
+    methods (Test)
+        function overlappingReadsAreServedFromCache(testCase)
+            data = reshape(1:1600, [40, 40]);
+            filename = createChunkedFile("chunk-cache-test.h5", data, [10, 10]);
+            lazyArray = io.backend.hdf5.HDF5LazyArray(filename, "/data");
+
+            testCase.verifyEqual(lazyArray.load_mat_style(':', 1:15), data(:, 1:15));
+            testCase.verifyEqual(testCase.Cache.NumMisses, 8);
+            testCase.verifyEqual(testCase.Cache.NumHits, 0);
+
+            testCase.verifyEqual(lazyArray.load_mat_style(5:20, 8:12), data(5:20, 8:12));
+            testCase.verifyEqual(testCase.Cache.NumMisses, 8);
+            testCase.verifyEqual(testCase.Cache.NumHits, 4);
+
+            selection = [12 3 3 40];
+            testCase.verifyEqual(lazyArray.load_mat_style(selection, 2), data(selection, 2));
+        end
+
+        function disabledCacheIsNotUsed(testCase)
+            testCase.Cache.MaxMemory = 0;
+            data = reshape(1:1600, [40, 40]);
+            filename = createChunkedFile("chunk-cache-test.h5", data, [10, 10]);
+            lazyArray = io.backend.hdf5.HDF5LazyArray(filename, "/data");
+
+            testCase.verifyEqual(lazyArray.load_mat_style(':', 1:15), data(:, 1:15));
+            testCase.verifyEqual(testCase.Cache.NumChunks, 0);
+            testCase.verifyEqual(testCase.Cache.NumMisses, 0);
+        end
+
+        function leastRecentlyUsedChunksAreEvicted(testCase)
+            chunk = zeros(10, 10);
+            chunkBytes = 8 * numel(chunk);
+            testCase.Cache.MaxMemory = 2.5 * chunkBytes;
+
+            testCase.Cache.put("a", chunk);
+            testCase.Cache.put("b", chunk);
+            testCase.Cache.get("a");
+            testCase.Cache.put("c", chunk);
+
+            [~, isCached] = testCase.Cache.get("b");
+            testCase.verifyFalse(isCached);
+            [~, isCached] = testCase.Cache.get("a");
+            testCase.verifyTrue(isCached);
+            testCase.verifyLessThanOrEqual(testCase.Cache.MemoryUsed, testCase.Cache.MaxMemory);
+        end
+
+        function invalidatingFileRemovesItsChunks(testCase)
+            data = reshape(1:1600, [40, 40]);
+            filename = createChunkedFile("chunk-cache-test.h5", data, [10, 10]);
+            lazyArray = io.backend.hdf5.HDF5LazyArray(filename, "/data");
+            lazyArray.load_mat_style(1:10, 1:10);
+            testCase.verifyEqual(testCase.Cache.NumChunks, 1);
+
+            io.backend.hdf5.HDF5HandlePool.instance().invalidate(filename);
+            testCase.verifyEqual(testCase.Cache.NumChunks, 0);
+        end
+    end
+end
+
+function filename = createChunkedFile(filename, data, chunkSize)
+    h5create(filename, "/data", size(data), 'ChunkSize', chunkSize, 'Deflate', 3);
+    h5write(filename, "/data", data);
+end
+
+function restoreMaxMemory(cache, maxMemory)
+    cache.MaxMemory = maxMemory;
+end
@@ -0,0 +1,167 @@
+classdef HDF5HandlePoolTest < matlab.unittest.TestCase
+
+    properties
+        Pool
+    end
+
+    methods (TestMethodSetup)
+        function setup(testCase)
+            testCase.applyFixture(matlab.unittest.fixtures.WorkingFolderFixture);
+
+            testCase.Pool = io.backend.hdf5.HDF5HandlePool.instance();
+            testCase.Pool.clear();
+            testCase.Pool.resetStatistics();
+
+            testCase.addTeardown(@restoreLimits, testCase.Pool, ...
+                testCase.Pool.MaxOpenFiles, testCase.Pool.MaxOpenDatasets, ...
+                testCase.Pool.KeepFilesOpen);
+            testCase.Pool.KeepFilesOpen = true;
+            testCase.addTeardown(@() testCase.Pool.clear());
+        end
+    end
+
+    methods (Test)
+        function repeatedReadsReuseIdentifiers(testCase)
+            data = reshape(1:24, [4, 3, 2]);
+            filename = createTestFile("pool-test.h5", ["/a", "/b"], data);
+
+            lazyArrayA = io.backend.hdf5.HDF5LazyArray(filename, "/a");
+            lazyArrayB = io.backend.hdf5.HDF5LazyArray(filename, "/b");
+
+            for i = 1:4
+                testCase.verifyEqual(lazyArrayA.load_mat_style(i, ':', ':'), data(i, :, :));
+                testCase.verifyEqual(lazyArrayB.load_mat_style(':', 1, mod(i, 2) + 1), data(:, 1, mod(i, 2) + 1));
+            end
+
+            testCase.verifyEqual(testCase.Pool.NumFileOpens, 1);
+            testCase.verifyEqual(testCase.Pool.NumDatasetOpens, 2);
+            testCase.verifyGreaterThan(testCase.Pool.NumDatasetReuses, 0);
+        end
+
+        function fileIsClosedWhenLastLazyArrayIsDeleted(testCase)
+            data = magic(4);
+            filename = createTestFile("pool-test.h5", ["/a", "/b"], data);
+
+            lazyArrayA = io.backend.hdf5.HDF5LazyArray(filename, "/a");
+            lazyArrayB = io.backend.hdf5.HDF5LazyArray(filename, "/b");
+            lazyArrayA.load_mat_style(1, ':');
+            lazyArrayB.load_mat_style(1, ':');
+            testCase.verifyEqual(testCase.Pool.NumOpenFiles, 1);
+
+            delete(lazyArrayA)
+            testCase.verifyEqual(testCase.Pool.NumOpenFiles, 1);
+
+            delete(lazyArrayB)
+            testCase.verifyEqual(testCase.Pool.NumOpenFiles, 0);
+            testCase.verifyEqual(testCase.Pool.NumOpenDatasets, 0);
+        end
+
+        function leastRecentlyUsedIdentifiersAreEvicted(testCase)
+            testCase.Pool.MaxOpenFiles = 1;
+            testCase.Pool.MaxOpenDatasets = 1;
+
+            data = magic(4);
+            filename1 = createTestFile("pool-test-1.h5", ["/a", "/b"], data);
+            filename2 = createTestFile("pool-test-2.h5", "/a", 2*data);
+
+            lazyArray1a = io.backend.hdf5.HDF5LazyArray(filename1, "/a");
+            lazyArray1b = io.backend.hdf5.HDF5LazyArray(filename1, "/b");
+            lazyArray2a = io.backend.hdf5.HDF5LazyArray(filename2, "/a");
+
+            for i = 1:2
+                testCase.verifyEqual(lazyArray1a.load_mat_style(':', i), data(:, i));
+                testCase.verifyEqual(lazyArray1b.load_mat_style(':', i), data(:, i));
+                testCase.verifyEqual(lazyArray2a.load_mat_style(':', i), 2*data(:, i));
+
+                testCase.verifyEqual(testCase.Pool.NumOpenFiles, 1);
+                testCase.verifyEqual(testCase.Pool.NumOpenDatasets, 1);
+            end
+        end
+
+        function exportToOpenFileInvalidatesPool(testCase)
+            nwb = tests.factory.NWBFile();
+            nwb.acquisition.set('timeseries', ...
+                tests.factory.TimeSeriesWithTimestamps());
+            filename = "pool-test.nwb";
+            nwbExport(nwb, filename);
+
+            nwbIn = nwbRead(filename, 'ignorecache');
+            timeSeries = nwbIn.acquisition.get('timeseries');
+            expectedData = timeSeries.data.load();
+            testCase.verifyGreaterThan(testCase.Pool.NumOpenFiles, 0);
+
+            nwbIn.session_description = 'edited';
+            nwbExport(nwbIn, filename);
+
+            testCase.verifyEqual(timeSeries.data.load(), expectedData);
+            nwbIn = nwbRead(filename, 'ignorecache');
+            testCase.verifyEqual(nwbIn.session_description, 'edited');
+        end
+
+        function pathsOfTheSameFileShareIdentifiers(testCase)
+            data = magic(4);
+            filename = createTestFile("pool-test.h5", "/a", data);
+            mkdir("sub")
+            otherFilename = fullfile("sub", "..", filename);
+            testCase.verifyEqual( ...
+                io.backend.hdf5.HDF5HandlePool.getFileKey(otherFilename), ...
+                io.backend.hdf5.HDF5HandlePool.getFileKey(filename));
+
+            lazyArray = io.backend.hdf5.HDF5LazyArray(filename, "/a");
+            otherLazyArray = io.backend.hdf5.HDF5LazyArray(otherFilename, "/a");
+            lazyArray.load_mat_style(':', 1);
+            otherLazyArray.load_mat_style(':', 1);
+            testCase.verifyEqual(testCase.Pool.NumFileOpens, 1);
+
+            testCase.Pool.invalidate(otherFilename);
+            testCase.verifyEqual(testCase.Pool.NumOpenFiles, 0);
+        end
+
+        function savedDataStubsCanBeLoaded(testCase)
+            nwb = tests.factory.NWBFile();
+            nwb.acquisition.set('timeseries', ...
+                tests.factory.TimeSeriesWithTimestamps());
+            filename = "pool-test.nwb";
+            nwbExport(nwb, filename);
+
+            nwbIn = nwbRead(filename, 'ignorecache');
+            expectedData = nwbIn.acquisition.get('timeseries').data.load();
+
+            % The loaded objects register the file with the pool again
+            save("pool-test.mat", "nwbIn");
+            clear("nwbIn")
+            testCase.verifyEqual(testCase.Pool.NumOpenFiles, 0);
+            loaded = load("pool-test.mat", "nwbIn");
+            testCase.verifyEqual( ...
+                loaded.nwbIn.acquisition.get('timeseries').data.load(), expectedData);
+        end
+
+        function filesAreClosedAfterReadsByDefault(testCase)
+            testCase.Pool.KeepFilesOpen = false;
+            data = magic(4);
+            filename = createTestFile("pool-test.h5", ["/a", "/b"], data);
+
+            lazyArray = io.backend.hdf5.HDF5LazyArray(filename, "/a");
+            testCase.verifyEqual(lazyArray.load_mat_style(':', 2), data(:, 2));
+            testCase.verifyEqual(testCase.Pool.NumOpenFiles, 0);
+
+            % The file can be written while the lazy array exists
+            h5write(filename, "/b", 2*data);
+            testCase.verifyEqual(h5read(filename, "/b"), 2*data);
+            testCase.verifyEqual(lazyArray.load_mat_style(':', 2), data(:, 2));
+        end
+    end
+end
+
+function filename = createTestFile(filename, datasetPaths, data)
+    for datasetPath = datasetPaths
+        h5create(filename, datasetPath, size(data));
+        h5write(filename, datasetPath, data);
+    end
+end
+
+function restoreLimits(pool, maxOpenFiles, maxOpenDatasets, keepFilesOpen)
+    pool.MaxOpenFiles = maxOpenFiles;
+    pool.MaxOpenDatasets = maxOpenDatasets;
+    pool.KeepFilesOpen = keepFilesOpen;
+end
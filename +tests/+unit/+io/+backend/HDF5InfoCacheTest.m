@@ -0,0 +1,136 @@
+classdef HDF5InfoCacheTest < matlab.unittest.TestCase
+
+    properties
+        Cache
+    end
+
+    methods (TestMethodSetup)
+        function setup(testCase)
+            testCase.applyFixture(matlab.unittest.fixtures.WorkingFolderFixture);
+            testCase.Cache = io.backend.hdf5.HDF5InfoCache(fullfile(pwd, "cache"));
+        end
+    end
+
+    methods (Test)
+        function secondReadIsServedFromCache(testCase)
+            filename = createTestFile("cache-test.h5", magic(4));
+
+            info = testCase.Cache.read(filename);
+            testCase.verifyEqual(testCase.Cache.NumMisses, 1);
+            testCase.verifyEqual(info, h5info(filename));
+
+            cachedInfo = testCase.Cache.read(filename);
+            testCase.verifyEqual(testCase.Cache.NumHits, 1);
+            testCase.verifyEqual(cachedInfo, info);
+        end
+
+        function cacheIsPersistent(testCase)
+            filename = createTestFile("cache-test.h5", magic(4));
+            testCase.Cache.read(filename);
+
+            otherCache = io.backend.hdf5.HDF5InfoCache(testCase.Cache.Folder);
+            otherCache.read(filename);
+            testCase.verifyEqual(otherCache.NumHits, 1);
+        end
+
+        function modifiedFileIsNotServedFromCache(testCase)
+            filename = createTestFile("cache-test.h5", magic(4));
+            testCase.Cache.read(filename);
+
+            h5create(filename, "/b", [2, 2]);
+            info = testCase.Cache.read(filename);
+            testCase.verifyEqual(testCase.Cache.NumMisses, 2);
+            testCase.verifyEqual(numel(info.Datasets), 2);
+        end
+
+        function fileIdentityHasModificationTime(testCase)
+            filename = createTestFile("cache-test.h5", magic(4));
+            identity = io.backend.hdf5.HDF5InfoCache.getFileIdentity(filename);
+            fileInfo = dir(filename);
+            expectedTime = (fileInfo.datenum - datenum(1970, 1, 1)) * 86400 * 1000;
+            % dir reports local time, so only check that the time is set
+            testCase.verifyGreaterThan(identity.Modified, 0);
+            testCase.verifyLessThan(abs(identity.Modified - expectedTime), 2 * 86400 * 1000);
+        end
+
+        function sameSizeEditIsNotServedFromCache(testCase)
+            % The attribute is stored after the data of /a, beyond the
+            % bytes which are hashed for the file identity.
+            filename = createTestFile("cache-test.h5", zeros(1, 2048));
+            h5create(filename, "/b", [1, 1]);
+            h5writeatt(filename, "/b", "note", 'before');
+            identity = io.backend.hdf5.HDF5InfoCache.getFileIdentity(filename);
+            testCase.Cache.read(filename);
+
+            pause(0.1)
+            h5writeatt(filename, "/b", "note", 'after_');
+            editedIdentity = io.backend.hdf5.HDF5InfoCache.getFileIdentity(filename);
+            testCase.assumeEqual(editedIdentity.Size, identity.Size);
+            testCase.assumeEqual(editedIdentity.HeaderHash, identity.HeaderHash);
+
+            info = testCase.Cache.read(filename);
+            testCase.verifyEqual(testCase.Cache.NumMisses, 2);
+            testCase.verifyEqual(info, h5info(filename));
+        end
+
+        function leastRecentlyUsedEntriesAreEvicted(testCase)
+            filenames = [ ...
+                createTestFile("cache-test-1.h5", magic(4)), ...
+                createTestFile("cache-test-2.h5", magic(4)), ...
+                createTestFile("cache-test-3.h5", magic(4))];
+
+            testCase.Cache.read(filenames(1));
+            entry = dir(fullfile(testCase.Cache.Folder, "*.mat"));
+            % Room for two entries
+            testCase.Cache.MaxSize = 2.5 * entry.bytes;
+
+            for filename = filenames
+                testCase.Cache.read(filename);
+            end
+            entries = dir(fullfile(testCase.Cache.Folder, "*.mat"));
+            testCase.verifyLessThanOrEqual(sum([entries.bytes]), testCase.Cache.MaxSize);
+            testCase.verifyNumElements(entries, 2);
+
+            % The entry of the last file is kept
+            testCase.Cache.resetStatistics();
+            testCase.Cache.read(filenames(3));
+            testCase.verifyEqual(testCase.Cache.NumHits, 1);
+        end
+
+        function clearDeletesAllEntries(testCase)
+            filename = createTestFile("cache-test.h5", magic(4));
+            testCase.Cache.read(filename);
+            testCase.Cache.clear();
+            testCase.verifyEmpty(dir(fullfile(testCase.Cache.Folder, "*.mat")));
+        end
+
+        function nwbReadWithParsedTreeCache(testCase)
+            nwb = tests.factory.NWBFile();
+            nwb.acquisition.set('timeseries', tests.factory.TimeSeriesWithTimestamps());
+            filename = "cache-test.nwb";
+            nwbExport(nwb, filename);
+
+            cache = io.backend.hdf5.HDF5InfoCache.instance();
+            testCase.addTeardown(@restoreFolder, cache, cache.Folder);
+            cache.Folder = testCase.Cache.Folder;
+            cache.resetStatistics();
+
+            nwbIn = nwbRead(filename, 'ignorecache', UseParsedTreeCache=true);
+            nwbCached = nwbRead(filename, 'ignorecache', UseParsedTreeCache=true);
+            testCase.verifyEqual(cache.NumHits, 1);
+            testCase.verifyEqual( ...
+                nwbCached.acquisition.get('timeseries').data.load(), ...
+                nwbIn.acquisition.get('timeseries').data.load());
+            testCase.verifyEqual(nwbCached.identifier, nwbIn.identifier);
+        end
+    end
+end
+
+function filename = createTestFile(filename, data)
+    h5create(filename, "/a", size(data));
+    h5write(filename, "/a", data);
+end
+
+function restoreFolder(cache, folder)
+    cache.Folder = folder;
+end
@@ -21,5 +21,34 @@ classdef HDF5LazyArrayTest < matlab.unittest.TestCase
             testCase.verifyEqual(lazyArray.load_h5_style(), data);
             testCase.verifyEqual(lazyArray.load_mat_style(1:2, 2, ':'), data(1:2, 2, :));
         end
+
+        function loadLinearIndices(testCase)
+            filename = "lazy-array-test.h5";
+            data = reshape(1:600, [20, 10, 3]);
+            h5create(filename, "/data", size(data));
+            h5write(filename, "/data", data);
+            lazyArray = io.backend.hdf5.HDF5LazyArray(filename, "/data");
+
+            selections = { ...
+                5:400, ...          % contiguous, spanning columns
+                (1:10:600)', ...    % strided
+                [7 3 3 590 41 1], ... % scattered, unordered, duplicates
+                [1:50, 100:5:200, 333]};
+            for i = 1:numel(selections)
+                testCase.verifyEqual(lazyArray.load_mat_style(selections{i}), ...
+                    data(selections{i}), sprintf('Selection %d', i));
+            end
+        end
+
+        function loadUnorderedSelectionWithOpenDimension(testCase)
+            filename = "lazy-array-test.h5";
+            data = reshape(1:24, [4, 3, 2]);
+            h5create(filename, "/data", size(data));
+            h5write(filename, "/data", data);
+            lazyArray = io.backend.hdf5.HDF5LazyArray(filename, "/data");
+
+            testCase.verifyEqual(lazyArray.load_mat_style([3 1 3], ':', 2), data([3 1 3], :, 2));
+            testCase.verifyEqual(lazyArray.load_mat_style(':', [3 1], ':'), data(:, [3 1], :));
+        end
     end
 end
@@ -31,5 +31,44 @@ classdef HDF5ReaderTest < matlab.unittest.TestCase
 
             testCase.verifyFalse(isa(datasetValue, "types.untyped.DataStub"))
         end
+
+        function readNodeInfoUsesIndexFromRootInfo(testCase)
+            nwb = tests.factory.NWBFile();
+            nwb.acquisition.set('timeseries', tests.factory.TimeSeriesWithTimestamps());
+            filename = "reader-index-test.nwb";
+            nwbExport(nwb, filename);
+
+            reader = io.backend.hdf5.HDF5Reader(filename);
+            reader.readRootInfo();
+
+            nodePaths = ["/acquisition/timeseries", "/acquisition/timeseries/data"];
+            for nodePath = nodePaths
+                nodeInfo = reader.readNodeInfo(nodePath);
+                expectedInfo = h5info(filename, nodePath);
+                testCase.verifyEqual(nodeInfo.Name, expectedInfo.Name)
+                testCase.verifyEqual(nodeInfo.Attributes, expectedInfo.Attributes)
+            end
+
+            % Paths of link targets are normalized before the lookup
+            testCase.verifyEqual(reader.readNodeInfo("/acquisition//timeseries/"), ...
+                reader.readNodeInfo("/acquisition/timeseries"))
+        end
+
+        function readDatasetValueCreatesLazyArrayFromIndex(testCase)
+            nwb = tests.factory.NWBFile();
+            nwb.acquisition.set('timeseries', tests.factory.TimeSeriesWithTimestamps());
+            filename = "reader-lazy-test.nwb";
+            nwbExport(nwb, filename);
+
+            reader = io.backend.hdf5.HDF5Reader(filename);
+            reader.readRootInfo();
+            datasetPath = "/acquisition/timeseries/data";
+            datasetValue = reader.readDatasetValue(reader.readNodeInfo(datasetPath), datasetPath);
+
+            testCase.verifyClass(datasetValue, "types.untyped.DataStub")
+            datasetInfo = h5info(filename, datasetPath);
+            testCase.verifyEqual(datasetValue.dims, datasetInfo.Dataspace.Size)
+            testCase.verifyEqual(datasetValue.load(), h5read(filename, datasetPath))
+        end
     end
 end
@@ -16,6 +16,30 @@ classdef SpaceTest < matlab.unittest.TestCase
             testCase.verifyClass(shape, 'cell')
         end
 
+        function testFindShapesCoalescesRuns(testCase)
+            shapes = io.space.findShapes([1:4, 10:10:40, 41, 50]);
+
+            testCase.verifyLength(shapes, 4)
+            testCase.verifyEqual(shapes{1}.range, 1:4)
+            testCase.verifyEqual(shapes{2}.range, 10:10:40)
+            testCase.verifyClass(shapes{3}, 'io.space.shape.Point')
+            testCase.verifyClass(shapes{4}, 'io.space.shape.Point')
+        end
+
+        function testPlanLinearSelection(testCase)
+            hyperslabs = io.space.planLinearSelection(5:25, [10, 3]);
+
+            % One hyperslab for each column
+            testCase.verifyLength(hyperslabs, 3)
+            testCase.verifyEqual(hyperslabs(1).start, [5 1])
+            testCase.verifyEqual(hyperslabs(1).block, [6 1])
+            testCase.verifyEqual(hyperslabs(3).start, [1 3])
+            testCase.verifyEqual(hyperslabs(3).block, [5 1])
+
+            % Scattered indices are better selected as points
+            testCase.verifyEmpty(io.space.planLinearSelection([1 7 12 30], [10, 3]))
+        end
+
         function testPoint(testCase)
             point = io.space.shape.Point(1);
             
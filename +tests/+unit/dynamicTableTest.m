@@ -525,6 +525,76 @@ classdef dynamicTableTest < tests.abstract.NwbTestCase
             testCase.verifyEmpty(readTable.colnames);
             testCase.verifyEqual(readTable.id.data.load(), int64((0:2)'));
         end
+
+        function testDynamicTableBuilderMatchesAddRow(testCase)
+            colnames = {'quality', 'label', 'spike_times'};
+            expectedTable = types.hdmf_common.DynamicTable( ...
+                'description', 'table built with addRow', 'colnames', colnames);
+            builtTable = types.hdmf_common.DynamicTable( ...
+                'description', 'table built with DynamicTableBuilder', 'colnames', colnames);
+
+            % the first spike_times value is scalar, so the index of the
+            % ragged column is only added with the second row.
+            spikeTimes = {1, [2, 3, 4], 5, [6, 7]};
+            labels = {'a', 'bc', 'def', 'g'};
+            builder = matnwb.neurodata.DynamicTableBuilder(builtTable);
+            for iRow = 1:length(spikeTimes)
+                rowArgs = {'quality', iRow / 10, 'label', labels{iRow}, ...
+                    'spike_times', spikeTimes{iRow}};
+                expectedTable.addRow(rowArgs{:});
+                builder.addRow(rowArgs{:});
+            end
+            testCase.verifyEqual(builder.NumRows, 4);
+            testCase.verifyEmpty(builtTable.id.data);
+
+            builder.commit();
+            testCase.verifyEqual(builder.NumRows, 0);
+            testCase.verifyDynamicTableEqual(builtTable, expectedTable);
+
+            % a batch of rows appended to the table, with custom ids
+            rows = table([0.7; 0.8], {'h'; 'ij'}, {[7, 8]; 9}, [10; 20], ...
+                'VariableNames', [colnames, {'id'}]);
+            for iRow = 1:height(rows)
+                expectedTable.addRow('quality', rows.quality(iRow), ...
+                    'label', rows.label{iRow}, ...
+                    'spike_times', rows.spike_times{iRow}, ...
+                    'id', rows.id(iRow));
+            end
+            builder.addRows(rows);
+            builder.commit();
+            testCase.verifyDynamicTableEqual(builtTable, expectedTable);
+            testCase.verifyEqual(builtTable.id.data, [(0:3)'; 10; 20]);
+        end
+
+        function testDynamicTableBuilderValidatesRows(testCase)
+            dynamicTable = types.hdmf_common.DynamicTable( ...
+                'description', 'test table', 'colnames', {'a', 'b'});
+            builder = matnwb.neurodata.DynamicTableBuilder(dynamicTable);
+            testCase.verifyError(@() builder.addRow('a', 1), ...
+                'NWB:DynamicTable:AddRow:MissingColumns');
+            testCase.verifyError(@() builder.addRow('a', 1, 'b', 2, 'c', 3), ...
+                'NWB:DynamicTable:AddRow:InvalidColumns');
+            builder.addRow('a', 1, 'b', 'text');
+            testCase.verifyError(@() builder.addRow('a', 2, 'b', 3), ...
+                'NWB:DynamicTable:AddRow:InvalidType');
+        end
+    end
+
+    methods (Access = private)
+        function verifyDynamicTableEqual(testCase, actualTable, expectedTable)
+            for iColumn = 1:length(expectedTable.colnames)
+                columnName = expectedTable.colnames{iColumn};
+                testCase.verifyEqual( ...
+                    actualTable.vectordata.get(columnName).data, ...
+                    expectedTable.vectordata.get(columnName).data, ...
+                    sprintf('Data of column `%s` differs', columnName));
+            end
+            testCase.verifyEqual(sort(actualTable.vectordata.keys()), ...
+                sort(expectedTable.vectordata.keys()));
+            testCase.verifyEqual(actualTable.vectordata.get('spike_times_index').data, ...
+                expectedTable.vectordata.get('spike_times_index').data);
+            testCase.verifyEqual(actualTable.id.data, expectedTable.id.data);
+        end
     end
 
     methods (Static, Access=private)
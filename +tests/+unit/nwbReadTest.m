@@ -51,6 +51,30 @@ classdef nwbReadTest < tests.abstract.NwbTestCase
             testCase.verifyTrue( isfolder(fullfile(pwd, "+types")) )
         end
 
+        function readFileSkipsGenerationOfUnchangedSpecs(testCase)
+            testCase.applyFixture(matlab.unittest.fixtures.WorkingFolderFixture);
+
+            fileName = 'testReadFileSkipsGeneration.nwb';
+            nwbExport(tests.factory.NWBFile(), fileName)
+            nwbRead(fileName, "savedir", pwd);
+
+            % Mark a generated class file, regeneration would remove the mark
+            classFile = fullfile(pwd, '+types', '+core', 'TimeSeries.m');
+            marker = '% regeneration marker';
+            fid = fopen(classFile, 'a');
+            fprintf(fid, '\n%s\n', marker);
+            fclose(fid);
+
+            nwbRead(fileName, "savedir", pwd);
+            testCase.verifyTrue(contains(fileread(classFile), marker))
+
+            % Classes are generated again if they were removed
+            nwbClearGenerated(pwd);
+            nwbRead(fileName, "savedir", pwd);
+            testCase.verifyTrue(isfile(classFile))
+            testCase.verifyFalse(contains(fileread(classFile), marker))
+        end
+
         function readFileWithoutSpecLoc(testCase)
             nwbFile = tests.factory.NWBFile();
             fileName = 'testReadFileWithoutSpecLoc.nwb';
@@ -170,6 +194,78 @@ classdef nwbReadTest < tests.abstract.NwbTestCase
             testCase.verifyClass(nwb, 'NwbFile');
         end
 
+        function readWithLazyLoadGroups(testCase)
+            nwbFile = tests.factory.NWBFile();
+            timeSeries = tests.factory.TimeSeriesWithTimestamps();
+            nwbFile.acquisition.set('ts', timeSeries);
+            processingModule = types.core.ProcessingModule('description', 'test module');
+            processingModule.nwbdatainterface.set('ts', tests.factory.TimeSeriesWithTimestamps());
+            nwbFile.processing.set('module', processingModule);
+            fileName = "testReadWithLazyLoadGroups.nwb";
+            nwbExport(nwbFile, fileName)
+
+            nwb = nwbRead(fileName, "ignorecache", LazyLoadGroups=true);
+            testCase.verifyFalse(nwb.acquisition.isEntryLoaded('ts'))
+            testCase.verifyFalse(nwb.processing.isEntryLoaded('module'))
+
+            timeSeriesIn = nwb.acquisition.get('ts');
+            testCase.verifyClass(timeSeriesIn, 'types.core.TimeSeries')
+            testCase.verifyTrue(nwb.acquisition.isEntryLoaded('ts'))
+            testCase.verifyEqual(timeSeriesIn.data.load(), timeSeries.data)
+            testCase.verifyFalse(nwb.processing.isEntryLoaded('module'))
+
+            moduleIn = nwb.processing.get('module');
+            testCase.verifyClass(moduleIn, 'types.core.ProcessingModule')
+            testCase.verifyFalse(moduleIn.nwbdatainterface.isEntryLoaded('ts'))
+            testCase.verifyClass(moduleIn.nwbdatainterface.get('ts'), 'types.core.TimeSeries')
+        end
+
+        function searchForWithLazyLoadGroups(testCase)
+            nwbFile = tests.factory.NWBFile();
+            nwbFile.acquisition.set('ts', tests.factory.TimeSeriesWithTimestamps());
+            fileName = "testSearchForWithLazyLoadGroups.nwb";
+            nwbExport(nwbFile, fileName)
+
+            nwb = nwbRead(fileName, "ignorecache", LazyLoadGroups=true);
+            result = nwb.searchFor('types.core.TimeSeries');
+            testCase.verifyTrue(result.isKey('/acquisition/ts'))
+        end
+
+        function exportWithLazyLoadGroups(testCase)
+            nwbFile = tests.factory.NWBFile();
+            timeSeries = tests.factory.TimeSeriesWithTimestamps();
+            nwbFile.acquisition.set('ts', timeSeries);
+            nwbFile.acquisition.set('ts2', tests.factory.TimeSeriesWithTimestamps());
+            fileName = "testExportWithLazyLoadGroups.nwb";
+            nwbExport(nwbFile, fileName)
+
+            % Edit a file without loading all of its groups
+            nwb = nwbRead(fileName, "ignorecache", LazyLoadGroups=true);
+            nwb.acquisition.get('ts2').description = 'edited';
+            nwbExport(nwb, fileName)
+            nwbIn = nwbRead(fileName, "ignorecache");
+            testCase.verifyEqual(nwbIn.acquisition.get('ts2').description, 'edited')
+            testCase.verifyEqual(nwbIn.acquisition.get('ts').data.load(), timeSeries.data)
+
+            % Export to a new file, which loads the remaining groups
+            nwb = nwbRead(fileName, "ignorecache", LazyLoadGroups=true);
+            newFileName = "testExportWithLazyLoadGroupsCopy.nwb";
+            nwbExport(nwb, newFileName)
+            nwbIn = nwbRead(newFileName, "ignorecache");
+            testCase.verifyEqual(nwbIn.acquisition.get('ts').data.load(), timeSeries.data)
+            testCase.verifyEqual(nwbIn.acquisition.get('ts2').description, 'edited')
+
+            % Overwrite the file the groups were read from, which truncates
+            % it. Groups which were never accessed must still be exported.
+            nwb = nwbRead(newFileName, "ignorecache", LazyLoadGroups=true);
+            nwb.acquisition.get('ts2').description = 'overwritten';
+            nwbExport(nwb, newFileName, "overwrite")
+            nwbIn = nwbRead(newFileName, "ignorecache");
+            testCase.verifyTrue(nwbIn.acquisition.isKey('ts'))
+            testCase.verifyEqual(nwbIn.acquisition.get('ts').description, timeSeries.description)
+            testCase.verifyEqual(nwbIn.acquisition.get('ts2').description, 'overwritten')
+        end
+
         function testIgnoreCacheFlagForFileWithOtherNWBVersion(testCase)
             
             % Temporarily remove the generated types from path.
@@ -0,0 +1,179 @@
+classdef PyNWBTestWorker < handle
+% PyNWBTestWorker - Long-lived Python process for running PyNWBIOTest.py tests.
+%
+%   Starting a new Python interpreter for every PyNWB interop test means
+%   re-importing pynwb, hdmf and h5py and rebuilding the type map each time.
+%   A PyNWBTestWorker starts "PyNWBIOTest.py" once in worker mode and sends
+%   it one test request at a time over the process' standard input. Replies
+%   are read back as JSON from the process' standard output.
+%
+%   Example:
+%       worker = tests.util.PyNWBTestWorker("python", folderOfPyNWBIOTest);
+%       [status, cmdout] = worker.runTest("TimeSeriesIOTest.testOutToMatNWB", scratchFolder);
+%
+% See also tests.fixtures.PyNWBTestWorkerFixture
+
+    properties (SetAccess = private)
+        % PythonExecutable - Python executable used to start the worker
+        PythonExecutable (1,1) string
+
+        % ModuleFolder - Folder containing the PyNWBIOTest.py module
+        ModuleFolder (1,1) string
+
+        % LogFile - File receiving the standard error stream of the worker
+        LogFile (1,1) string
+    end
+
+    properties (Constant, Access = private)
+        ForwardedVariables = ["PYTHONPATH", "HDF5_PLUGIN_PATH", ...
+            "MATNWB_FIXTURE_CACHE", "MATNWB_FIXTURE_CACHE_DIR", ...
+            "MATNWB_FIXTURE_CACHE_MAX_MB", "MATNWB_FIXTURE_CACHE_MAX_AGE_DAYS"]
+    end
+
+    properties (Access = private)
+        Process = []
+        InputWriter = []
+        OutputReader = []
+    end
+
+    methods
+        function obj = PyNWBTestWorker(pythonExecutable, moduleFolder)
+            arguments
+                pythonExecutable (1,1) string
+                moduleFolder (1,1) string {matnwb.common.compatibility.mustBeFolder}
+            end
+            obj.PythonExecutable = pythonExecutable;
+            obj.ModuleFolder = moduleFolder;
+            obj.LogFile = string(tempname) + "_pynwb_worker.log";
+            obj.start()
+        end
+
+        function delete(obj)
+            obj.stop()
+            if isfile(obj.LogFile)
+                delete(obj.LogFile)
+            end
+        end
+
+        function tf = isRunning(obj)
+            tf = ~isempty(obj.Process) && obj.Process.isAlive();
+        end
+
+        function [status, cmdout] = runTest(obj, testName, scratchFolder)
+        % runTest - Run one test in the worker.
+        %
+        %   [status, cmdout] = runTest(obj, testName, scratchFolder) runs the
+        %   test testName ("<TestClass>.<testMethod>"), which reads and writes
+        %   the files it exchanges with MatNWB in scratchFolder. status is 0
+        %   if the test passed and cmdout holds the unittest report,
+        %   mirroring the outputs of system().
+            arguments
+                obj (1,1) tests.util.PyNWBTestWorker
+                testName (1,1) string
+                scratchFolder (1,1) string = pwd
+            end
+
+            if ~obj.isRunning()
+                obj.start()
+            end
+
+            request = struct('test', testName, 'scratch_dir', scratchFolder);
+            reply = obj.sendRequest(request);
+            if isempty(reply)
+                % The worker died while running the test. Restart it on the
+                % next request and report the failure for this one.
+                status = 1;
+                cmdout = sprintf('PyNWB test worker exited unexpectedly.\n%s', obj.readLog());
+                obj.stop()
+                return
+            end
+            status = reply.status;
+            cmdout = reply.output;
+        end
+    end
+
+    methods (Access = private)
+        function start(obj)
+            command = {char(obj.PythonExecutable), '-B', '-u', '-m', 'PyNWBIOTest', '--worker'};
+            builder = java.lang.ProcessBuilder(command);
+            builder.directory(java.io.File(char(obj.ModuleFolder)));
+            builder.redirectError(java.io.File(char(obj.LogFile)));
+
+            % Java's environment is a snapshot from when MATLAB started, so
+            % forward variables that may have been set with setenv since.
+            environment = builder.environment();
+            for name = obj.ForwardedVariables
+                value = getenv(name);
+                if ~isempty(value)
+                    environment.put(char(name), value);
+                end
+            end
+
+            obj.Process = builder.start();
+            obj.InputWriter = java.io.BufferedWriter( ...
+                java.io.OutputStreamWriter(obj.Process.getOutputStream(), 'UTF-8'));
+            obj.OutputReader = java.io.BufferedReader( ...
+                java.io.InputStreamReader(obj.Process.getInputStream(), 'UTF-8'));
+
+            reply = obj.readReply();
+            if isempty(reply) || ~isfield(reply, 'ready')
+                log = obj.readLog();
+                obj.stop()
+                error('NWB:Test:PyNWBTestWorkerFailed', ...
+                    'Failed to start PyNWB test worker using "%s":\n%s', ...
+                    obj.PythonExecutable, log)
+            end
+        end
+
+        function stop(obj)
+            if isempty(obj.Process)
+                return
+            end
+            if obj.Process.isAlive()
+                try
+                    obj.writeLine(jsonencode(struct('command', 'shutdown')))
+                    obj.InputWriter.close();
+                    obj.Process.waitFor();
+                catch
+                    obj.Process.destroy();
+                end
+            end
+            obj.Process = [];
+            obj.InputWriter = [];
+            obj.OutputReader = [];
+        end
+
+        function reply = sendRequest(obj, request)
+            try
+                obj.writeLine(jsonencode(request))
+            catch
+                reply = [];
+                return
+            end
+            reply = obj.readReply();
+        end
+
+        function writeLine(obj, text)
+            obj.InputWriter.write(text);
+            obj.InputWriter.newLine();
+            obj.InputWriter.flush();
+        end
+
+        function reply = readReply(obj)
+            line = obj.OutputReader.readLine();
+            if isempty(line)
+                reply = [];
+            else
+                reply = jsondecode(char(line));
+            end
+        end
+
+        function text = readLog(obj)
+            if isfile(obj.LogFile)
+                text = fileread(obj.LogFile);
+            else
+                text = '';
+            end
+        end
+    end
+end
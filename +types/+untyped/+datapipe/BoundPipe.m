@@ -18,18 +18,29 @@ classdef BoundPipe < types.untyped.datapipe.Pipe
     end
     
     methods % lifecycle
-        function obj = BoundPipe(filename, path, varargin)
+        function obj = BoundPipe(filename, path, config, lazyArray)
+            % BOUNDPIPE(FILENAME, PATH) binds to an existing dataset.
+            % BOUNDPIPE(FILENAME, PATH, CONFIG) uses the given configuration
+            % instead of reading it from the dataset.
+            % BOUNDPIPE(FILENAME, PATH, CONFIG, LAZYARRAY) reads the
+            % dataset through LAZYARRAY. CONFIG may be empty.
+            arguments
+                filename
+                path
+                config types.untyped.datapipe.Configuration = types.untyped.datapipe.Configuration.empty
+                lazyArray io.backend.base.LazyArray = io.backend.base.LazyArray.empty
+            end
             import types.untyped.datapipe.Configuration;
             import types.untyped.datapipe.properties.*;
             
-            obj.stub = types.untyped.DataStub(filename, path);
+            obj.stub = types.untyped.DataStub(filename, path, [], [], lazyArray);
             
             current_size = obj.stub.dims;
             max_size = obj.stub.maxDims;
             
             did = obj.getDataset();
             
-            if isempty(varargin)
+            if isempty(config)
                 obj.config = Configuration(max_size);
                 axis = find(current_size < max_size);
                 if isempty(axis)
@@ -56,7 +67,7 @@ classdef BoundPipe < types.untyped.datapipe.Pipe
                 obj.config.dataType = io.getMatType(tid);
                 H5T.close(tid);
             else
-                obj.config = varargin{1};
+                obj.config = config;
             end
             
             pid = H5D.get_create_plist(did);
@@ -116,6 +127,9 @@ classdef BoundPipe < types.untyped.datapipe.Pipe
             if nargin < 2
                 access = 'H5F_ACC_RDONLY';
             end
+            if strcmp(access, 'H5F_ACC_RDWR')
+                io.backend.hdf5.HDF5HandlePool.instance().invalidate(obj.filename);
+            end
             fid = H5F.open(obj.filename, access, 'H5P_DEFAULT');
         end
         
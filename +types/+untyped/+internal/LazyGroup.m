@@ -0,0 +1,75 @@
+classdef LazyGroup < handle
+% LazyGroup - Placeholder for a typed group of a file which is parsed on first access.
+%
+% When a file is read with nwbRead(..., LazyLoadGroups=true), typed groups
+% which are entries of a types.untyped.Set are represented by LazyGroup
+% objects. The Set replaces the placeholder with the parsed neurodata type
+% the first time the entry is accessed. Groups inside the parsed group are
+% again represented by placeholders.
+%
+% See also: nwbRead, types.untyped.Set
+
+    properties (SetAccess = immutable)
+        % Filename - The file containing the group.
+        Filename (1,1) string
+
+        % Path - The path of the group in the file.
+        Path (1,1) string
+
+        % TypeName - Class name of the neurodata type of the group.
+        TypeName (1,:) char
+    end
+
+    properties (SetAccess = private)
+        % IsLoaded - True after the group has been parsed.
+        IsLoaded (1,1) logical = false
+    end
+
+    properties (Access = private)
+        Info struct = struct.empty
+        Blacklist struct = struct.empty
+        Reader = []
+        Value = []
+    end
+
+    methods
+        function obj = LazyGroup(filename, info, typeName, blacklist, reader)
+            arguments
+                filename (1,1) string
+                info (1,1) struct % h5info structure of the group
+                typeName (1,:) char
+                blacklist (1,1) struct
+                reader (1,1) io.backend.base.Reader
+            end
+            obj.Filename = filename;
+            obj.Path = info.Name;
+            obj.TypeName = typeName;
+            obj.Info = info;
+            obj.Blacklist = blacklist;
+            obj.Reader = reader;
+        end
+
+        function value = load(obj)
+        % load - Parse the group and return the neurodata type.
+            if ~obj.IsLoaded
+                softLinkWarningResetObj = types.untyped.SoftLink.disablePathDeprecationWarning(); %#ok<NASGU>
+                obj.Value = io.parseGroup(char(obj.Filename), obj.Info, ...
+                    obj.Blacklist, obj.Reader, true);
+                obj.IsLoaded = true;
+                % Other groups may still use the reader, but not the open file
+                obj.Reader.close();
+
+                % Release the metadata and the reader
+                obj.Info = struct.empty;
+                obj.Reader = [];
+            end
+            value = obj.Value;
+        end
+
+        function tf = isInFile(obj, filename)
+        % isInFile - Check whether the group is stored in the given file.
+            getFileKey = @io.backend.hdf5.HDF5HandlePool.getFileKey;
+            tf = strcmp(getFileKey(obj.Filename), getFileKey(filename));
+        end
+    end
+end
@@ -41,6 +41,11 @@ classdef (Sealed) DataPipe < handle
     %   of the dataset within that file. These arguments cannot be used
     %   with any of the above arguments, which are for setting up a new
     %   DataPipe.
+    %
+    %   DATAPIPE('filename', FILENAME, 'path', PATH, 'lazyArray', LAZYARRAY)
+    %   reads the pre-existing dataset through LAZYARRAY, an
+    %   io.backend.base.LazyArray for the same dataset. File readers use
+    %   this to pass on the dataset metadata they already know.
     
     properties (SetAccess = private)
         internal;
@@ -84,6 +89,8 @@ classdef (Sealed) DataPipe < handle
             p.addParameter('data', []);
             p.addParameter('filename', '');
             p.addParameter('path', '');
+            p.addParameter('lazyArray', io.backend.base.LazyArray.empty, ...
+                @(x) isa(x, 'io.backend.base.LazyArray'));
             p.addParameter('hasShuffle', false, ...
                 @(b) isscalar(b) && (islogical(b) || isnumeric(b)));
             p.addParameter('filters', DynamicFilter.empty(), ...
@@ -99,7 +106,8 @@ classdef (Sealed) DataPipe < handle
                 'required to create a bound DataPipe.  Only one of the above were '...
                 'specified.']);
             if hasFilename && hasPath
-                obj.internal = BoundPipe(p.Results.filename, p.Results.path);
+                obj.internal = BoundPipe(p.Results.filename, p.Results.path, ...
+                    Configuration.empty, p.Results.lazyArray);
                 meta = metaclass(obj.internal);
                 proplist = meta.PropertyList;
                 propnames = {proplist.Name};
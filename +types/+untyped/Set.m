@@ -4,6 +4,11 @@ classdef Set < dynamicprops & matlab.mixin.CustomDisplay
 %   Neurodata types are added to the Set with name keys, forming name-value 
 %   pairs referred to as entries. A validation function will ensure that
 %   only supported neurodata types are added to the set.
+%
+%   Entries can be added as types.untyped.internal.LazyGroup placeholders
+%   (see nwbRead with LazyLoadGroups=true). A placeholder is parsed,
+%   validated and replaced by its neurodata type when the entry is first
+%   accessed.
 
 %   Developer notes:
 %   `name` is used throughout this class to refer to the actual name of a Set 
@@ -13,6 +18,7 @@ classdef Set < dynamicprops & matlab.mixin.CustomDisplay
     properties (Access = private)
         ValidationFunction function_handle = function_handle.empty() % validation function for entries
         PropertyManager matnwb.utility.DynamicPropertyManager
+        LazyEntries containers.Map % name -> types.untyped.internal.LazyGroup
     end
 
     properties (Access = ?matnwb.mixin.HasUnnamedGroups)
@@ -31,6 +37,7 @@ classdef Set < dynamicprops & matlab.mixin.CustomDisplay
             % obj = SET(__,fcn) adds a validation function from a handle
 
             obj.PropertyManager = matnwb.utility.DynamicPropertyManager(obj);
+            obj.LazyEntries = containers.Map('KeyType', 'char', 'ValueType', 'any');
 
             if nargin == 0
                 return;
@@ -52,6 +59,10 @@ classdef Set < dynamicprops & matlab.mixin.CustomDisplay
         end
         
         function value = validateEntry(obj, name, value)
+            if isa(value, 'types.untyped.internal.LazyGroup')
+                % Validated when the entry is loaded
+                return
+            end
             if ~isempty(obj.ValidationFunction)
                 MECause = [];
                 try
@@ -89,6 +100,9 @@ classdef Set < dynamicprops & matlab.mixin.CustomDisplay
             
             for i = 1:length(names)
                 currentName = names{i};
+                if obj.isPendingEntry(currentName)
+                    continue % Validated when the entry is loaded
+                end
                 try
                     obj.validateEntry(currentName, obj.get(currentName));
                 catch ME
@@ -114,10 +128,15 @@ classdef Set < dynamicprops & matlab.mixin.CustomDisplay
             allPropertyNames = obj.PropertyManager.getAllPropertyNames();
             for iPropName = 1:length(allPropertyNames)
                 propertyName = allPropertyNames{iPropName};
-                propertyValue = obj.(propertyName);
-                
                 originalName = obj.PropertyManager.getOriginalNameForPropertyName(propertyName);
                 propertyFullPath = [fullpath '/' originalName];
+
+                if obj.isPendingEntry(originalName) && isEditingFile(writer) ...
+                        && obj.LazyEntries(originalName).isInFile(writer.Filename)
+                    % Group was not loaded, so it is unchanged in the file.
+                    continue
+                end
+                propertyValue = obj.(propertyName);
                 
                 if startsWith(class(propertyValue), 'types.')
                     refs = propertyValue.export(writer, propertyFullPath, refs);
@@ -202,6 +221,13 @@ classdef Set < dynamicprops & matlab.mixin.CustomDisplay
             obj.ValidationFunction = functionHandle;
         end
 
+        function tf = isEntryLoaded(obj, name)
+        % isEntryLoaded - Check whether an entry was loaded from file, i.e
+        % it is not a placeholder for a group which is parsed on first access.
+            obj.assertEntryExists(name)
+            tf = ~obj.isPendingEntry(name);
+        end
+
         function T = getAliasMap(obj)
             T = obj.PropertyManager.getAliasMap();
         end
@@ -268,6 +294,12 @@ classdef Set < dynamicprops & matlab.mixin.CustomDisplay
                     if isempty(currentValue)
                         obj.remove(currentName);
                     else
+                        if isa(currentValue, 'types.untyped.internal.LazyGroup')
+                            currentValue = currentValue.load();
+                        end
+                        if obj.LazyEntries.isKey(currentName)
+                            obj.LazyEntries.remove(currentName);
+                        end
                         propertyName = obj.getPropertyName(currentName);
                         obj.(propertyName) = currentValue;
                     end
@@ -380,7 +412,13 @@ classdef Set < dynamicprops & matlab.mixin.CustomDisplay
             body = cell(1, numProperties);
             for i = 1:numProperties
                 propertyName = propertyNames{i};
-                propertyType = class(obj.(propertyName));
+                originalName = obj.PropertyManager.getOriginalNameForPropertyName(propertyName);
+                if obj.isPendingEntry(originalName)
+                    % Display without loading the entry
+                    propertyType = sprintf('%s (not loaded)', obj.LazyEntries(originalName).TypeName);
+                else
+                    propertyType = class(obj.(propertyName));
+                end
                 body{i} = sprintf('%s: %s', paddedPropertyNames{i}, propertyType);                
             end
             body = file.addSpaces(strjoin(body, newline), 4);
@@ -420,6 +458,18 @@ classdef Set < dynamicprops & matlab.mixin.CustomDisplay
             
             metaProperty = obj.PropertyManager.addProperty(name);
             propertyName = metaProperty.Name;
+
+            if isa(value, 'types.untyped.internal.LazyGroup')
+                % Assign the placeholder before adding the set method, so
+                % it is not validated. The value is validated when loaded.
+                obj.(propertyName) = value;
+                obj.LazyEntries(char(name)) = value;
+                metaProperty.GetMethod = getDynamicGetMethodLoaderFunction(propertyName);
+                if ~isempty(obj.ValidationFunction)
+                    metaProperty.SetMethod = getDynamicSetMethodFilterFunction(propertyName);
+                end
+                return
+            end
             
             if ~isempty(obj.ValidationFunction)
                 metaProperty.SetMethod = getDynamicSetMethodFilterFunction(propertyName);
@@ -427,7 +477,15 @@ classdef Set < dynamicprops & matlab.mixin.CustomDisplay
             obj.(propertyName) = value;
         end
 
+        function tf = isPendingEntry(obj, name)
+            name = char(name);
+            tf = obj.LazyEntries.isKey(name) && ~obj.LazyEntries(name).IsLoaded;
+        end
+
         function removeProperty(obj, name)
+            if obj.LazyEntries.isKey(char(name))
+                obj.LazyEntries.remove(char(name));
+            end
             obj.PropertyManager.removeProperty(name)
             if ~isempty(obj.EntryRemovedFunction)
                 % Let potential Set "owner" know that entry was removed
@@ -514,6 +572,21 @@ function setterFunction = getDynamicSetMethodFilterFunction(name)
     end
 end
 
+function getterFunction = getDynamicGetMethodLoaderFunction(name)
+% Replaces a placeholder for a lazily loaded group with the parsed group on
+% first access. Assigning the value calls the set method, which validates it.
+    getterFunction = @getProp;
+
+    function val = getProp(obj)
+        val = obj.(name);
+        if isa(val, 'types.untyped.internal.LazyGroup')
+            val = val.load();
+            obj.(name) = val;
+            val = obj.(name);
+        end
+    end
+end
+
 function mustBeSameLength(values, names)
     % Workaround to support character vectors as input for values.
     if ischar(values)
@@ -528,3 +601,9 @@ function mustBeSameLength(values, names)
             'provided to the Set.'])
     end
 end
+
+function tf = isEditingFile(writer)
+% isEditingFile - Check whether the writer edits an existing file, as
+% opposed to creating or overwriting it.
+    tf = isprop(writer, 'IsEditingFile') && writer.IsEditingFile;
+end
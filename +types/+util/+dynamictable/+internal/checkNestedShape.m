@@ -0,0 +1,14 @@
+function checkNestedShape(data)
+% checkNestedShape - Validate the shape of a row value for in-memory appending.
+
+    errorId = 'NWB:DynamicTable:AddRow:InvalidShape';
+    if iscell(data) && ~iscellstr(data)
+        assert(isvector(data), errorId, ...
+            'Wrapped cell array data must be a vector for use with ragged arrays.');
+        for iCell = 1:length(data)
+            types.util.dynamictable.internal.checkNestedShape(data{iCell});
+        end
+    else
+        assert(ismatrix(data), errorId, 'Adding 3D and higher-rank data must use DataPipes.');
+    end
+end
@@ -0,0 +1,68 @@
+function values = formatColumnRows(values, numRows, columnName)
+% formatColumnRows - Arrange selected column values as MATLAB table rows.
+%
+% values are the selected values of a DynamicTable column for numRows rows
+% (see selectColumn). Row vectors are transposed, arrays are permuted to
+% place the row dimension first, and compound data in a scalar struct is
+% converted to a column of structs, so that values can be used as a
+% variable of a MATLAB table with numRows rows.
+
+    if ~istable(values)
+        if iscolumn(values)
+            % keep column vectors as is
+        elseif isrow(values)
+            values = values .'; % transpose row vectors
+        elseif ndims(values) >= 2 % i.e nd array where ndims >= 2
+            % permute arrays to place last dimension first
+            array_size = size(values);
+
+            is_row_dim = array_size == numRows;
+            if sum(is_row_dim) == 1
+                if ~(is_row_dim(1) || is_row_dim(end))
+                    throw( InvalidVectorDataShapeError(columnName) )
+                end
+            elseif sum(is_row_dim) > 1
+                if is_row_dim(1) && is_row_dim(end)
+                    % Last dimension takes precedence
+                    is_row_dim(1:end-1) = false;
+                    warning('NWB:DynamicTable:VectorDataAmbiguousSize', ...
+                        ['The length of the first and last dimensions of ', ...
+                         'VectorData for column "%s" match the number of ', ...
+                         'rows in the dynamic table. Data is rearranged based on ', ...
+                         'the last dimension, assuming it corresponds with the table rows.'], columnName)
+                elseif is_row_dim(1)
+                    is_row_dim(2:end) = false;
+                elseif is_row_dim(end)
+                    is_row_dim(1:end-1) = false;
+                else
+                    throw( InvalidVectorDataShapeError(columnName) )
+                end
+            end
+            values = permute( values, [find(is_row_dim), find(~is_row_dim)]);
+        end
+    end
+
+    % cell-wrap single multidimensional matrices to prevent invalid
+    % MATLAB tables
+    if numRows == 1 && ~iscell(values) && ~istable(values) && ~isscalar(values)
+        values = {values};
+    end
+
+    % convert compound data type scalar struct into an array of
+    % structs.
+    if isscalar(values) && isstruct(values)
+        structNames = fieldnames(values);
+        fieldValues = cell(numRows, length(structNames));
+        for iField = 1:length(structNames)
+            fieldData = values.(structNames{iField});
+            fieldValues(:, iField) = num2cell(reshape(fieldData(1:numRows), [], 1));
+        end
+        values = cell2struct(fieldValues, structNames, 2);
+    end
+end
+
+function ME = InvalidVectorDataShapeError(column_name)
+    ME = MException('NWB:DynamicTable:InvalidVectorDataShape', ...
+            sprintf( ['Array data for column "%s" has a shape which do ', ...
+                      'not match the number of rows in the dynamic table.'], column_name ));
+end
@@ -0,0 +1,24 @@
+function [catDim, numRows] = getAppendDimension(columnData, data)
+% getAppendDimension - Return the dimension along which data is appended
+% to the in-memory data of a column, and the number of rows in data.
+
+    if isempty(columnData) || isscalar(columnData)
+        appendBasis = data;
+    else
+        appendBasis = columnData;
+    end % determine the basis for finding the concatenation dimension.
+
+    if istable(appendBasis)
+        catDim = 1;
+        numRows = height(data);
+    elseif isscalar(appendBasis) || ~isvector(appendBasis) % is scalar or matrix but not vector.
+        catDim = 2;
+        assert(2 >= ndims(appendBasis), 'NWB:DynamicTable:AddRow:InvalidShape', ...
+            ['addRow does not support adding to matrices with more than 2 dimensions. ' ...
+            'For multi-dimensional matrices, use a DataPipe instead.']);
+        numRows = size(data, 2);
+    else % vector data
+        catDim = find(size(appendBasis) > 1);
+        numRows = length(data);
+    end
+end
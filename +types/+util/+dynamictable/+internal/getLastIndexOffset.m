@@ -0,0 +1,19 @@
+function raggedOffset = getLastIndexOffset(VectorIndex)
+% getLastIndexOffset - Return the last value of a VectorIndex, or 0 if empty.
+%
+% New rows of the ragged column are indexed relative to this offset.
+
+    raggedOffset = 0;
+    if isa(VectorIndex.data, 'types.untyped.DataPipe')
+        if isa(VectorIndex.data.internal, 'types.untyped.datapipe.BlueprintPipe')...
+                && ~isempty(VectorIndex.data.internal.data)
+            raggedOffset = VectorIndex.data.internal.data(end);
+        elseif isa(VectorIndex.data.internal, 'types.untyped.datapipe.BoundPipe')...
+                && ~any(VectorIndex.data.internal.stub.dims == 0)
+            raggedOffset = VectorIndex.data.internal.stub(end);
+        end
+    elseif ~isempty(VectorIndex.data)
+        raggedOffset = VectorIndex.data(end);
+    end
+    raggedOffset = double(raggedOffset);
+end
@@ -0,0 +1,35 @@
+function depth = getNestedDataDepth(data, varargin)
+% getNestedDataDepth - Return the nesting depth of a row value of a column.
+%
+% The depth is the number of VectorData and VectorIndex columns needed to
+% store the value as a single row: 1 for a scalar, plus one for each level
+% of (non-cellstr) cell wrapping and one if the innermost value holds
+% multiple elements.
+
+    p = inputParser;
+    p.addParameter('dataPipeDimension', [], @(x)isnumeric(x) && (isempty(x) || isscalar(x)));
+    p.parse(varargin{:});
+
+    depth = 1;
+    subData = data;
+    while iscell(subData) && ~iscellstr(subData)
+        depth = depth + 1;
+        subData = subData{1};
+    end
+
+    % special case where the final data is in fact multiple rows to begin
+    % with.
+    if isempty(p.Results.dataPipeDimension)
+        if ischar(subData)
+            isMultiRow = 1 < size(subData, 1);
+        else
+            isMultiRow = (ismatrix(subData) && 1 < size(subData, 2)) ...
+                || (isvector(subData) && 1 < length(subData));
+        end
+    else
+        isMultiRow = 1 < size(subData, p.Results.dataPipeDimension);
+    end
+    if isMultiRow
+        depth = depth + 1;
+    end
+end
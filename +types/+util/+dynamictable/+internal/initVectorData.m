@@ -0,0 +1,31 @@
+function initVectorData(DynamicTable, column, dataType)
+% initVectorData - Add an empty VectorData column to a DynamicTable.
+%
+% dataType is the class of the first value added to the column.
+
+    % Don't set the data until after indices are updated.
+    if 8 == exist('types.hdmf_common.VectorData', 'class')
+        VecData = types.hdmf_common.VectorData();
+    else
+        VecData = types.core.VectorData();
+    end
+
+    VecData.description = sprintf('AUTOGENERATED description for column `%s`', column);
+
+    if strcmp(dataType, 'logical')
+        % Logical is the lowest precedent type when concatenating primitive
+        % types in MATLAB. For more information see:
+        % https://www.mathworks.com/help/releases/R2022a/matlab/matlab_prog/valid-combinations-of-unlike-classes.html
+        % That said, we still use doubles by default because character arrays
+        % will error if concatenated with logical arrays.
+        VecData.data = logical([]);
+    else
+        VecData.data = [];
+    end
+
+    if isprop(DynamicTable, column)
+        DynamicTable.(column) = VecData;
+    else
+        DynamicTable.vectordata.set(column, VecData);
+    end
+end
@@ -0,0 +1,162 @@
+function [selected, rowDimension] = selectColumn(DynamicTable, colIndStack, matInd, indexLoader)
+% selectColumn - Select rows of a (possibly ragged) DynamicTable column.
+%
+% colIndStack is the stack of column names from the data column (first) to
+% its outermost VectorIndex (last) and matInd the row indices into the last
+% column of the stack. Ragged columns produce a nested cell array with one
+% cell per row.
+%
+% Every column of the stack is read with a single selection: the bounds of
+% all ranges are read from the VectorIndex at once, and the ranges are read
+% together from the indexed column, then split into cells. rowDimension is
+% the dimension of selected along which rows are stored.
+%
+% indexLoader is an optional function handle (Vector, indices) -> values,
+% used to read the values of a VectorIndex, e.g. from a cache of index data.
+
+    if nargin < 4 || isempty(indexLoader)
+        indexLoader = @loadVectorValues;
+    end
+
+    Vector = getVector(DynamicTable, colIndStack{end});
+
+    if isscalar(colIndStack)
+        [selected, rowDimension] = selectData(Vector, matInd);
+        return;
+    end
+
+    assert(isa(Vector, 'types.hdmf_common.VectorIndex') || isa(Vector, 'types.core.VectorIndex'),...
+        'NWB:DynamicTable:GetRow:InternalError',...
+        'Internal VectorIndex Stack is not using VectorIndex objects!');
+
+    matInd = reshape(double(matInd), [], 1);
+    boundInd = unique([matInd - 1; matInd]);
+    boundInd = boundInd(boundInd > 0);
+    boundValues = zeros(size(boundInd));
+    if ~isempty(boundInd)
+        boundValues(:) = double(indexLoader(Vector, boundInd));
+    end
+    % lookup of the VectorIndex values with a leading 0 for the first row.
+    [~, stopLocation] = ismember(matInd, boundInd);
+    [~, startLocation] = ismember(matInd - 1, boundInd);
+    boundValues = [0; boundValues];
+    startInds = boundValues(startLocation + 1) + 1;
+    stopInds = boundValues(stopLocation + 1);
+    rangeLengths = max(stopInds - startInds + 1, 0);
+
+    % concatenated ranges of the indexed column
+    rangeOffsets = repelem(startInds - cumsum([0; rangeLengths(1:end-1)]) - 1, rangeLengths);
+    childInd = (1:sum(rangeLengths))' + rangeOffsets;
+
+    [childSelected, childRowDimension] = types.util.dynamictable.internal.selectColumn( ...
+        DynamicTable, colIndStack(1:(end-1)), childInd, indexLoader);
+    selected = splitRows(childSelected, rangeLengths, childRowDimension);
+    rowDimension = 1;
+end
+
+function Vector = getVector(DynamicTable, column)
+    if isprop(DynamicTable, column)
+        Vector = DynamicTable.(column);
+    elseif isprop(DynamicTable, 'vectorindex') && DynamicTable.vectorindex.isKey(column) % Schema version < 2.3.0
+        Vector = DynamicTable.vectorindex.get(column);
+    else
+        Vector = DynamicTable.vectordata.get(column);
+    end
+end
+
+function [selected, rowDimension] = selectData(Vector, matInd)
+    if isa(Vector.data, 'types.untyped.DataStub') || ...
+            isa(Vector.data,'types.untyped.DataPipe')
+        if isa(Vector.data, 'types.untyped.DataStub')
+            refProp = Vector.data.dims;
+        else
+            refProp = Vector.data.internal.maxSize;
+        end
+        if length(refProp) == 2 && refProp(2) == 1
+            % catch row vector
+            rank = 1;
+        else
+            rank = length(refProp);
+        end
+    else
+        if iscolumn(Vector.data)
+            %catch row vector
+            rank = 1;
+        elseif istable(Vector.data)
+            rank = 1;
+        else
+            rank = ndims(Vector.data);
+        end
+    end
+
+    selectInd = repmat({':'}, 1, rank);
+    if isa(Vector.data, 'types.untyped.DataPipe')
+        selectInd{Vector.data.axis} = matInd;
+    else
+        selectInd{end} = matInd;
+    end
+    rowDimension = rank;
+
+    if (isstruct(Vector.data) && isscalar(Vector.data)) || istable(Vector.data)
+        if istable(Vector.data)
+            selected = table();
+            fields = Vector.data.Properties.VariableNames;
+        else
+            selected = struct();
+            fields = fieldnames(Vector.data);
+        end
+
+        for i = 1:length(fields)
+            fieldName = fields{i};
+            columnData = Vector.data.(fieldName);
+            selected.(fieldName) = columnData(selectInd{:});
+        end
+    else
+        selected = Vector.data(selectInd{:});
+    end
+
+    % shift dimensions of non-row vectors. otherwise will result in
+    % invalid MATLAB table with uneven column height
+    if isa(Vector.data, 'types.untyped.DataPipe')
+        selected = permute(selected, ...
+            circshift(1:ndims(selected), -(Vector.data.axis-1)));
+        rowDimension = 1;
+    end
+end
+
+function values = loadVectorValues(Vector, indices)
+    if isa(Vector.data, 'types.untyped.DataStub') || isa(Vector.data, 'types.untyped.DataPipe')
+        values = Vector.data.load(indices);
+    else
+        values = Vector.data(indices);
+    end
+end
+
+function split = splitRows(selected, rangeLengths, rowDimension)
+% splitRows - Split selected rows into one cell per range.
+    if isstruct(selected) && isscalar(selected)
+        fields = fieldnames(selected);
+        splitFields = cell(length(rangeLengths), length(fields));
+        for i = 1:length(fields)
+            splitFields(:, i) = splitRows(selected.(fields{i}), rangeLengths, rowDimension);
+        end
+        split = cell(length(rangeLengths), 1);
+        for iRange = 1:length(rangeLengths)
+            split{iRange} = cell2struct(splitFields(iRange, :), fields, 2);
+        end
+        return;
+    end
+
+    if istable(selected)
+        rangeStarts = cumsum([1; reshape(rangeLengths(1:end-1), [], 1)]);
+        split = arrayfun(@(start, len) selected(start:(start + len - 1), :), ...
+            rangeStarts, reshape(rangeLengths, [], 1), 'UniformOutput', false);
+        return;
+    end
+
+    dimensionSizes = size(selected);
+    dimensionSizes(end+1:rowDimension) = 1;
+    dimensionSizes = num2cell(dimensionSizes);
+    dimensionSizes{rowDimension} = reshape(rangeLengths, 1, []);
+    split = reshape(mat2cell(selected, dimensionSizes{:}), [], 1);
+end
@@ -0,0 +1,18 @@
+function rv = validateColumnValue(TypeStruct, rv, rowName)
+% validateColumnValue - Validate a row value against the type of its column.
+%
+% TypeStruct is an entry of types.util.dynamictable.getTypeMap. Returns the
+% value converted to the column type.
+
+    if strcmp(TypeStruct.type, 'cellstr')
+        assert(iscellstr(rv) || (ischar(rv) && (isempty(rv) || 1 == size(rv, 1))),...
+            'NWB:DynamicTable:AddRow:InvalidType',...
+            'Type of value must be a cell array of character vectors or a scalar character');
+    elseif iscell(rv)
+        for iVal = 1:length(rv)
+            types.util.dynamictable.internal.validateColumnValue(TypeStruct, rv{iVal}, rowName);
+        end
+    else
+        rv = types.util.checkDtype(rowName, TypeStruct.type, rv);
+    end
+end
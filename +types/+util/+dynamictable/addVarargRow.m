@@ -55,7 +55,7 @@ function addVarargRow(DynamicTable, varargin)
         rv = p.Results.(rn);
 
         if isKey(TypeMap, rn)
-            rv = validateType(TypeMap(rn), rv, rn);
+            rv = types.util.dynamictable.internal.validateColumnValue(TypeMap(rn), rv, rn);
         end
 
         types.util.dynamictable.addRawData(DynamicTable, rn, rv);
@@ -75,17 +75,3 @@ function addVarargRow(DynamicTable, varargin)
         DynamicTable.id.data = [double(DynamicTable.id.data); newId];
     end
 end
-
-function rv = validateType(TypeStruct, rv, rowName)
-    if strcmp(TypeStruct.type, 'cellstr')
-        assert(iscellstr(rv) || (ischar(rv) && (isempty(rv) || 1 == size(rv, 1))),...
-            'NWB:DynamicTable:AddRow:InvalidType',...
-            'Type of value must be a cell array of character vectors or a scalar character');
-    elseif iscell(rv)
-        for iVal = 1:length(rv)
-            validateType(TypeStruct, rv{iVal}, rowName);
-        end
-    else
-        rv = types.util.checkDtype(rowName, TypeStruct.type, rv);
-    end
-end
@@ -80,8 +80,9 @@ for i = 1:length(columns)
 end
 % append remaining columns to table
 % making the assumption that length of ids reflects table height
-matlabTable = [matlabTable DynamicTable.getRow( ...
-    1:length(ids), ...
+% each column is read in bulk with a columnar scan of all rows.
+matlabTable = [matlabTable types.util.dynamictable.scan( ...
+    DynamicTable, ...
     'columns', remainingColumns ...
 )];
 
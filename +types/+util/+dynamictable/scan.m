@@ -0,0 +1,119 @@
+function [result, rowIndices] = scan(DynamicTable, options)
+%SCAN read selected columns and rows of a DynamicTable column by column
+%   RESULT = SCAN(DYNAMICTABLE) reads all columns of DYNAMICTABLE,
+%   including its id column, into a MATLAB table.
+%
+%   [RESULT, ROWINDICES] = SCAN(DYNAMICTABLE, Name, Value) reads only the
+%   projected columns of the selected rows, and also returns the row
+%   indices (1-indexed) of the rows in RESULT. Available options:
+%
+%   'columns' - names of the columns to read, in order. 'id' refers to the
+%   id column. Default is the id column followed by all colnames.
+%
+%   'rows' - row indices (1-indexed) of the rows to read, e.g. a row range
+%   as 1001:2000. Default is all rows.
+%
+%   'where' - containers.Map object where the keys are column names and the
+%   values are tests. A function is evaluated on the column values and must
+%   return a logical vector with one value per row. Any other value is
+%   tested for equality. Only rows where all tests are true are read.
+%
+%   'asTable' - if false, RESULT is a struct with one field of column values
+%   per column instead of a MATLAB table. Default is true.
+%
+%   Every column is read with one bulk selection of all selected rows,
+%   instead of row by row. For ragged columns, the bounds of all rows are
+%   read at once from the VectorIndex, and the data of all rows is read
+%   with a single selection and split into one cell per row. The data of
+%   VectorIndex columns in a file is cached by the DynamicTable, so repeated
+%   scans of ragged columns do not read it again.
+%
+%   The tests of 'where' are applied one at a time, each only reading its
+%   column for the rows matching the previous tests. The projected columns
+%   are then read for the matching rows only.
+%
+% EXAMPLE
+% units = nwb.units;
+% [T, rows] = types.util.dynamictable.scan(units, ...
+%     'columns', {'id', 'spike_times'}, ...
+%     'where', containers.Map({'quality'}, {@(q) q > 0.9}));
+
+arguments
+    DynamicTable {matnwb.common.validation.mustBeDynamicTable}
+    options.columns
+    options.rows {mustBeNumeric, mustBeInteger, mustBePositive}
+    options.where containers.Map = containers.Map()
+    options.asTable (1,1) logical = true
+end
+
+tableHeight = types.util.dynamictable.internal.getTableHeight(DynamicTable);
+
+if isfield(options, 'columns')
+    columns = reshape(cellstr(options.columns), 1, []);
+else
+    columns = [{'id'}, reshape(cellstr(DynamicTable.colnames), 1, [])];
+end
+
+if isfield(options, 'rows')
+    rowIndices = reshape(double(options.rows), [], 1);
+    assert(all(rowIndices <= tableHeight), ...
+        'NWB:DynamicTable:Scan:RowOutOfBounds', ...
+        'Requested row index (%s) exceeds the DynamicTable height of %d.', ...
+        strjoin(compose('%d', rowIndices(rowIndices > tableHeight) ), ', '), tableHeight);
+else
+    rowIndices = (1:tableHeight)';
+end
+
+if isa(DynamicTable, 'matnwb.neurodata.DynamicTableBase')
+    indexLoader = @(Vector, indices) DynamicTable.getIndexValues(Vector, indices);
+else
+    indexLoader = [];
+end
+
+whereColumns = options.where.keys();
+for i = 1:length(whereColumns)
+    cn = whereColumns{i};
+    test = options.where(cn);
+    values = readColumn(DynamicTable, cn, rowIndices, indexLoader);
+    if isa(test, 'function_handle')
+        isMatch = test(values);
+    elseif iscellstr(values) && (ischar(test) || isstring(test))
+        isMatch = strcmp(values, test);
+    else
+        isMatch = values == test;
+    end
+    assert(numel(isMatch) == numel(rowIndices), ...
+        'NWB:DynamicTable:Scan:InvalidCondition', ...
+        'The test for column `%s` must return one logical value per row.', cn);
+    rowIndices = rowIndices(logical(isMatch(:)));
+end
+
+columnValues = cell(1, length(columns));
+for i = 1:length(columns)
+    columnValues{i} = readColumn(DynamicTable, columns{i}, rowIndices, indexLoader);
+end
+
+if ~options.asTable
+    result = cell2struct(columnValues, columns, 2);
+elseif isempty(columns)
+    result = table('Size', [numel(rowIndices), 0], 'VariableTypes', {}, 'VariableNames', {});
+else
+    result = table(columnValues{:}, 'VariableNames', columns);
+end
+end
+
+function values = readColumn(DynamicTable, columnName, rowIndices, indexLoader)
+indexNames = {columnName};
+while true
+    name = types.util.dynamictable.getIndex(DynamicTable, indexNames{end});
+    if isempty(name)
+        break;
+    end
+    indexNames{end+1} = name; %#ok<AGROW>
+end
+
+values = types.util.dynamictable.internal.selectColumn( ...
+    DynamicTable, indexNames, rowIndices, indexLoader);
+values = types.util.dynamictable.internal.formatColumnRows( ...
+    values, numel(rowIndices), columnName);
+end
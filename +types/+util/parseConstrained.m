@@ -28,6 +28,9 @@ function [set, ivarargin] = parseConstrained(obj, pname, type, varargin)
             elseif ~isempty(arg.target_type)
                 ikeys(i) = types.util.internal.isNameOfA(arg.target_type, type);
             end
+        elseif isa(arg, 'types.untyped.internal.LazyGroup')
+            % Placeholder for a group which is parsed on first access
+            ikeys(i) = types.util.internal.isNameOfA(arg.TypeName, type);
         else
             ikeys(i) = isa(arg, type);
         end
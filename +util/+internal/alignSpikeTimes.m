@@ -0,0 +1,76 @@
+function [unitIndices, eventIndices, relativeTimes] = alignSpikeTimes(spikeTimes, spikeCounts, eventTimes, beforeTime, afterTime)
+%ALIGNSPIKETIMES align the spike times of many units to many events
+%   [UNITINDICES, EVENTINDICES, RELATIVETIMES] = ALIGNSPIKETIMES(SPIKETIMES, SPIKECOUNTS, EVENTTIMES, BEFORETIME, AFTERTIME)
+%   aligns the spikes of every unit to every event. SPIKETIMES are the
+%   concatenated spike times of all units, with SPIKECOUNTS(u) spikes for
+%   unit u, as in a ragged spike_times column. A spike is included for an
+%   event if it is within BEFORETIME before to AFTERTIME after the event.
+%
+%   The result is columnar: for each included spike, UNITINDICES is the
+%   index of its unit in SPIKECOUNTS, EVENTINDICES the index of the event in
+%   EVENTTIMES and RELATIVETIMES its time relative to the event. Spikes are
+%   ordered by unit, then event, then time.
+%
+%   The first and last spike of every unit and event are found with a
+%   vectorized search of the sorted spike times of each unit, so the cost
+%   grows with the number of unit-event pairs and included spikes, rather
+%   than with the product of the number of events and spikes.
+
+% Upper bound for the number of unit-event pairs searched at once
+MAXNUMPAIRS = 2^22;
+
+spikeTimes = reshape(double(spikeTimes), [], 1);
+spikeCounts = reshape(double(spikeCounts), [], 1);
+eventTimes = reshape(double(eventTimes), [], 1);
+numUnits = length(spikeCounts);
+numEvents = length(eventTimes);
+assert(sum(spikeCounts) == length(spikeTimes), ...
+    'NWB:AlignSpikeTimes:InvalidSpikeCounts', ...
+    'Spike counts (%d spikes in total) do not match the number of spike times (%d).', ...
+    sum(spikeCounts), length(spikeTimes));
+
+firstSpikes = cumsum([1; spikeCounts(1:end-1)]);
+lastSpikes = firstSpikes + spikeCounts - 1;
+
+% spike times of a unit should be sorted, but sort them if they are not.
+unitOfSpike = repelem((1:numUnits)', spikeCounts);
+if any(diff(spikeTimes) < 0 & diff(unitOfSpike) == 0)
+    [~, spikeOrder] = sortrows([unitOfSpike, spikeTimes]);
+    spikeTimes = spikeTimes(spikeOrder);
+end
+
+unitIndices = cell(0, 1);
+eventIndices = cell(0, 1);
+relativeTimes = cell(0, 1);
+unitsPerBatch = max(1, floor(MAXNUMPAIRS / max(1, numEvents)));
+for iUnit = 1:unitsPerBatch:numUnits
+    batchUnits = iUnit:min(iUnit + unitsPerBatch - 1, numUnits);
+    % pairs are ordered by unit, then event.
+    [pairEvents, pairUnits] = ndgrid(1:numEvents, batchUnits);
+    pairEvents = pairEvents(:);
+    pairUnits = pairUnits(:);
+
+    startPositions = util.internal.searchSorted(spikeTimes, ...
+        eventTimes(pairEvents) - beforeTime, 'left', ...
+        firstSpikes(pairUnits), lastSpikes(pairUnits));
+    stopPositions = util.internal.searchSorted(spikeTimes, ...
+        eventTimes(pairEvents) + afterTime, 'right', ...
+        firstSpikes(pairUnits), lastSpikes(pairUnits));
+    pairCounts = stopPositions - startPositions;
+
+    isNonEmpty = pairCounts > 0;
+    pairCounts = pairCounts(isNonEmpty);
+    % positions of the spikes of every pair, which are consecutive runs
+    runOffsets = repelem(startPositions(isNonEmpty) - cumsum([0; pairCounts(1:end-1)]) - 1, ...
+        pairCounts);
+    spikePositions = (1:sum(pairCounts))' + runOffsets;
+
+    unitIndices{end+1, 1} = repelem(pairUnits(isNonEmpty), pairCounts); %#ok<AGROW>
+    eventIndices{end+1, 1} = repelem(pairEvents(isNonEmpty), pairCounts); %#ok<AGROW>
+    relativeTimes{end+1, 1} = spikeTimes(spikePositions) - eventTimes(eventIndices{end}); %#ok<AGROW>
+end
+
+unitIndices = vertcat(zeros(0, 1), unitIndices{:});
+eventIndices = vertcat(zeros(0, 1), eventIndices{:});
+relativeTimes = vertcat(zeros(0, 1), relativeTimes{:});
+end
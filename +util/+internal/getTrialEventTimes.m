@@ -0,0 +1,40 @@
+function [eventTimes, trialIndices] = getTrialEventTimes(trials, align_to, conditions)
+%GETTRIALEVENTTIMES get the event times of the trials matching conditions
+%   [EVENTTIMES, TRIALINDICES] = GETTRIALEVENTTIMES(TRIALS, ALIGN_TO, CONDITIONS)
+%   are the values of the column ALIGN_TO of the TRIALS table for the
+%   trials where all CONDITIONS hold, and the row indices (1-indexed) of
+%   these trials. CONDITIONS is a containers.Map object where the keys are
+%   column names and the values are tests. A function value is evaluated on
+%   the column, any other value is tested for equality.
+
+eventTimes = reshape(getColumnData(trials, align_to), [], 1);
+
+trials_to_take = true(length(eventTimes), 1);
+keys = conditions.keys;
+for i = 1:length(keys)
+    key = keys{i};
+    val = conditions(key);
+    columnData = reshape(getColumnData(trials, key), [], 1);
+    if isa(val, 'function_handle')
+        trials_to_take = val(columnData) & trials_to_take;
+    else
+        trials_to_take = (columnData == val) & trials_to_take;
+    end
+end
+
+trialIndices = find(trials_to_take);
+eventTimes = eventTimes(trialIndices);
+end
+
+function data = getColumnData(trials, name)
+if strcmp(name, 'start_time')
+    data = trials.start_time.data;
+elseif strcmp(name, 'stop_time')
+    data = trials.stop_time.data;
+else
+    data = trials.vectordata.get(name).data;
+end
+if isa(data, 'types.untyped.DataStub')
+    data = data.load();
+end
+end
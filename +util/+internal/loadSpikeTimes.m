@@ -0,0 +1,42 @@
+function [spikeTimes, spikeCounts] = loadSpikeTimes(units, unitRows)
+%LOADSPIKETIMES load the spike times of many units at once
+%   [SPIKETIMES, SPIKECOUNTS] = LOADSPIKETIMES(UNITS, UNITROWS) are the
+%   concatenated spike times of the rows UNITROWS (1-indexed) of the UNITS
+%   table, with SPIKECOUNTS(i) spike times for UNITROWS(i). UNITROWS is []
+%   for all units.
+%
+%   The spike_times_index column is loaded once, and the spike times of all
+%   requested units are read with a single selection.
+
+indexEnds = reshape(double(loadColumnData(units.spike_times_index.data)), [], 1);
+if isempty(unitRows)
+    unitRows = 1:length(indexEnds);
+end
+unitRows = reshape(unitRows, [], 1);
+assert(all(unitRows >= 1 & unitRows <= length(indexEnds) & unitRows == floor(unitRows)), ...
+    'NWB:LoadSpikeTimes:InvalidUnit', ...
+    'Units must be row indices between 1 and %d.', length(indexEnds));
+
+indexStarts = [0; indexEnds(1:end-1)] + 1;
+spikeCounts = indexEnds(unitRows) - indexStarts(unitRows) + 1;
+
+spikeData = units.spike_times.data;
+if isequal(unitRows, (1:length(indexEnds))')
+    spikeTimes = loadColumnData(spikeData);
+else
+    spikePositions = (1:sum(spikeCounts))' + repelem( ...
+        indexStarts(unitRows) - cumsum([0; spikeCounts(1:end-1)]) - 1, spikeCounts);
+    if isa(spikeData, 'types.untyped.DataStub')
+        spikeTimes = spikeData.load_mat_style(spikePositions);
+    else
+        spikeTimes = spikeData(spikePositions);
+    end
+end
+spikeTimes = reshape(double(spikeTimes), [], 1);
+end
+
+function data = loadColumnData(data)
+if isa(data, 'types.untyped.DataStub')
+    data = data.load();
+end
+end
@@ -0,0 +1,133 @@
+function D = loadTimeSeriesWindows(timeseries, window, times, downsample_factor, electrodes)
+%LOADTIMESERIESWINDOWS load time series data in many windows at once
+%   D = LOADTIMESERIESWINDOWS(TIMESERIES, WINDOW, TIMES, DOWNSAMPLE_FACTOR, ELECTRODES)
+%   is the data for TIMESERIES in the intervals WINDOW + TIMES(i), in
+%   seconds, of shape windows x electrodes x time. Every DOWNSAMPLE_FACTOR
+%   sample is taken, starting at the first sample of each window. ELECTRODES
+%   is a list of electrodes (1-indexed), or [] for all electrodes.
+%
+%   The first sample of every window is found at once, from the starting
+%   time and rate of TIMESERIES or with a vectorized search of its
+%   timestamps. The windows are then read in time order, in batches of
+%   consecutive windows. Each batch is read with a single selection which
+%   is the union of the samples of its windows (one hyperslab per window),
+%   and the samples are scattered into D. Overlapping windows read their
+%   shared samples only once.
+%
+%   For time series with a starting time and rate, the windows start at the
+%   same samples as with util.loadTimeSeriesData, and an error
+%   NWB:LoadTimeSeries:InvalidTimeInterval is raised if a window extends
+%   beyond the data. For time series with timestamps, windows hold the
+%   samples with timestamps within the interval, samples of windows which
+%   extend beyond the data are NaN, and the time dimension of D is that of
+%   the longest window.
+
+% Upper bound for the number of elements read with a single selection
+MAXBATCHNUMEL = 2^25;
+
+times = reshape(double(times), [], 1);
+numWindows = length(times);
+
+dataDimensions = getDataDimensions(timeseries.data);
+assert(length(dataDimensions) <= 2, 'NWB:LoadTimeSeries:UnsupportedDimensions', ...
+    'loading windows of data with more than two dimensions is not supported');
+numTimePoints = dataDimensions(end);
+if isempty(electrodes)
+    electrodeSelection = ':';
+    if isscalar(dataDimensions)
+        numElectrodes = 1;
+    else
+        numElectrodes = dataDimensions(1);
+    end
+else
+    electrodeSelection = reshape(electrodes, 1, []);
+    numElectrodes = length(electrodes);
+end
+
+if isempty(timeseries.starting_time)
+    startIndices = util.internal.searchSorted( ...
+        timeseries.timestamps, times + window(1), 'left');
+    stopIndices = util.internal.searchSorted( ...
+        timeseries.timestamps, times + window(2), 'right') - 1;
+    sampleCounts = max(floor((stopIndices - startIndices) / downsample_factor) + 1, 0);
+    numSamples = max([0; sampleCounts]);
+else
+    fs = timeseries.starting_time_rate;
+    t0 = timeseries.starting_time;
+    % Same start index as util.loadTimeSeriesData
+    windowStarts = times + window(1);
+    startIndices = round((windowStarts - t0) * fs) + 1;
+    numSamples = round(diff(window) * fs / downsample_factor);
+    sampleCounts = repmat(numSamples, numWindows, 1);
+    stopIndices = startIndices + (numSamples - 1) * downsample_factor;
+    if any(windowStarts < t0) || any(startIndices < 1) ...
+            || any(stopIndices > numTimePoints)
+        error('NWB:LoadTimeSeries:InvalidTimeInterval', ...
+            'interval bounds outside of time range');
+    end
+end
+
+D = NaN(numWindows, numElectrodes, numSamples);
+if numWindows == 0 || numSamples == 0
+    return;
+end
+
+sampleOffsets = (0:numSamples-1) * downsample_factor;
+sampleIndices = startIndices + sampleOffsets;
+isValid = sampleIndices >= 1 & sampleIndices <= numTimePoints ...
+    & (0:numSamples-1) < sampleCounts;
+
+% windows sorted by start read neighbouring chunks in the same batch.
+[~, windowOrder] = sort(startIndices);
+windowsPerBatch = max(1, floor(MAXBATCHNUMEL / (numElectrodes * numSamples)));
+for iBatch = 1:windowsPerBatch:numWindows
+    batchWindows = windowOrder(iBatch:min(iBatch + windowsPerBatch - 1, numWindows));
+    batchIndices = sampleIndices(batchWindows, :);
+    batchIsValid = isValid(batchWindows, :);
+    [readIndices, ~, location] = unique(batchIndices(batchIsValid));
+    if isempty(readIndices)
+        continue;
+    end
+
+    values = double(readSamples(timeseries.data, electrodeSelection, ...
+        reshape(readIndices, 1, []), isscalar(dataDimensions)));
+    % the last column is for samples outside of the data.
+    values(:, end + 1) = NaN;
+    columns = repmat(size(values, 2), size(batchIndices));
+    columns(batchIsValid) = location;
+
+    batchData = reshape(values(:, columns(:)), ...
+        numElectrodes, length(batchWindows), numSamples);
+    D(batchWindows, :, :) = permute(batchData, [2 1 3]);
+end
+
+D = D * double(timeseries.data_conversion);
+end
+
+function dataDimensions = getDataDimensions(data)
+if isa(data, 'types.untyped.DataStub')
+    dataDimensions = data.dims;
+elseif isvector(data)
+    dataDimensions = numel(data);
+else
+    dataDimensions = size(data);
+end
+end
+
+function values = readSamples(data, electrodeSelection, sampleIndices, isSingleChannel)
+if isSingleChannel
+    if isa(data, 'types.untyped.DataStub')
+        values = data.load_mat_style(sampleIndices);
+    else
+        values = data(sampleIndices);
+    end
+    values = reshape(values, 1, []);
+    if ~ischar(electrodeSelection)
+        values = repmat(values, length(electrodeSelection), 1);
+    end
+elseif isa(data, 'types.untyped.DataStub')
+    values = data.load_mat_style(electrodeSelection, sampleIndices);
+else
+    values = data(electrodeSelection, sampleIndices);
+end
+end
@@ -0,0 +1,70 @@
+function indices = searchSorted(sortedValues, targets, side, first, last)
+%SEARCHSORTED find insertion indices of targets in sorted values
+%   INDICES = SEARCHSORTED(SORTEDVALUES, TARGETS) is, for each element of
+%   TARGETS, the index of the first element of SORTEDVALUES which is
+%   greater than or equal to the target. SORTEDVALUES is a vector sorted in
+%   ascending order, either numeric or a DataStub. INDICES has the size of
+%   TARGETS, and is length(SORTEDVALUES) + 1 for targets greater than all
+%   values.
+%
+%   INDICES = SEARCHSORTED(SORTEDVALUES, TARGETS, SIDE) where SIDE is
+%   'left' (default) or 'right'. With 'right', INDICES is the index of the
+%   first element which is strictly greater than the target, such that
+%   INDICES - 1 is the last element less than or equal to the target.
+%
+%   INDICES = SEARCHSORTED(SORTEDVALUES, TARGETS, SIDE, FIRST, LAST) searches
+%   each target only in SORTEDVALUES(FIRST:LAST), where FIRST and LAST are
+%   scalars or arrays of the size of TARGETS. Only these ranges need to be
+%   sorted, e.g. the ranges of the units of a ragged column. INDICES is
+%   LAST + 1 for targets greater than all values of their range.
+%
+%   All targets are searched at once with a vectorized bisection. For a
+%   DataStub, each bisection step reads the probed values of all targets
+%   with a single selection, so only log2(length(SORTEDVALUES)) reads are
+%   made regardless of the number of targets.
+
+if ~exist('side', 'var') || isempty(side)
+    side = 'left';
+end
+side = validatestring(side, {'left', 'right'});
+
+if isa(sortedValues, 'types.untyped.DataStub')
+    numValues = prod(sortedValues.dims);
+    readValues = @(ind) reshape(sortedValues.load_mat_style(ind), [], 1);
+else
+    numValues = numel(sortedValues);
+    readValues = @(ind) reshape(sortedValues(ind), [], 1);
+end
+
+targetSize = size(targets);
+targets = reshape(double(targets), [], 1);
+if ~exist('first', 'var') || isempty(first)
+    first = 1;
+end
+if ~exist('last', 'var') || isempty(last)
+    last = numValues;
+end
+lowerBound = reshape(double(first), [], 1) .* ones(numel(targets), 1);
+upperBound = reshape(double(last) + 1, [], 1) .* ones(numel(targets), 1);
+
+isActive = lowerBound < upperBound;
+while any(isActive)
+    middle = floor((lowerBound(isActive) + upperBound(isActive)) / 2);
+    [probeIndices, ~, probeOrder] = unique(middle);
+    probedValues = double(readValues(probeIndices));
+    probedValues = probedValues(probeOrder);
+
+    if strcmp(side, 'left')
+        isBelow = probedValues < targets(isActive);
+    else
+        isBelow = probedValues <= targets(isActive);
+    end
+
+    activeIndices = find(isActive);
+    lowerBound(activeIndices(isBelow)) = middle(isBelow) + 1;
+    upperBound(activeIndices(~isBelow)) = middle(~isBelow);
+    isActive = lowerBound < upperBound;
+end
+
+indices = reshape(lowerBound, targetSize);
+end
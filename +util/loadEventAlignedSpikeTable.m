@@ -0,0 +1,48 @@
+function ST = loadEventAlignedSpikeTable(nwb, event_times, varargin)
+%LOADEVENTALIGNEDSPIKETABLE loads event-aligned spike times of many units
+%   ST = LOADEVENTALIGNEDSPIKETABLE(NWB, EVENT_TIMES) returns the spike
+%   times of all units in the NWB.units table relative to every timestamp
+%   in the EVENT_TIMES array. ST is a table with one row per aligned spike
+%   and the variables:
+%   'unit' - row index (1-indexed) of the unit in NWB.units.
+%   'trial' - index of the event in EVENT_TIMES.
+%   'time' - spike time, in seconds, relative to the event.
+%   Rows are ordered by unit, then event, then time.
+%
+%   The spike_times column and its index are read once for all units, and
+%   spikes are aligned to all events with a vectorized search, see
+%   util.loadEventAlignedSpikeTimes for the spike times of a single unit
+%   as a cell array.
+%   OPTIONAL KEYWORD ARGUMENTS
+%   'units' - row indices (1-indexed) of the units to align. Default is []
+%   for all units.
+%   'before_time' - specifies the time, in seconds, before the event for
+%   the inclusion of spike times. Defaults to 1.
+%   'after_time' - specifies the time, in seconds, after the event for
+%   the inclusion of spike times. Defaults to 1.
+
+% Define anonymous functions to check input
+validNWB = @(x) isa(x,'types.core.NWBFile');
+validUnits = @(x) isempty(x) || (isnumeric(x) && isvector(x));
+validTime = @(x) isnumeric(x) && all(x>=0);
+% Define parser with arguments
+p = inputParser;
+addRequired(p, 'nwb', validNWB);
+addRequired(p, 'event_times', validTime);
+addParameter(p, 'units', [], validUnits);
+addParameter(p, 'before_time', 1., validTime);
+addParameter(p, 'after_time', 1., validTime);
+% Parse and unpack key-value pairs
+parse(p, nwb, event_times, varargin{:});
+
+unitRows = p.Results.units;
+[spikeTimes, spikeCounts] = util.internal.loadSpikeTimes(nwb.units, unitRows);
+[unitIndices, eventIndices, relativeTimes] = util.internal.alignSpikeTimes( ...
+    spikeTimes, spikeCounts, event_times, ...
+    p.Results.before_time, p.Results.after_time);
+
+if ~isempty(unitRows)
+    unitIndices = reshape(unitRows(unitIndices), [], 1);
+end
+ST = table(unitIndices, eventIndices, relativeTimes, ...
+    'VariableNames', {'unit', 'trial', 'time'});
@@ -27,16 +27,9 @@ parse(p, nwb, unit_id, event_times, varargin{:});
 before_time = p.Results.before_time; 
 after_time = p.Results.after_time; 
 % Fetch spike times for indicated unit
-spike_times = nwb.units.getRow( ...
-    unit_id, ...
-    'columns', {'spike_times'} ...
-).spike_times{1}; % need to unpack from returned MATLAB table
+[spike_times, spike_count] = util.internal.loadSpikeTimes(nwb.units, unit_id);
 % Get spike times within window around indicated event timestamps
-ST = cell(length(event_times),1);
-for i = 1:length(event_times)
-    ref_time = event_times(i);
-    ST{i} = spike_times(...
-                       spike_times >= ref_time - before_time & ...
-                       spike_times <= ref_time + after_time) - ...
-                       ref_time;
-end
\ No newline at end of file
+[~, event_index, relative_times] = util.internal.alignSpikeTimes( ...
+    spike_times, spike_count, event_times, before_time, after_time);
+ST = mat2cell(relative_times, ...
+    accumarray(event_index, 1, [length(event_times) 1]), 1);
@@ -12,6 +12,10 @@ function D = loadEventAlignedTimeSeriesData(timeseries, window, times, downsampl
 %
 %   []  - all electrodes
 %   [ints] - list of electrodes (1-indexed)
+%
+%   All windows are located and read together, with one selection per
+%   batch of windows instead of one read per event. Each window holds the
+%   same samples as util.loadTimeSeriesData for that window.
 
 if ~exist('downsample_factor','var') || isempty(downsample_factor)
     downsample_factor = 1;
@@ -21,21 +25,5 @@ if ~exist('electrodes','var')
     electrodes = [];
 end
 
-fs = timeseries.starting_time_rate;
-inds_len = diff(window) * fs / downsample_factor;
-
-dims = timeseries.data.dims;
-
-if isempty(electrodes)
-    D = NaN(length(times), dims(1), int16(inds_len));
-    for i = 1:length(times)
-        D(i,:,:) = util.loadTimeSeriesData(timeseries, window + times(i), ...
-            downsample_factor, electrodes);
-    end
-else
-    D = NaN(length(times), length(electrodes), inds_len);
-    for i = 1:length(times)
-        D(i,:,:) = reshape(util.loadTimeSeriesData(timeseries, window + times(i), ...
-            downsample_factor, electrodes)', [1 length(electrodes) inds_len]);
-    end
-end
+D = util.internal.loadTimeSeriesWindows(timeseries, window, times, ...
+    downsample_factor, electrodes);
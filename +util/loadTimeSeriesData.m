@@ -51,7 +51,8 @@ else
                 error('NWB:LoadTimeSeries:InvalidTimeInterval', ...
                     'interval bounds outside of time range');
             end
-            start_ind = (interval(1) - t0) * fs;
+            % sample i is recorded at t0 + (i - 1) / fs
+            start_ind = round((interval(1) - t0) * fs) + 1;
         end
     else
         start_ind = 1;
@@ -68,7 +69,7 @@ else
                 error('NWB:LoadTimeSeries:InvalidTimeInterval', ...
                     'interval bounds outside of time range');
             end
-            end_ind = (interval(2) - t0) * fs;
+            end_ind = round((interval(2) - t0) * fs) + 1;
         end
     else
         end_ind = Inf;
@@ -0,0 +1,52 @@
+function ST = loadTrialAlignedSpikeTable(nwb, varargin)
+%LOADTRIALALIGNEDSPIKETABLE loads trial-aligned spike times of many units
+%   ST = LOADTRIALALIGNEDSPIKETABLE(NWB) returns the spike times of all
+%   units in the NWB.units table relative to the start of every trial in
+%   the NWB.intervals_trials table. ST is a table with one row per aligned
+%   spike and the variables:
+%   'unit' - row index (1-indexed) of the unit in NWB.units.
+%   'trial' - row index (1-indexed) of the trial in NWB.intervals_trials.
+%   'time' - spike time, in seconds, relative to the trial event.
+%   Rows are ordered by unit, then trial, then time.
+%
+%   See util.loadEventAlignedSpikeTable.
+%   OPTIONAL KEYWORD ARGUMENTS
+%   'units' - row indices (1-indexed) of the units to align. Default is []
+%   for all units.
+%   'before_time' - specifies the time, in seconds, before the event for
+%   the inclusion of spike times. Defaults to 1.
+%   'after_time' - specifies the time, in seconds, after the event for
+%   the inclusion of spike times. Defaults to 1.
+%   'align_to' - specified the column containing event timestamps to which
+%   to align spike times. Default is 'start_time'.
+%   'conditions' - containers.Map object where the keys are the column names and
+%   the values are the tests. A function can be entered for the value here, and
+%   Only columns where the function evaluates as true will be used. If a
+%   non-funcion is entered, an equality test is used. Default is an empty
+%   container.Map object.
+
+% Define anonymous functions to check input
+validNWB = @(x) isa(x,'types.core.NWBFile');
+validUnits = @(x) isempty(x) || (isnumeric(x) && isvector(x));
+validTime = @(x) isnumeric(x) && isscalar(x) && (x>=0);
+validAlign = @(x) ischar(x);
+validCond = @(x) isa(x,'containers.Map');
+% Define parser with arguments
+p = inputParser;
+addRequired(p, 'nwb', validNWB);
+addParameter(p, 'units', [], validUnits);
+addParameter(p, 'before_time', 1., validTime);
+addParameter(p, 'after_time', 1., validTime);
+addParameter(p, 'align_to', 'start_time', validAlign);
+addParameter(p, 'conditions', containers.Map(), validCond);
+% Parse and unpack key-value pairs
+parse(p, nwb, varargin{:});
+
+[ref_event_times, trialIndices] = util.internal.getTrialEventTimes( ...
+    nwb.intervals_trials, p.Results.align_to, p.Results.conditions);
+
+ST = util.loadEventAlignedSpikeTable(nwb, ref_event_times, ...
+    'units', p.Results.units, ...
+    'before_time', p.Results.before_time, ...
+    'after_time', p.Results.after_time);
+ST.trial = reshape(trialIndices(ST.trial), [], 1);
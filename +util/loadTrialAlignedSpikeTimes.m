@@ -35,36 +35,10 @@ addOptional(p, 'conditions', containers.Map(), validCond);
 parse(p, nwb, unit_id,varargin{:});
 align_to = p.Results.align_to;
 conditions = p.Results.conditions;
-% Get list of reference event timestamps
-if strcmp(align_to, 'start_time')
-    ref_event_times = nwb.intervals_trials.start_time.data.load;
-elseif strcmp(align_to, 'stop_time')
-    ref_event_times = nwb.intervals_trials.stop_time.data.load;
-else
-    ref_event_times = nwb.intervals_trials.vectordata.get(align_to).data.load;
-end
-% Select subset of trials based on conditions
-trials_to_take = true(length(ref_event_times),1);
-trials = nwb.intervals_trials;
-keys = conditions.keys;
-for i = 1:length(keys)
-    key = keys{i};
-    val = conditions(key);
-    if strcmp(key, 'start_time')
-        col = trials.start_time;
-    elseif strcmp(key, 'stop_time')
-        col = trials.stop_time;
-    else
-        col = trials.vectordata.get(key);
-    end
-
-    if isa(val, 'function_handle')
-        trials_to_take = val(col.data.load) & trials_to_take;
-    else
-        trials_to_take = (col.data.load == val) & trials_to_take;
-    end
-end
-ref_event_times = ref_event_times(trials_to_take);
+% Get list of reference event timestamps for the subset of trials based
+% on conditions
+ref_event_times = util.internal.getTrialEventTimes( ...
+    nwb.intervals_trials, align_to, conditions);
 % Call event-aligned spike times utility function
 ST = util.loadEventAlignedSpikeTimes(nwb, unit_id, ref_event_times, ...
     'before_time', p.Results.before_time, ...
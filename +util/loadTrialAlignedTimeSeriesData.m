@@ -21,6 +21,9 @@ function [D, tt] = loadTrialAlignedTimeSeriesData(nwb, timeseries, window, align
 %
 %   []  - all electrodes
 %   [ints] - list of electrodes (1-indexed)
+%
+%   The windows of all selected trials are loaded together, see
+%   util.loadEventAlignedTimeSeriesData.
 
 if ~exist('downsample_factor', 'var') || isempty(downsample_factor)
     downsample_factor = 1;
@@ -41,7 +44,10 @@ if strcmp(align_to, 'start_time')
 elseif strcmp(align_to, 'stop_time')
     times = trials.stop_time.data.load;
 else
-    times = trials.vectordata.get(align_to);
+    times = trials.vectordata.get(align_to).data;
+    if isa(times, 'types.untyped.DataStub')
+        times = times.load();
+    end
 end
 
 trials_to_take = true(length(times),1);
@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+Generate a catalog of the NWB schema versions bundled with MatNWB.
+
+The catalog (resources/nwb_schema_catalog.json) lists, for every version
+folder in nwb-schema/, the namespaces with their versions and dependencies,
+the neurodata types of each namespace with their parent types, and a SHA-256
+hash of every schema file. Consumers (the schema version badge, the docs and
+MATLAB's schema version checks) read this file instead of rescanning and
+re-parsing the schema tree.
+
+Run this script whenever a schema version is added or updated:
+
+    python .github/workflows/scripts/create_nwb_schema_catalog.py
+
+Use --check to verify that the catalog is up to date.
+"""
+
+import argparse
+import hashlib
+import json
+import re
+import sys
+from pathlib import Path
+
+import yaml
+
+CATALOG_FORMAT_VERSION = 1
+VERSION_PATTERN = re.compile(r'^\d+\.\d+\.\d+$')
+
+
+def version_key(version: str) -> tuple[int, ...]:
+    return tuple(map(int, version.split('.')))
+
+
+def list_schema_versions(schema_dir: Path) -> list[str]:
+    """Return the version folder names in schema_dir, sorted semantically."""
+    versions = [item.name for item in schema_dir.iterdir()
+                if item.is_dir() and VERSION_PATTERN.match(item.name)]
+    if not versions:
+        raise ValueError(f"No valid version folders found in {schema_dir}")
+    return sorted(versions, key=version_key)
+
+
+def hash_file(path: Path) -> str:
+    return hashlib.sha256(path.read_bytes()).hexdigest()
+
+
+def collect_types(spec: dict, types: dict) -> None:
+    """Add the types defined in a group or dataset spec (recursively) to types."""
+    type_def = spec.get('neurodata_type_def') or spec.get('data_type_def')
+    if type_def:
+        types[type_def] = spec.get('neurodata_type_inc') or spec.get('data_type_inc')
+    for key in ('groups', 'datasets'):
+        for subspec in spec.get(key) or []:
+            collect_types(subspec, types)
+
+
+def describe_namespace(namespace: dict, namespace_file: Path, version_dir: Path) -> dict:
+    dependencies = []
+    sources = []
+    types = {}
+    for item in namespace.get('schema', []):
+        if 'namespace' in item:
+            dependencies.append(item['namespace'])
+        elif 'source' in item:
+            source_path = namespace_file.parent / item['source']
+            sources.append(source_path.relative_to(version_dir).as_posix())
+            with open(source_path, encoding='utf-8') as f:
+                collect_types(yaml.safe_load(f) or {}, types)
+    return {
+        'name': namespace['name'],
+        'version': str(namespace.get('version', '')),
+        'file': namespace_file.relative_to(version_dir).as_posix(),
+        'dependencies': dependencies,
+        'sources': sources,
+        'types': types,
+    }
+
+
+def describe_schema_version(version_dir: Path) -> dict:
+    namespaces = []
+    for namespace_file in sorted(version_dir.rglob('*namespace.yaml')):
+        with open(namespace_file, encoding='utf-8') as f:
+            content = yaml.safe_load(f)
+        for namespace in content.get('namespaces', []):
+            namespaces.append(describe_namespace(namespace, namespace_file, version_dir))
+
+    files = [{'path': path.relative_to(version_dir).as_posix(), 'sha256': hash_file(path)}
+             for path in sorted(version_dir.rglob('*.yaml'))]
+    return {'version': version_dir.name, 'namespaces': namespaces, 'files': files}
+
+
+def create_catalog(schema_dir: Path) -> dict:
+    versions = list_schema_versions(schema_dir)
+    return {
+        'format_version': CATALOG_FORMAT_VERSION,
+        'versions': versions,
+        'latest': versions[-1],
+        'schemas': [describe_schema_version(schema_dir / version) for version in versions],
+    }
+
+
+def format_catalog(catalog: dict) -> str:
+    return json.dumps(catalog, indent=1) + '\n'
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Generate a catalog of the bundled NWB schema versions.'
+    )
+    parser.add_argument(
+        '--schema-dir',
+        type=Path,
+        default=None,
+        help='Path to the nwb-schema directory (default: auto-detect from script location)'
+    )
+    parser.add_argument(
+        '--output',
+        type=Path,
+        default=None,
+        help='Catalog file (default: resources/nwb_schema_catalog.json)'
+    )
+    parser.add_argument(
+        '--check',
+        action='store_true',
+        help='Do not write the catalog, but exit with an error if it is out of date'
+    )
+
+    args = parser.parse_args()
+
+    # Determine the repository root (three levels up from this script)
+    script_dir = Path(__file__).resolve().parent
+    repo_root = script_dir.parent.parent.parent
+
+    schema_dir = args.schema_dir or repo_root / 'nwb-schema'
+    if not schema_dir.exists():
+        raise FileNotFoundError(f"Schema directory not found: {schema_dir}")
+    output = args.output or repo_root / 'resources' / 'nwb_schema_catalog.json'
+
+    text = format_catalog(create_catalog(schema_dir))
+    if args.check:
+        if not output.exists() or output.read_text(encoding='utf-8') != text:
+            print(f"Schema catalog {output} is out of date. "
+                  f"Run {Path(__file__).name} to update it.", file=sys.stderr)
+            sys.exit(1)
+        print(f"Schema catalog is up to date: {output}")
+        return
+
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(text, encoding='utf-8')
+    print(f"Schema catalog created: {output}")
+
+
+if __name__ == '__main__':
+    main()
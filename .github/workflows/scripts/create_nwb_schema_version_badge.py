@@ -2,6 +2,7 @@
 """Generate a badge showing the supported NWB schema version range."""
 
 import argparse
+import json
 import re
 from pathlib import Path
 
@@ -34,6 +35,27 @@ def get_schema_version_range(schema_dir: Path) -> tuple[str, str]:
     return versions[0], versions[-1]
 
 
+def get_schema_version_range_from_catalog(catalog_path: Path) -> tuple[str, str]:
+    """
+    Determine the minimum and maximum schema versions from the schema catalog
+    (see create_nwb_schema_catalog.py).
+
+    Args:
+        catalog_path: Path to the schema catalog file.
+
+    Returns:
+        A tuple of (min_version, max_version) strings.
+    """
+    with open(catalog_path, encoding='utf-8') as f:
+        versions = json.load(f)['versions']
+
+    if not versions:
+        raise ValueError(f"No schema versions listed in {catalog_path}")
+
+    # Versions are listed in ascending order
+    return versions[0], versions[-1]
+
+
 def create_badge(version: str, min_schema: str, max_schema: str, output_dir: Path) -> None:
     """
     Create and save the NWB schema version badge.
@@ -74,6 +96,13 @@ def main():
         default=None,
         help='Path to the nwb-schema directory (default: auto-detect from script location)'
     )
+    parser.add_argument(
+        '--catalog',
+        type=Path,
+        default=None,
+        help='Path to the schema catalog (default: resources/nwb_schema_catalog.json). '
+             'If the catalog does not exist, the schema directory is scanned instead.'
+    )
     parser.add_argument(
         '--output-dir',
         type=Path,
@@ -87,9 +116,10 @@ def main():
     script_dir = Path(__file__).resolve().parent
     repo_root = script_dir.parent.parent.parent
     
-    # Set default schema directory
+    # Set default schema directory and catalog
     schema_dir = args.schema_dir or repo_root / 'nwb-schema'
-    if not schema_dir.exists():
+    catalog_path = args.catalog or repo_root / 'resources' / 'nwb_schema_catalog.json'
+    if not catalog_path.exists() and not schema_dir.exists():
         raise FileNotFoundError(f"Schema directory not found: {schema_dir}")
     
     # Set default output directory
@@ -97,7 +127,10 @@ def main():
     latest_dir = repo_root / '.github' / 'badges' / 'latest'
     
     # Get version range and create badge
-    min_schema, max_schema = get_schema_version_range(schema_dir)
+    if catalog_path.exists() and args.schema_dir is None:
+        min_schema, max_schema = get_schema_version_range_from_catalog(catalog_path)
+    else:
+        min_schema, max_schema = get_schema_version_range(schema_dir)
     create_badge(args.version, min_schema, max_schema, output_dir)
     create_badge(args.version, min_schema, max_schema, latest_dir)
 
@@ -66,6 +66,12 @@ classdef NwbFile < types.core.NWBFile
                 obj.timestamps_reference_time = obj.session_start_time;
             end
 
+            if mode == "overwrite"
+                % Groups which are not loaded yet must be read before the
+                % file is truncated, in case it is the file being overwritten.
+                obj.loadLazyGroups()
+            end
+
             writer = io.backend.BackendFactory.createWriter(filename, ...
                 Mode=mode, StorageBackend=options.StorageBackend);
 
@@ -342,6 +348,12 @@ classdef NwbFile < types.core.NWBFile
 
     %% PRIVATE
     methods(Access=private)
+        function loadLazyGroups(obj)
+        % loadLazyGroups - Load all groups of a file read with LazyLoadGroups.
+        % searchFor gets every entry of every Set, which loads the entry.
+            obj.searchFor('types.untyped.internal.LazyGroup');
+        end
+
         function addWasGeneratedBy(obj)
             if isprop(obj, 'general_was_generated_by')
                 if isa(obj.general_was_generated_by, 'types.untyped.DataStub')
@@ -13,7 +13,12 @@ from datetime import datetime
 
 sys.path.append('sphinx_extensions')
 from docstring_processors import process_matlab_docstring
+from docstring_cache import (record_source_hashes, skip_unchanged_documents,
+                             purge_source_hashes, merge_source_hashes)
+from parallel_build import enable_parallel_matlab_domain
+from build_profiler import enable_build_profiler
 from custom_roles import MatClassRole, register_matlab_types, register_type_short_names
+from _util import refresh_type_index, load_schema_catalog
 
 from copy_files import copy_files
 
@@ -21,9 +26,21 @@ copy_files() # Override internal linkcode module to correctly link matlab source
 
 def setup(app):
     app.connect("autodoc-process-docstring", process_matlab_docstring)
-    app.connect("env-purge-doc", register_matlab_types)
-    app.connect("env-purge-doc", register_type_short_names)
+    app.connect("env-before-read-docs", skip_unchanged_documents)
+    app.connect("doctree-read", record_source_hashes)
+    app.connect("env-purge-doc", purge_source_hashes)
+    app.connect("env-merge-info", merge_source_hashes)
+    app.connect("builder-inited", refresh_type_index)
+    app.connect("env-updated", register_matlab_types)
+    app.connect("env-updated", register_type_short_names)
     app.add_role('matclass', MatClassRole())
+    enable_parallel_matlab_domain(app)
+    enable_build_profiler(app) # Only if MATNWB_DOCS_PROFILE is set; must come last
+
+    # The handlers above write to the environment from the main process
+    # (env-updated), or merge what they wrote in reading processes
+    # (env-merge-info)
+    return {'parallel_read_safe': True, 'parallel_write_safe': True}
 
 project = 'MatNWB'
 copyright = f'{datetime.now().year}, Neurodata Without Borders'
@@ -51,6 +68,20 @@ def get_version_from_contents():
 
 release = get_version_from_contents()
 
+# Substitutions for the bundled NWB schema versions
+schema_catalog = load_schema_catalog()
+if schema_catalog is not None:
+    rst_epilog = f"""
+.. |nwb_schema_versions| replace:: {schema_catalog['versions'][0]} - {schema_catalog['latest']}
+.. |latest_nwb_schema_version| replace:: {schema_catalog['latest']}
+"""
+else:
+    print("Warning: resources/nwb_schema_catalog.json not found")
+    rst_epilog = """
+.. |nwb_schema_versions| replace:: (unknown)
+.. |latest_nwb_schema_version| replace:: (unknown)
+"""
+
 # -- General configuration ---------------------------------------------------
 # https://www.sphinx-doc.org/en/master/usage/configuration.html#general-configuration
 
@@ -1,24 +1,202 @@
+import functools
+import json
 import os
+import re
+from collections import namedtuple
 
-def list_neurodata_types(namespace_name):
-    # Get the absolute path of the script's directory
-    script_dir = os.path.dirname(os.path.abspath(__file__))
+# Namespaces with generated neurodata type classes in +types
+NAMESPACES = ("core", "hdmf_common", "hdmf_experimental")
+
+# Get the absolute path of the script's directory
+script_dir = os.path.dirname(os.path.abspath(__file__))
+
+# Compute the absolute path two levels up from the script's directory
+matnwb_src_dir = os.path.abspath(os.path.join(script_dir, '..', '..', '..'))
+
+# Matches e.g. "classdef TimeSeries < types.core.NWBDataInterface & types.untyped.GroupClass"
+_CLASSDEF_PATTERN = re.compile(r"^\s*classdef\s+(?:\([^)]*\)\s*)?\w+\s*<\s*([\w.&\s]+)")
+
+NeurodataType = namedtuple(
+    'NeurodataType',
+    [
+        'name',         # Short name, e.g. "TimeSeries"
+        'namespace',    # Namespace name, e.g. "core"
+        'full_name',    # MATLAB class name, e.g. "types.core.TimeSeries"
+        'docname',      # Sphinx document of the type, e.g. "pages/neurodata_types/core/TimeSeries"
+        'parent',       # MATLAB class name of the parent neurodata type, or None
+        'source_path',  # Path of the class file relative to the MatNWB root, e.g. "+types/+core/TimeSeries.m"
+    ]
+)
+
+
+class NeurodataTypeIndex:
+    """
+    Index of the neurodata types generated in the +types folder.
+
+    The index is built once and reused until the namespace folders (or, if
+    requested, any of the class files) change on disk. Use get_type_index to
+    get the shared index for the current build.
+    """
+
+    def __init__(self, matnwb_dir=matnwb_src_dir, namespaces=NAMESPACES):
+        self.matnwb_dir = matnwb_dir
+        self.namespaces = tuple(namespaces)
+        self._folder_signature = self._get_folder_signature()
+        self._file_signature = self._get_file_signature()
+        self._types = {}
+        self._types_by_short_name = {}
+        self._types_by_namespace = {namespace: [] for namespace in self.namespaces}
+        for namespace in self.namespaces:
+            for file_name in self._list_class_files(namespace):
+                neurodata_type = self._read_type(namespace, file_name)
+                self._types[neurodata_type.full_name] = neurodata_type
+                self._types_by_short_name[neurodata_type.name] = neurodata_type
+                self._types_by_namespace[namespace].append(neurodata_type)
+
+    def __iter__(self):
+        return iter(self._types.values())
+
+    def __len__(self):
+        return len(self._types)
+
+    def __contains__(self, name):
+        return self.get(name) is not None
+
+    def get(self, name):
+        """
+        Return the neurodata type with the given MATLAB class name (e.g.
+        "types.core.TimeSeries") or short name (e.g. "TimeSeries"), or None.
+        """
+        return self._types.get(name) or self._types_by_short_name.get(name)
+
+    def list_types(self, namespace):
+        """Return the neurodata types of a namespace, in file listing order."""
+        return list(self._types_by_namespace.get(namespace, []))
+
+    def list_names(self, *namespaces):
+        """Return the short names of the neurodata types of the given namespaces."""
+        return [t.name for namespace in namespaces for t in self._types_by_namespace.get(namespace, [])]
+
+    def is_stale(self, check_files=False):
+        """
+        Return True if types were added to or removed from +types since the
+        index was built. If check_files is True, changes to the class files
+        themselves (e.g. after regenerating the types) are detected as well.
+        """
+        if self._get_folder_signature() != self._folder_signature:
+            return True
+        return check_files and self._get_file_signature() != self._file_signature
 
-    # Compute the absolute path two levels up from the script's directory
-    matnwb_src_dir = os.path.abspath(os.path.join(script_dir, '..', '..', '..'))
+    def _get_namespace_dir(self, namespace):
+        return os.path.join(self.matnwb_dir, '+types', f"+{namespace}")
 
-    # Construct the path to the namespace's types directory
-    types_dir = os.path.join(matnwb_src_dir, '+types', f"+{namespace_name}")
+    def _list_class_files(self, namespace):
+        types_dir = self._get_namespace_dir(namespace)
+        if not os.path.isdir(types_dir):
+            return []
+        return [file_name for file_name in os.listdir(types_dir) if file_name.endswith('.m')]
 
-    # List to store the file names without extension
-    neurodata_types = []
+    def _get_folder_signature(self):
+        signature = []
+        for namespace in self.namespaces:
+            try:
+                signature.append(os.stat(self._get_namespace_dir(namespace)).st_mtime_ns)
+            except FileNotFoundError:
+                signature.append(None)
+        return tuple(signature)
+
+    def _get_file_signature(self):
+        signature = []
+        for namespace in self.namespaces:
+            types_dir = self._get_namespace_dir(namespace)
+            if not os.path.isdir(types_dir):
+                continue
+            with os.scandir(types_dir) as entries:
+                for entry in entries:
+                    if entry.name.endswith('.m'):
+                        stat = entry.stat()
+                        signature.append((namespace, entry.name, stat.st_mtime_ns, stat.st_size))
+        return frozenset(signature)
+
+    def _read_type(self, namespace, file_name):
+        name = os.path.splitext(file_name)[0]
+        return NeurodataType(
+            name=name,
+            namespace=namespace,
+            full_name=f"types.{namespace}.{name}",
+            docname=f"pages/neurodata_types/{namespace}/{name}",
+            parent=self._read_parent(os.path.join(self._get_namespace_dir(namespace), file_name)),
+            source_path=f"+types/+{namespace}/{file_name}",
+        )
+
+    @staticmethod
+    def _read_parent(file_path):
+        try:
+            with open(file_path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    match = _CLASSDEF_PATTERN.match(line)
+                    if match:
+                        for superclass in match.group(1).split('&'):
+                            superclass = superclass.strip()
+                            if superclass.startswith('types.') and not superclass.startswith('types.untyped.'):
+                                return superclass
+                        return None
+        except (OSError, UnicodeDecodeError):
+            pass
+        return None
+
+
+_type_index = None
+
+
+def get_type_index(check_files=False):
+    """
+    Return the neurodata type index shared by all extensions of the build.
+
+    The index is rebuilt if it is stale, see NeurodataTypeIndex.is_stale.
+    """
+    global _type_index
+    if _type_index is None or _type_index.is_stale(check_files=check_files):
+        _type_index = NeurodataTypeIndex()
+    return _type_index
+
+
+def refresh_type_index(app=None):
+    """Rebuild the type index if any class file changed. Connect to "builder-inited"."""
+    get_type_index(check_files=True)
+
+
+def load_schema_catalog():
+    """
+    Load the catalog of bundled NWB schema versions (resources/nwb_schema_catalog.json,
+    generated by .github/workflows/scripts/create_nwb_schema_catalog.py), or
+    return None if it does not exist.
+    """
+    catalog_path = os.path.join(matnwb_src_dir, 'resources', 'nwb_schema_catalog.json')
+    try:
+        with open(catalog_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+
+def list_neurodata_types(namespace_name):
+    return get_type_index().list_names(namespace_name)
 
-    # Check if the directory exists
-    if os.path.isdir(types_dir):
-        # Iterate through all .m files in the directory
-        for file_name in os.listdir(types_dir):
-            if file_name.endswith('.m'):
-                # Remove the file extension and add to the list
-                neurodata_types.append(os.path.splitext(file_name)[0])
 
-    return neurodata_types
+@functools.lru_cache(maxsize=None)
+def find_source_file(name):
+    """
+    Return the .m file which defines a documented object, e.g.
+    "types.core.TimeSeries.data" -> "<matnwb>/+types/+core/TimeSeries.m",
+    or None if no file is found.
+    """
+    parts = name.split('.')
+    for num_parts in range(len(parts), 0, -1):
+        *packages, file_name = parts[:num_parts]
+        folder = os.path.join(matnwb_src_dir, *(f"+{package}" for package in packages))
+        for candidate in (os.path.join(folder, f"{file_name}.m"),
+                          os.path.join(folder, f"@{file_name}", f"{file_name}.m")):
+            if os.path.isfile(candidate):
+                return candidate
+    return None
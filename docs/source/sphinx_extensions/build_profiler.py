@@ -0,0 +1,358 @@
+"""
+Profile where the docs build spends its time.
+
+Enable by setting the environment variable MATNWB_DOCS_PROFILE before
+running sphinx-build:
+
+    MATNWB_DOCS_PROFILE=1 sphinx-build -b html docs/source docs/build/html
+
+Every connected event handler is timed per document, the time to read each
+document (including autodoc) is measured, and the stages of the docstring
+processor are timed, with the number of regex substitutions they make. At
+the end of the build, build_profile.json and build_profile.html are written
+to the doctree folder, or to the folder given by MATNWB_DOCS_PROFILE if it
+is not "1".
+
+When the variable is not set, nothing is wrapped or connected.
+"""
+import html
+import json
+import os
+import time
+from collections import defaultdict
+
+from sphinx.util import logging
+
+import docstring_processors
+
+logger = logging.getLogger(__name__)
+
+ENVIRONMENT_VARIABLE = 'MATNWB_DOCS_PROFILE'
+NUM_REPORTED_DOCUMENTS = 50
+
+_PROFILE_ATTRIBUTE = 'matnwb_build_profile'
+
+# Events whose handlers receive the document name as an argument (index into
+# the arguments after app), for events that run outside of reading a document
+_DOCNAME_ARGUMENT = {
+    'source-read': 0,
+    'env-purge-doc': 1,
+    'doctree-resolved': 1,
+    'html-page-context': 0,
+}
+
+_app = None
+_main_pid = None
+_main_profile = None
+_start_time = None
+
+
+class BuildProfile:
+    """Timings collected by one process."""
+
+    def __init__(self):
+        self.pid = os.getpid()
+        self.handlers = defaultdict(lambda: [0, 0.0])   # "event: handler" -> [calls, seconds]
+        self.documents = defaultdict(lambda: defaultdict(float))  # docname -> {"read" or handler: seconds}
+        self.stages = defaultdict(lambda: [0, 0.0])     # stage -> [calls, seconds]
+        self.patterns = defaultdict(lambda: [0, 0.0, 0])  # pattern -> [calls, seconds, substitutions]
+
+    def merge(self, other):
+        for key, (calls, seconds) in other.handlers.items():
+            self.handlers[key][0] += calls
+            self.handlers[key][1] += seconds
+        for docname, timings in other.documents.items():
+            for key, seconds in timings.items():
+                self.documents[docname][key] += seconds
+        for key, (calls, seconds) in other.stages.items():
+            self.stages[key][0] += calls
+            self.stages[key][1] += seconds
+        for key, (calls, seconds, substitutions) in other.patterns.items():
+            self.patterns[key][0] += calls
+            self.patterns[key][1] += seconds
+            self.patterns[key][2] += substitutions
+
+    def __getstate__(self):
+        # defaultdicts with lambdas can not be pickled (environment is sent
+        # back from parallel reading processes)
+        return {
+            'pid': self.pid,
+            'handlers': dict(self.handlers),
+            'documents': {docname: dict(timings) for docname, timings in self.documents.items()},
+            'stages': dict(self.stages),
+            'patterns': dict(self.patterns),
+        }
+
+    def __setstate__(self, state):
+        self.__init__()
+        self.pid = state['pid']
+        self.handlers.update(state['handlers'])
+        for docname, timings in state['documents'].items():
+            self.documents[docname].update(timings)
+        self.stages.update(state['stages'])
+        self.patterns.update(state['patterns'])
+
+    def to_dict(self, total_seconds):
+        documents = []
+        for docname, timings in self.documents.items():
+            handler_seconds = sum(s for key, s in timings.items() if key != 'read')
+            documents.append({
+                'docname': docname,
+                'read_seconds': timings.get('read', 0.0),
+                'handler_seconds': handler_seconds,
+                'handlers': dict(sorted(((k, s) for k, s in timings.items() if k != 'read'),
+                                        key=lambda item: -item[1])),
+            })
+        documents.sort(key=lambda d: -(d['read_seconds'] + d['handler_seconds']))
+        return {
+            'total_seconds': total_seconds,
+            'handlers': _sorted_records(self.handlers, ('calls', 'seconds'), 'handler'),
+            'documents': documents,
+            'docstring_stages': _sorted_records(self.stages, ('calls', 'seconds'), 'stage'),
+            'regex_patterns': _sorted_records(self.patterns, ('calls', 'seconds', 'substitutions'), 'pattern'),
+        }
+
+
+def _sorted_records(stats, fields, name_field):
+    records = [{name_field: key, **dict(zip(fields, values))} for key, values in stats.items()]
+    return sorted(records, key=lambda r: -r['seconds'])
+
+
+def _current_profile():
+    """Return the profile of this process. Reading processes of a parallel
+    build store it on their environment, which is merged on env-merge-info."""
+    if os.getpid() == _main_pid:
+        return _main_profile
+    env = _app.env
+    profile = getattr(env, _PROFILE_ATTRIBUTE, None)
+    if profile is None or profile.pid != os.getpid():
+        profile = BuildProfile()
+        setattr(env, _PROFILE_ATTRIBUTE, profile)
+    return profile
+
+
+def _current_docname(event, args):
+    try:
+        docname = _app.env.docname
+    except (AttributeError, KeyError):
+        docname = None
+    if not docname and event in _DOCNAME_ARGUMENT:
+        index = _DOCNAME_ARGUMENT[event]
+        if len(args) > index and isinstance(args[index], str):
+            docname = args[index]
+    return docname or None
+
+
+class ProfiledHandler:
+    """Event handler wrapper which records the time spent in the handler."""
+
+    def __init__(self, event, handler):
+        self.event = event
+        self.handler = handler
+        self.key = f"{event}: {_handler_name(handler)}"
+
+    def __call__(self, app, *args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return self.handler(app, *args, **kwargs)
+        finally:
+            seconds = time.perf_counter() - start
+            profile = _current_profile()
+            stats = profile.handlers[self.key]
+            stats[0] += 1
+            stats[1] += seconds
+            docname = _current_docname(self.event, args)
+            if docname is not None:
+                profile.documents[docname][self.key] += seconds
+
+
+class ProfiledPattern:
+    """Compiled regex wrapper which records calls, time and substitutions."""
+
+    def __init__(self, pattern, name, stage=None):
+        self._pattern = pattern
+        self._name = name
+        self._stage = stage
+
+    def _record(self, seconds, substitutions):
+        profile = _current_profile()
+        stats = profile.patterns[self._name]
+        stats[0] += 1
+        stats[1] += seconds
+        stats[2] += substitutions
+        if self._stage is not None:
+            stage_stats = profile.stages[self._stage]
+            stage_stats[0] += 1
+            stage_stats[1] += seconds
+
+    def subn(self, repl, string, count=0):
+        start = time.perf_counter()
+        result = self._pattern.subn(repl, string, count)
+        self._record(time.perf_counter() - start, result[1])
+        return result
+
+    def sub(self, repl, string, count=0):
+        return self.subn(repl, string, count)[0]
+
+    def match(self, string, *args):
+        start = time.perf_counter()
+        result = self._pattern.match(string, *args)
+        self._record(time.perf_counter() - start, 0)
+        return result
+
+    def search(self, string, *args):
+        start = time.perf_counter()
+        result = self._pattern.search(string, *args)
+        self._record(time.perf_counter() - start, 0)
+        return result
+
+    def __getattr__(self, name):
+        return getattr(self._pattern, name)
+
+
+class ProfiledFunction:
+    """Function wrapper which records calls and time for a docstring stage."""
+
+    def __init__(self, function, stage):
+        self._function = function
+        self._stage = stage
+
+    def __call__(self, *args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return self._function(*args, **kwargs)
+        finally:
+            stats = _current_profile().stages[self._stage]
+            stats[0] += 1
+            stats[1] += time.perf_counter() - start
+
+
+def _handler_name(handler):
+    module = getattr(handler, '__module__', None) or ''
+    name = getattr(handler, '__qualname__', None) or type(handler).__name__
+    return f"{module}.{name}" if module else name
+
+
+def is_enabled():
+    return bool(os.environ.get(ENVIRONMENT_VARIABLE, '').strip())
+
+
+def enable_build_profiler(app):
+    """
+    Start profiling the build if MATNWB_DOCS_PROFILE is set. Call at the end
+    of setup(), after all other handlers are connected.
+    """
+    global _app, _main_pid, _main_profile, _start_time
+    if not is_enabled():
+        return
+    _app = app
+    _main_pid = os.getpid()
+    _main_profile = BuildProfile()
+    _start_time = time.perf_counter()
+
+    _instrument_docstring_processors()
+    _wrap_event_handlers(app)
+
+    app.connect('builder-inited', _wrap_event_handlers_late, priority=1000)
+    app.connect('source-read', _start_reading, priority=0)
+    app.connect('doctree-read', _finish_reading, priority=1000)
+    app.connect('env-merge-info', _merge_profile)
+    app.connect('build-finished', _write_report, priority=1000)
+
+
+def _instrument_docstring_processors():
+    for attribute, stage in docstring_processors.PROFILED_STAGES.items():
+        value = getattr(docstring_processors, attribute)
+        if hasattr(value, 'subn'):
+            setattr(docstring_processors, attribute, ProfiledPattern(value, attribute, stage))
+        else:
+            setattr(docstring_processors, attribute, ProfiledFunction(value, stage))
+    for attribute in docstring_processors.PROFILED_PATTERNS:
+        value = getattr(docstring_processors, attribute)
+        if not isinstance(value, ProfiledPattern):
+            setattr(docstring_processors, attribute, ProfiledPattern(value, attribute))
+
+
+def _wrap_event_handlers(app):
+    """Replace all connected handlers (except the profiler's) by timed ones."""
+    for event, listeners in app.events.listeners.items():
+        for i, listener in enumerate(listeners):
+            handler = listener.handler
+            if isinstance(handler, ProfiledHandler) or getattr(handler, '__module__', None) == __name__:
+                continue
+            listeners[i] = listener._replace(handler=ProfiledHandler(event, handler))
+
+
+def _wrap_event_handlers_late(app):
+    # Handlers connected after setup, e.g. by extensions set up by others
+    _wrap_event_handlers(app)
+
+
+_reading_started = {}
+
+
+def _start_reading(app, docname, source):
+    _reading_started[docname] = time.perf_counter()
+
+
+def _finish_reading(app, doctree):
+    docname = _current_docname('doctree-read', ())
+    start = _reading_started.pop(docname, None)
+    if docname is not None and start is not None:
+        _current_profile().documents[docname]['read'] += time.perf_counter() - start
+
+
+def _merge_profile(app, env, docnames, other):
+    other_profile = getattr(other, _PROFILE_ATTRIBUTE, None)
+    if other_profile is not None and other_profile.pid != os.getpid():
+        _main_profile.merge(other_profile)
+
+
+def _write_report(app, exception):
+    total_seconds = time.perf_counter() - _start_time
+    report = _main_profile.to_dict(total_seconds)
+
+    output_dir = os.environ.get(ENVIRONMENT_VARIABLE, '').strip()
+    if output_dir.lower() in ('1', 'true', 'yes', 'on'):
+        output_dir = str(app.doctreedir)
+    os.makedirs(output_dir, exist_ok=True)
+
+    json_path = os.path.join(output_dir, 'build_profile.json')
+    with open(json_path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    html_path = os.path.join(output_dir, 'build_profile.html')
+    with open(html_path, 'w', encoding='utf-8') as f:
+        f.write(format_html_report(report))
+    logger.info(f"build profile written to {json_path} and {html_path}")
+
+
+def format_html_report(report, num_documents=NUM_REPORTED_DOCUMENTS):
+    """Format a profile report (see BuildProfile.to_dict) as a HTML page."""
+    def table(title, records, columns):
+        rows = []
+        for record in records:
+            cells = []
+            for column in columns:
+                value = record[column]
+                if isinstance(value, float):
+                    value = f"{value:.3f}"
+                cells.append(f"<td>{html.escape(str(value))}</td>")
+            rows.append(f"<tr>{''.join(cells)}</tr>")
+        header = ''.join(f"<th>{html.escape(column)}</th>" for column in columns)
+        return f"<h2>{html.escape(title)}</h2>\n<table>\n<tr>{header}</tr>\n" + '\n'.join(rows) + "\n</table>"
+
+    sections = [
+        table('Event handlers', report['handlers'], ('handler', 'calls', 'seconds')),
+        table(f'Slowest documents (top {num_documents})', report['documents'][:num_documents],
+              ('docname', 'read_seconds', 'handler_seconds')),
+        table('Docstring processor stages', report['docstring_stages'], ('stage', 'calls', 'seconds')),
+        table('Regular expressions', report['regex_patterns'], ('pattern', 'calls', 'substitutions', 'seconds')),
+    ]
+    return (
+        "<!DOCTYPE html>\n<html>\n<head>\n<meta charset=\"utf-8\">\n<title>Docs build profile</title>\n"
+        "<style>body { font-family: sans-serif; } table { border-collapse: collapse; } "
+        "td, th { border: 1px solid #ccc; padding: 2px 8px; text-align: left; }</style>\n"
+        "</head>\n<body>\n"
+        f"<h1>Docs build profile</h1>\n<p>Total time: {report['total_seconds']:.1f} s</p>\n"
+        + '\n'.join(sections) + "\n</body>\n</html>\n"
+    )
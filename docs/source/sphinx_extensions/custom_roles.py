@@ -2,7 +2,7 @@ import os
 from sphinx.roles import XRefRole
 from docutils import nodes, utils
 from pprint import pprint
-from _util import list_neurodata_types
+from _util import get_type_index
 
 
 class MatClassRole(XRefRole):
@@ -28,9 +28,12 @@ class MatClassRole(XRefRole):
     #    return [node], []
 
 
-def register_matlab_types(app, env, docname):
+def register_matlab_types(app, env):
     """
     Register MATLAB types in the 'mat' domain with external links.
+
+    Connect to "env-updated" so that the types are registered once per build,
+    after all documents have been read.
     """
     
     # MATLAB types and their corresponding external URLs
@@ -68,21 +71,17 @@ def register_matlab_types(app, env, docname):
         env.domaindata["mat"]["objects"][type_name] = (url, "matclass")
 
 
-def register_type_short_names(app, env, docname):
+def register_type_short_names(app, env):
 # register_type_short_names - Register short names for neurodata types as classes
+#
+# Connect to "env-updated": the entries are registered once per build, after
+# all documents have been read. (When a neurodata type page is re-read, the
+# mat domain removes the short name entry that points to that page.)
 
     if "objects" not in env.domaindata["mat"]:
         env.domaindata["mat"]["objects"] = {}
 
-    # List of modules to process
-    modules = ["core", "hdmf_common", "hdmf_experimental"]
-    
-    # Loop through the modules
-    for module in modules:
-        # List the neurodata types for the current module
-        nwb_types = list_neurodata_types(module)
-        for type_name in nwb_types:
-            # Register the type with as a 'class' object type
-            docname = f"pages/neurodata_types/{module}/{type_name}"
-            env.domaindata["mat"]["objects"][type_name] = (docname, "class")
-
+    objects = env.domaindata["mat"]["objects"]
+    for neurodata_type in get_type_index():
+        # Register the type with as a 'class' object type
+        objects[neurodata_type.name] = (neurodata_type.docname, "class")
@@ -0,0 +1,152 @@
+"""
+Reuse the documents of unchanged classes across docs builds.
+
+Sphinx keeps the doctree of every document in its pickled environment. For
+a class page, the doctree holds the docstrings autodoc extracted and
+process_matlab_docstring rewrote. Sphinx re-reads a document when the
+document or one of its dependencies has a newer modification time. That
+happens after every fresh checkout and after generateCore rewrites class
+files, even if their content did not change. Re-reading runs autodoc again,
+which parses the class files.
+
+This module records a content hash of every source file a document was read
+from: the .rst file, the .m files noted by process_matlab_docstring and the
+class files of their parent neurodata types, which inherited members are
+documented from. The hashes are stored with a version made of the docs
+extensions and the names of the neurodata types. Before Sphinx reads the
+changed documents, the documents whose hashes and version are unchanged are
+taken off the list. Their doctrees are reused, so autodoc does not extract
+their docstrings at all. The number of reused (hits) and read (misses)
+documents is reported.
+
+Documents are only reused if the configuration is unchanged. Sphinx reads
+all documents again otherwise.
+"""
+import functools
+import hashlib
+import os
+
+from sphinx.environment import CONFIG_OK
+from sphinx.util import logging
+
+from _util import get_type_index, matnwb_src_dir, script_dir
+
+logger = logging.getLogger(__name__)
+
+_HASHES_ATTRIBUTE = 'matnwb_source_hashes'
+
+
+@functools.lru_cache(maxsize=None)
+def get_extension_version():
+    """
+    Return a hash of the docs extensions and of sphinxcontrib-matlabdomain,
+    which determine how docstrings are extracted and rewritten.
+    """
+    import sphinxcontrib.mat_documenters
+
+    digest = hashlib.sha256()
+    for file_name in sorted(os.listdir(script_dir)):
+        if file_name.endswith('.py'):
+            with open(os.path.join(script_dir, file_name), 'rb') as f:
+                digest.update(file_name.encode() + b'\0' + f.read())
+    with open(sphinxcontrib.mat_documenters.__file__, 'rb') as f:
+        digest.update(f.read())
+    return digest.hexdigest()
+
+
+def get_cache_version():
+    """
+    Return the version of the stored hashes: the extension version and the
+    names of the neurodata types, which docstrings are rewritten to link to.
+    """
+    digest = hashlib.sha256(get_extension_version().encode())
+    for full_name in sorted(t.full_name for t in get_type_index()):
+        digest.update(full_name.encode() + b'\0')
+    return digest.hexdigest()
+
+
+def hash_file(path):
+    """Return the SHA-256 hash of a file's content, or None if it does not exist."""
+    digest = hashlib.sha256()
+    try:
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(1 << 20), b''):
+                digest.update(block)
+    except FileNotFoundError:
+        return None
+    return digest.hexdigest()
+
+
+def record_source_hashes(app, doctree):
+    """Store the hashes of the sources of the document just read. Connect to "doctree-read"."""
+    env = app.env
+    source_paths = {os.fspath(env.doc2path(env.docname))}
+    for dependency in env.dependencies.get(env.docname, ()):
+        source_paths.add(os.path.normpath(os.path.join(app.srcdir, dependency)))
+    source_paths.update(_list_parent_class_files(source_paths))
+    _get_hashes(env)[env.docname] = {
+        'version': get_cache_version(),
+        'sources': {path: hash_file(path) for path in source_paths},
+    }
+
+
+def skip_unchanged_documents(app, env, docnames):
+    """
+    Remove the documents with unchanged sources from the documents to read.
+    Connect to "env-before-read-docs".
+    """
+    hashes = _get_hashes(env)
+    if env.config_status != CONFIG_OK:
+        hashes.clear()
+    version = get_cache_version()
+    current_hashes = {}  # Class files are shared by many documents
+
+    def is_unchanged(path, source_hash):
+        if path not in current_hashes:
+            current_hashes[path] = hash_file(path)
+        return current_hashes[path] == source_hash
+
+    num_hits = 0
+    for docname in list(docnames):
+        entry = hashes.get(docname)
+        if entry is not None and entry['version'] == version and all(
+                is_unchanged(path, source_hash) for path, source_hash in entry['sources'].items()):
+            docnames.remove(docname)
+            num_hits += 1
+    logger.info(f"docstring cache: {num_hits} hits, {len(docnames)} misses")
+
+
+def purge_source_hashes(app, env, docname):
+    """Forget the hashes of a document which is read again. Connect to "env-purge-doc"."""
+    _get_hashes(env).pop(docname, None)
+
+
+def merge_source_hashes(app, env, docnames, other):
+    """Take the hashes of the documents read by a parallel process. Connect to "env-merge-info"."""
+    other_hashes = _get_hashes(other)
+    hashes = _get_hashes(env)
+    for docname in docnames:
+        if docname in other_hashes:
+            hashes[docname] = other_hashes[docname]
+
+
+def _get_hashes(env):
+    if not hasattr(env, _HASHES_ATTRIBUTE):
+        setattr(env, _HASHES_ATTRIBUTE, {})
+    return getattr(env, _HASHES_ATTRIBUTE)
+
+
+def _list_parent_class_files(source_paths):
+    """Return the class files of the parent neurodata types of the given class files."""
+    type_index = get_type_index()
+    types_by_path = {
+        os.path.normpath(os.path.join(matnwb_src_dir, t.source_path)): t for t in type_index
+    }
+    parent_paths = set()
+    for path in source_paths:
+        neurodata_type = types_by_path.get(os.path.normpath(path))
+        while neurodata_type is not None and neurodata_type.parent is not None:
+            neurodata_type = type_index.get(neurodata_type.parent)
+            if neurodata_type is not None:
+                parent_paths.add(os.path.join(matnwb_src_dir, neurodata_type.source_path))
+    return parent_paths
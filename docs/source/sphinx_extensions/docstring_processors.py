@@ -1,247 +1,215 @@
-import os
 import re
-from _util import list_neurodata_types
+from _util import find_source_file, get_type_index
+
+
+# Full list of MATLAB base types
+MATLAB_TYPES = (
+    "double", "single", "int8", "uint8", "int16", "uint16",
+    "int32", "uint32", "int64", "uint64", "logical", "char",
+    "cell", "struct", "table", "categorical", "datetime",
+    "duration", "calendarDuration", "function_handle",
+    "string", "complex"
+)
+
+# A parenthesized word, e.g. "(double)" or "(TimeSeries)". Type names never
+# contain parentheses, so every occurrence of "(<type name>)" in a line is
+# matched by this pattern and can be resolved with a dictionary lookup.
+_PARENTHESIZED_PATTERN = re.compile(r"\(([^()]*)\)")
+
+# Class constructor references, e.g. :meth:`TimeSeries() <types.core.TimeSeries.TimeSeries>`
+_CONSTRUCTOR_METHOD_PATTERN = re.compile(
+    r":meth:`([^`]+)\s*<([a-zA-Z0-9_.]+)\.([a-zA-Z0-9_]+)\.([a-zA-Z0-9_]+)>`"
+)
+
+# MATLAB expressions in the Syntax section
+_MATLAB_EXPRESSION_PATTERN = re.compile(
+    r"^\s*((?:\[[\w,\s]*\]\s*=\s*|[\w]+\s*=\s*)?[A-Za-z][\w\.]*\([^)]*\))"
+)
+_ROLE_WITH_TARGET_PATTERN = re.compile(r':[\w:]+:`([^`<]+?)\s*<[^>]+>`')
+_ROLE_PATTERN = re.compile(r':[\w:]+:`([^`]+?)`')
+
+# List item names with optional types in parentheses
+_INPUT_ARGUMENT_PATTERN = re.compile(
+    r"(?P<indent>^\s*)-\s*(?P<name>\w+)"  # Match the name of the argument
+    r"(?:\s*\((?P<type>.*?)\))?"  # Optionally match the type in parentheses
+)
+
+# Example lines with descriptions, e.g. 'Example 1 - Export an NWB file::'
+_EXAMPLE_PATTERN = re.compile(
+    r"^\s*(Example\s+\d+)\s*-\s*(.*)::\s*$"
+)
+
+# Section headers. Must start with a letter (not space) to avoid matching RST
+# roles like :class:`X` where backtracking would let [A-Za-z ] match a
+# leading space.
+_SECTION_HEADER_PATTERN = re.compile(r"^\s*%?\s*[A-Za-z][A-Za-z ]*:")
+
+# Module attributes the build profiler (build_profiler.py) times as stages of
+# DocstringRewriter.rewrite, and all patterns it counts substitutions for.
+PROFILED_STAGES = {
+    '_PARENTHESIZED_PATTERN': 'type references',
+    '_format_required_property_values': 'required properties',
+    '_CONSTRUCTOR_METHOD_PATTERN': 'constructor references',
+    '_SECTION_HEADER_PATTERN': 'syntax examples',
+    '_make_syntax_example_code_literal': 'syntax examples',
+    '_INPUT_ARGUMENT_PATTERN': 'input arguments',
+    '_EXAMPLE_PATTERN': 'examples',
+}
+PROFILED_PATTERNS = (
+    '_PARENTHESIZED_PATTERN', '_CONSTRUCTOR_METHOD_PATTERN', '_MATLAB_EXPRESSION_PATTERN',
+    '_ROLE_WITH_TARGET_PATTERN', '_ROLE_PATTERN', '_INPUT_ARGUMENT_PATTERN',
+    '_EXAMPLE_PATTERN', '_SECTION_HEADER_PATTERN',
+)
 
 
 def process_matlab_docstring(app, what, name, obj, options, lines):
-    _format_matlab_type_as_code_literal(lines)
-    _format_nwbtype_shortnames(lines)
-    _format_required_properties(lines)
-    _replace_class_contructor_method_role_with_class_role(lines)
-    _make_syntax_examples_code_literals(lines)
-    _format_input_arguments(lines)
-    _split_and_format_example_lines(lines)
-
-
-def _format_matlab_type_as_code_literal(lines):
-     # Full list of MATLAB base types
-    matlab_types = {
-        "double", "single", "int8", "uint8", "int16", "uint16", 
-        "int32", "uint32", "int64", "uint64", "logical", "char", 
-        "cell", "struct", "table", "categorical", "datetime", 
-        "duration", "calendarDuration", "function_handle", 
-        "string", "complex"
-    }
-
-    type_pattern = re.compile(
-        rf"(?P<before>\()"
-        rf"(?P<type>{'|'.join(re.escape(t) for t in matlab_types)})"
-        rf"(?P<after>\))"
-    )
-    
-    for i, line in enumerate(lines):
-        # Replace matches with inline code formatting, preserving parentheses
-        # lines[i] = type_pattern.sub(
-        #     lambda match: (
-        #         f"{match.group('before') or ''}"
-        #         f"``{match.group('type')}``"
-        #         f"{match.group('after') or ''}"
-        #     ),
-        #     line
-        # )
-        lines[i] = type_pattern.sub(
-            lambda match: (
-                f"{match.group('before') or ''}"
-                f":matclass:`{match.group('type')}`"
-                f"{match.group('after') or ''}"
-            ),
-            line
-        )
+    env = app.env if app is not None else None
+    if env is not None and env.docname:
+        # Re-read the document in incremental builds when the source file changes
+        source_path = find_source_file(name)
+        if source_path is not None:
+            env.note_dependency(source_path)
 
+    _get_docstring_rewriter().rewrite(lines)
 
-def _format_required_properties(lines):
-    """
-    Process lines to find the 'Required Properties' section and format its values.
 
-    Args:
-        lines (list of str): Lines from a docstring to process.
-    """
-    
-    try:
-        # Find the index of the "Required Properties:" line
-        required_idx = next(i for i, line in enumerate(lines) if "Required Properties:" in line)
-        
-        if not required_idx: 
-            return
-
-        lines[required_idx] = lines[required_idx].replace("Required Properties:", "Required Properties\ `*`__:")
-
-        # Process the line following "Required Properties:"
-        required_line = lines[required_idx + 1]
-
-        values = required_line.strip().split(", ")
-
-        # Format the values
-        formatted_values = [
-            f":attr:`{value.strip()}`" if value.lower() != "none" else f"``{value.strip()}``"
-            for value in values
-        ]
-        # Update the line with required properties. Add single preceding space
-        # for proper indentation
-        lines[required_idx + 1] = " " + ", ".join(formatted_values)
-    
-    except (StopIteration, IndexError):
-        # If "Required Properties:" or the following line is not found, return the original lines
-        pass
-
-
-def _replace_class_contructor_method_role_with_class_role(lines):
-    """
-    Process docstrings to replace `:meth:` expressions with `:class:`.
+_docstring_rewriter = None
 
-    Args:
-        lines: List of lines in the docstring.
-    """
-    
-    # Regular expression to match the `:meth:` pattern
-    pattern = re.compile(
-        r":meth:`([^`]+)\s*<([a-zA-Z0-9_.]+)\.([a-zA-Z0-9_]+)\.([a-zA-Z0-9_]+)>`"
-    )
-
-    # Replacement function for re.sub
-    def replace_meth_with_class(match):
-        display_name = match.group(1).replace("()", "").strip()  # The displayed name, e.g., "AbstractFeatureSeries"
-        namespace_prefix = match.group(2)  # The module path, e.g., "types.core"
-        class_name = match.group(3)  # The class name, e.g., "AbstractFeatureSeries"
-        # Construct the new :class: pattern
-        return f":class:`{display_name} <{namespace_prefix}.{class_name}>`"
-
-    # Update lines in place
-    for i, line in enumerate(lines):
-        lines[i] = pattern.sub(replace_meth_with_class, line)
-
-
-def _make_syntax_examples_code_literals(lines):
-    """
-    Process a MATLAB docstring to wrap expressions in the Syntax section with double backticks.
-
-    Args:
-        lines (str): The original MATLAB docstring lines.
-    """
 
-    in_syntax_section = False
-
-    # Regex to match MATLAB expressions
-    matlab_expr_pattern = re.compile(
-        r"^\s*((?:\[[\w,\s]*\]\s*=\s*|[\w]+\s*=\s*)?[A-Za-z][\w\.]*\([^)]*\))"
-    )
-    
-    for i, line in enumerate(lines):
-        # Check if the current line starts the Syntax section
-        if line.strip().lower().startswith("syntax:"):
-            in_syntax_section = True
-            continue
-
-        # Check if the current line is another section header
-        if in_syntax_section and _is_section_header(line) and not line.strip().lower().startswith("syntax:"):
-            in_syntax_section = False
-
-        if in_syntax_section:
-            # Strip RST role markup before matching: auto_link may have already
-            # converted identifiers to :class:`X <Y>` or :meth:`X() <Y>` roles.
-            # Syntax examples are code — links inside them are unwanted and also
-            # break the MATLAB expression pattern (line starts with ':' not a word).
-            clean = re.sub(r':[\w:]+:`([^`<]+?)\s*<[^>]+>`', r'\1', line)
-            clean = re.sub(r':[\w:]+:`([^`]+?)`', r'\1', clean)
-            match = matlab_expr_pattern.search(clean)
-            if match:
-                clean = matlab_expr_pattern.sub(lambda m: f"``{m.group(1)}``", clean)
-                lines[i] = " " + clean
+def _get_docstring_rewriter():
+    """Return the rewriter for the current type index, creating it once per index."""
+    global _docstring_rewriter
+    type_index = get_type_index()
+    if _docstring_rewriter is None or _docstring_rewriter.type_index is not type_index:
+        _docstring_rewriter = DocstringRewriter(type_index.list_names('core', 'hdmf_common'), type_index)
+    return _docstring_rewriter
 
 
-def _format_input_arguments(lines):
+class DocstringRewriter:
     """
-    Format the 'Input Arguments' section to add double ** around item names
-    and `` around types in parentheses.
+    Rewrite MATLAB docstring lines into reStructuredText in a single pass.
 
-    Args:
-        lines (list of str): List of lines in the Input Arguments section.
+    The rewrites are applied to each line in the following order:
+
+    1. MATLAB types in parentheses become :matclass: references and
+       neurodata types in parentheses become :class: references.
+    2. The values following 'Required Properties:' become :attr: references.
+    3. Class constructor :meth: references become :class: references.
+    4. Expressions in the Syntax section become code literals.
+    5. Names and types of 'Input Arguments' items are formatted.
+    6. 'Example X - Description::' lines are split into two bold lines.
     """
 
-    # Regex pattern for list item names with optional types in parentheses
-    input_arg_pattern = re.compile(
-        r"(?P<indent>^\s*)-\s*(?P<name>\w+)"  # Match the name of the argument
-        r"(?:\s*\((?P<type>.*?)\))?"  # Optionally match the type in parentheses
-    )
-
-    for i, line in enumerate(lines):
-        # Apply formatting to each matching line
-        lines[i] = input_arg_pattern.sub(
-            lambda match: (
-                f"{match.group('indent')}- **{match.group('name').strip()}**" +  # Name
-                ( # Optional type
-                    f" ({match.group('type').strip()})"  # Preserve existing formatting
-                    if match.group('type') and (
-                        match.group('type').strip().startswith("``") or  # Already backtick-formatted
-                        match.group('type').strip().startswith(":")      # Sphinx directive
-                    )
-                    else f" (``{match.group('type').strip()}``)"  # Add backticks if unformatted
-                if match.group('type') else "" )  # No type provided  
-            ),
-            line
+    def __init__(self, neurodata_types, type_index=None):
+        self.type_index = type_index  # The index the type names were taken from
+        self._parenthesized_replacements = {
+            type_name: f"(:class:`{type_name}`)" for type_name in neurodata_types
+        }
+        # MATLAB types are replaced first, so they take precedence
+        self._parenthesized_replacements.update(
+            {type_name: f"(:matclass:`{type_name}`)" for type_name in MATLAB_TYPES}
         )
-        
 
-def _split_and_format_example_lines(lines):
-    """
-    Split and format example lines like:
-    'Example 1 - Export an NWB file:'
-    into two lines:
-    '**Example 1.**'
-    '**Export an NWB file**::'
+    def rewrite(self, lines):
+        """
+        Rewrite docstring lines in place.
+
+        Args:
+            lines (list of str): Lines from a docstring to process.
+        """
+        rewritten = []
+        has_seen_required_properties = False
+        is_required_properties_line = False
+        in_syntax_section = False
+
+        for i, line in enumerate(lines):
+            if "(" in line:
+                line = _PARENTHESIZED_PATTERN.sub(self._replace_parenthesized, line)
+
+            # Only the first 'Required Properties:' section is formatted, and
+            # not if it is on the first line.
+            if is_required_properties_line:
+                line = _format_required_property_values(line)
+                is_required_properties_line = False
+            elif not has_seen_required_properties and "Required Properties:" in line:
+                has_seen_required_properties = True
+                if i > 0:
+                    line = line.replace("Required Properties:", "Required Properties\\ `*`__:")
+                    is_required_properties_line = True
+
+            if ":meth:`" in line:
+                line = _CONSTRUCTOR_METHOD_PATTERN.sub(_replace_meth_with_class, line)
+
+            if line.strip().lower().startswith("syntax:"):
+                in_syntax_section = True
+            elif in_syntax_section:
+                if _SECTION_HEADER_PATTERN.match(line):
+                    in_syntax_section = False
+                else:
+                    line = _make_syntax_example_code_literal(line)
+
+            if "-" in line:
+                line = _INPUT_ARGUMENT_PATTERN.sub(_format_input_argument, line)
+
+            match = _EXAMPLE_PATTERN.match(line)
+            if match:
+                example, description = match.groups()
+                # Important: add one space at beginning of lines for proper rst indent
+                rewritten.append(f" **{example} -**")
+                rewritten.append(f" **{description}**::")
+            else:
+                rewritten.append(line)
 
-    Modifies the `lines` list in place.
+        lines[:] = rewritten
 
-    Args:
-        lines (list of str): List of lines in the Usage section.
-    """
+    def _replace_parenthesized(self, match):
+        return self._parenthesized_replacements.get(match.group(1), match.group(0))
 
-    # Regex pattern to match example lines with descriptions
-    example_pattern = re.compile(
-        r"^\s*(Example\s+\d+)\s*-\s*(.*)::\s*$"  # Matches 'Example X - Description:'
-    )
-
-    i = 0
-    while i < len(lines):
-        # Check if the current line matches the "Example X - Description:" format
-        match = example_pattern.match(lines[i])
-        if match:
-            example, description = match.groups()
-            # Replace the original line with two formatted lines
-            lines[i] = f" **{example} -**" # Important: add one space at beginning of line for proper rst indent
-            lines.insert(i + 1, f" **{description}**::") # Important: add one space at beginning of line for proper rst indent
-            i += 2  # Skip over the newly added line
-        else:
-            i += 1  # Move to the next line if no match
-
-
-def _format_nwbtype_shortnames(lines):
+
+def _format_required_property_values(line):
     """
-    Preprocesses a list of docstring lines to replace occurrences of patterns
-    with their respective :class:`pattern` references.
-    
-    Modifies the list of lines in place.
-    
-    Parameters:
-        lines (list of str): The docstring lines to preprocess.
+    Format the comma-separated values of the 'Required Properties' section.
+    Add single preceding space for proper indentation.
     """
+    values = line.strip().split(", ")
+    formatted_values = [
+        f":attr:`{value.strip()}`" if value.lower() != "none" else f"``{value.strip()}``"
+        for value in values
+    ]
+    return " " + ", ".join(formatted_values)
 
-    patterns = list_neurodata_types('core') + list_neurodata_types('hdmf_common') 
-    # Create a dictionary for replacements
-    replacements = {pattern: f"(:class:`{pattern}`)" for pattern in patterns}
-    
-    # Compile a regex that matches any of the patterns
-    regex = re.compile(r'\((' + '|'.join(map(re.escape, patterns)) + r')\)')
-
-    # Iterate over the lines and replace matches in place
-    for i in range(len(lines)):
-        lines[i] = regex.sub(lambda match: replacements[match.group(1)], lines[i])
 
+def _replace_meth_with_class(match):
+    display_name = match.group(1).replace("()", "").strip()  # The displayed name, e.g., "AbstractFeatureSeries"
+    namespace_prefix = match.group(2)  # The module path, e.g., "types.core"
+    class_name = match.group(3)  # The class name, e.g., "AbstractFeatureSeries"
+    return f":class:`{display_name} <{namespace_prefix}.{class_name}>`"
 
-def _is_section_header(line):
-    # Regex to identify section headers.
-    # Must start with a letter (not space) to avoid matching RST roles like
-    # :class:`X` where backtracking would let [A-Za-z ] match a leading space.
-    section_header_pattern = re.compile(r"^\s*%?\s*[A-Za-z][A-Za-z ]*:")
 
-    return section_header_pattern.match(line)
+def _make_syntax_example_code_literal(line):
+    """
+    Wrap a MATLAB expression in the Syntax section with double backticks.
+    """
+    # Strip RST role markup before matching: auto_link may have already
+    # converted identifiers to :class:`X <Y>` or :meth:`X() <Y>` roles.
+    # Syntax examples are code — links inside them are unwanted and also
+    # break the MATLAB expression pattern (line starts with ':' not a word).
+    clean = _ROLE_WITH_TARGET_PATTERN.sub(r'\1', line)
+    clean = _ROLE_PATTERN.sub(r'\1', clean)
+    clean, num_matches = _MATLAB_EXPRESSION_PATTERN.subn(lambda m: f"``{m.group(1)}``", clean)
+    if num_matches:
+        return " " + clean
+    return line
+
+
+def _format_input_argument(match):
+    name = match.group('name').strip()
+    argument_type = match.group('type')
+    formatted = f"{match.group('indent')}- **{name}**"
+    if not argument_type:  # No type provided
+        return formatted
+    argument_type = argument_type.strip()
+    if argument_type.startswith("``") or argument_type.startswith(":"):
+        # Already backtick-formatted or a Sphinx role
+        return f"{formatted} ({argument_type})"
+    return f"{formatted} (``{argument_type}``)"
@@ -0,0 +1,48 @@
+"""
+Support for parallel docs builds (sphinx-build -j).
+
+sphinxcontrib-matlabdomain declares itself unsafe for parallel reading
+because its domain does not implement merge_domaindata: objects and modules
+registered by the reading processes would be lost. This module adds the
+missing merge, after which the domain can be read in parallel.
+"""
+from sphinx.util import logging
+from sphinxcontrib.matlab import MATLABDomain
+
+logger = logging.getLogger(__name__)
+
+MATLAB_DOMAIN_EXTENSION = 'sphinxcontrib.matlab'
+
+
+def merge_matlab_domaindata(domain, docnames, otherdata):
+    """
+    Merge the objects and modules of the given documents from the domain data
+    of a reading process.
+
+    An object or module may be declared by several documents, e.g. every
+    neurodata type page declares the module "types.core". A serial build
+    reads documents in sorted order, so the last document wins; the same
+    document is chosen here regardless of the order the processes finish in.
+    """
+    for key in ("objects", "modules"):
+        data = domain.data[key]
+        for name, entry in otherdata[key].items():
+            docname = entry[0]
+            if docname not in docnames:
+                continue
+            if name not in data or data[name][0] <= docname:
+                data[name] = entry
+
+
+def enable_parallel_matlab_domain(app):
+    """
+    Add merge_domaindata to the MATLAB domain and mark sphinxcontrib.matlab as
+    safe for parallel reading. Call from setup() after the extension is loaded.
+    """
+    if MATLABDomain.merge_domaindata is not merge_matlab_domaindata:
+        MATLABDomain.merge_domaindata = merge_matlab_domaindata
+
+    extension = app.extensions.get(MATLAB_DOMAIN_EXTENSION)
+    if extension is not None and not extension.parallel_read_safe:
+        extension.parallel_read_safe = True
+        logger.verbose(f"{MATLAB_DOMAIN_EXTENSION}: enabled parallel reading")
@@ -1,43 +1,179 @@
+import hashlib
+import json
 import os
 import re
 import sys
+from concurrent.futures import ProcessPoolExecutor
 
-def replace_text_in_html_files(directory=None):
+OLD_TEXT = "Edit on GitHub"
+NEW_TEXT = "MatNWB on GitHub"
+MAIN_REPO_URL = "https://github.com/NeurodataWithoutBorders/matnwb"
+
+# Regex to match the href inside the GitHub link
+GITHUB_LINK_PATTERN = re.compile(r'(<a href=\")[^\"]*(\" class=\"fa fa-github\"> Edit on GitHub</a>)')
+
+# Files which were post-processed, with their modification time and size
+# after processing. Files that still match are skipped in the next run. The
+# manifest is stored next to the html folder, so it is not published with it.
+MANIFEST_FILE_NAME = '.postprocess_manifest.json'
+
+# Use a process pool when there are more files than this to process
+MIN_FILES_FOR_POOL = 64
+
+_SCAN_CHUNK_SIZE = 1 << 20
+_MARKER = OLD_TEXT.encode('utf-8')
+
+
+def replace_text_in_html_files(directory=None, processes=None, use_manifest=False):
+    """
+    Replace the "Edit on GitHub" link with a link to the MatNWB repository in
+    all html files of the built documentation.
+
+    Only files containing the link (or, as before, line endings to normalize)
+    are rewritten. With use_manifest, only files that are new or changed
+    since the last run are scanned. This helps local incremental builds;
+    builds from scratch, like on ReadTheDocs, have no previous run.
+
+    Args:
+        directory (str): Folder with the built html. Defaults to docs/build/html.
+        processes (int): Number of worker processes. Defaults to the number of CPUs.
+        use_manifest (bool): Skip files which are unchanged since the last run,
+            according to a manifest stored next to the directory.
+
+    Returns:
+        int: The number of files which were rewritten.
+    """
 
     if directory is None:
         # Get the absolute path of the script's directory
         script_dir = os.path.dirname(os.path.abspath(__file__))
-        
+
         # Create the absolute path for the built html
         directory = os.path.abspath(os.path.join(script_dir, '..', '..', 'build', 'html'))
 
-    old_text = "Edit on GitHub"
-    new_text = "MatNWB on GitHub"
-    main_repo_url = "https://github.com/NeurodataWithoutBorders/matnwb"
+    manifest_path = os.path.join(os.path.dirname(os.path.abspath(directory)), MANIFEST_FILE_NAME)
+    manifest = _load_manifest(manifest_path) if use_manifest else {}
 
+    updated_manifest = {}
+    file_paths = []
+    num_files = 0
     for root, _, files in os.walk(directory):
         for file in files:
-            if file.endswith(".html"):
-                file_path = os.path.join(root, file)
+            if not file.endswith(".html"):
+                continue
+            num_files += 1
+            file_path = os.path.join(root, file)
+            relative_path = os.path.relpath(file_path, directory)
+            signature = manifest.get(relative_path)
+            if signature is not None and signature == _get_signature(file_path):
+                updated_manifest[relative_path] = signature
+            else:
+                file_paths.append(file_path)
+
+    processes = processes or os.cpu_count() or 1
+    if processes > 1 and len(file_paths) >= MIN_FILES_FOR_POOL:
+        with ProcessPoolExecutor(max_workers=processes) as executor:
+            chunksize = max(1, len(file_paths) // (4 * processes))
+            results = list(executor.map(update_html_file, file_paths, chunksize=chunksize))
+    else:
+        results = [update_html_file(file_path) for file_path in file_paths]
+
+    num_updated = 0
+    for file_path, (is_updated, signature) in zip(file_paths, results):
+        updated_manifest[os.path.relpath(file_path, directory)] = signature
+        num_updated += is_updated
+
+    if use_manifest:
+        _save_manifest(manifest_path, updated_manifest)
+
+    print(f"Post-processed {num_files} html files: {len(file_paths)} new or changed, "
+          f"{num_updated} rewritten.")
+    return num_updated
+
+
+def update_html_file(file_path):
+    """
+    Replace the GitHub link in one html file, if present.
+
+    Returns:
+        tuple: (True if the file was rewritten, signature of the file)
+    """
+    if not _needs_rewrite(file_path):
+        return False, _get_signature(file_path)
+
+    # Read the file content
+    with open(file_path, "r", encoding="utf-8") as f:
+        content = f.read()
+
+    # Replace the href url using re.sub
+    replacement = r'\1' + MAIN_REPO_URL + r'\2'
+    updated_content = GITHUB_LINK_PATTERN.sub(replacement, content)
+
+    # Replace the text for the label
+    updated_content = updated_content.replace(OLD_TEXT, NEW_TEXT)
+
+    # Write the updated content to a temporary file and move it into place,
+    # so an interrupted run never leaves a partially written page
+    temp_path = f"{file_path}.{os.getpid()}.tmp"
+    with open(temp_path, "w", encoding="utf-8") as f:
+        f.write(updated_content)
+    os.replace(temp_path, file_path)
+    return True, _get_signature(file_path)
+
+
+def _needs_rewrite(file_path):
+    """
+    Scan a file in chunks, without decoding it, for the text to replace or
+    for line endings that rewriting the file in text mode normalizes.
+
+    Every page used to be rewritten in text mode, which converts line endings
+    to os.linesep. Pages without the link are still rewritten if that changes
+    them, so the output is the same as when every page was rewritten.
+    """
+    if os.linesep != '\n':
+        return True  # Whether "\n" would be converted can't be told from a scan
+    overlap = len(_MARKER) - 1
+    tail = b''
+    with open(file_path, 'rb') as f:
+        while True:
+            chunk = f.read(_SCAN_CHUNK_SIZE)
+            if not chunk:
+                return False
+            if b'\r' in chunk or _MARKER in tail + chunk:
+                return True
+            tail = chunk[-overlap:]
+
+
+def _get_signature(file_path):
+    stat = os.stat(file_path)
+    return [stat.st_mtime_ns, stat.st_size]
+
+
+def _get_manifest_version():
+    # Changing the replacement invalidates the manifest
+    settings = "\0".join((OLD_TEXT, NEW_TEXT, MAIN_REPO_URL, GITHUB_LINK_PATTERN.pattern))
+    return hashlib.sha256(settings.encode('utf-8')).hexdigest()
+
 
-                # Read the file content
-                with open(file_path, "r", encoding="utf-8") as f:
-                    content = f.read()
+def _load_manifest(manifest_path):
+    try:
+        with open(manifest_path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (FileNotFoundError, ValueError):
+        return {}
+    if data.get('version') != _get_manifest_version():
+        return {}
+    return data.get('files', {})
 
-                # Regex to match the href inside the GitHub link
-                pattern = r'(<a href=\")[^\"]*(\" class=\"fa fa-github\"> Edit on GitHub</a>)'
-                replacement = r'\1' + main_repo_url + r'\2'
-            
-                # Replace the href url using re.sub
-                updated_content = re.sub(pattern, replacement, content)
 
-                # Replace the text for the label
-                updated_content = updated_content.replace(old_text, new_text)
+def _save_manifest(manifest_path, files):
+    temp_path = f"{manifest_path}.{os.getpid()}.tmp"
+    with open(temp_path, "w", encoding="utf-8") as f:
+        json.dump({'version': _get_manifest_version(), 'files': files}, f)
+    os.replace(temp_path, manifest_path)
 
-                # Write the updated content back to the file
-                with open(file_path, "w", encoding="utf-8") as f:
-                    f.write(updated_content)
 
 if __name__ == '__main__':
+    # Usage: postprocess_html.py <html directory> [--manifest]
     directory = sys.argv[1]
-    replace_text_in_html_files(directory)
+    replace_text_in_html_files(directory, use_manifest='--manifest' in sys.argv[2:])
@@ -1,4 +1,4 @@
-function generateCore(version, options)
+function generationInfo = generateCore(version, options)
 % GENERATECORE - Generate Matlab classes from NWB core schema files
 %
 % Syntax:
@@ -17,7 +17,12 @@ function generateCore(version, options)
 %  classes between multiple namespaces.
 %
 %  Output files are placed in a ``+types`` subdirectory in the
-%  matnwb root directory directory.
+%  matnwb root directory directory. Existing class files are only
+%  rewritten if their content changes.
+%
+%  generationInfo = GENERATECORE(__) also returns a summary of the
+%  number of generated and unchanged classes for each namespace, see
+%  generateExtension.
 %
 % Usage:
 %  Example 1 - Generate core schemas for the latest version of NWB::
@@ -61,5 +66,9 @@ function generateCore(version, options)
         % Important: generate common before core if common is available
         namespaceFiles = [commonPath, namespaceFiles];
     end
-    generateExtension(namespaceFiles{:}, 'savedir', options.savedir);
+    if nargout > 0
+        generationInfo = generateExtension(namespaceFiles{:}, 'savedir', options.savedir);
+    else
+        generateExtension(namespaceFiles{:}, 'savedir', options.savedir);
+    end
 end
@@ -1,4 +1,4 @@
-function generateExtension(namespaceFilePath, options)
+function generationInfo = generateExtension(namespaceFilePath, options)
 % GENERATEEXTENSION - Generate Matlab classes from NWB extension schema file
 %
 % Syntax:
@@ -24,11 +24,23 @@ function generateExtension(namespaceFilePath, options)
 %    - savedir (string) -
 %      A folder to save generated classes for NWB/extension types.
 %
+% Output Arguments:
+%  - generationInfo (struct) -
+%    Struct array with one element per generated namespace and the fields
+%    Namespace, NumGenerated (number of class files written), NumUnchanged
+%    (number of existing class files which were already up to date and
+%    therefore not written) and ElapsedTime (in seconds).
+%
 % Usage:
 %  Example 1 - Generate classes for custom schema extensions::
 %
 %    generateExtension('schema\myext\myextension.namespace.yaml', 'schema\myext2\myext2.namespace.yaml');
 %
+%  Example 2 - Generate classes and show a summary::
+%
+%    generationInfo = generateExtension('schema\myext\myextension.namespace.yaml');
+%    disp(struct2table(generationInfo))
+%
 % See also:
 %   generateCore
 
@@ -45,6 +57,8 @@ function generateExtension(namespaceFilePath, options)
         'Please provide the file path to at least one namespace specification file.' ...
         )
 
+    namespaceInfo = struct('Namespace', {}, 'NumGenerated', {}, ...
+        'NumUnchanged', {}, 'ElapsedTime', {});
     for iNamespaceFiles = 1:length(namespaceFilePath)
 
         source = namespaceFilePath{iNamespaceFiles};
@@ -56,10 +70,16 @@ function generateExtension(namespaceFilePath, options)
         for iNamespace = 1:length(parsedNamespaceList)
             parsedNamespace = parsedNamespaceList(iNamespace);
             spec.saveCache(parsedNamespace, options.savedir);
-            file.writeNamespace(parsedNamespace.name, options.savedir);
+            namespaceInfo(end+1) = file.writeNamespace( ...
+                parsedNamespace.name, options.savedir); %#ok<AGROW>
         end
     end
-    rehash()
+    if sum([namespaceInfo.NumGenerated]) > 0
+        rehash()
+    end
+    if nargout > 0
+        generationInfo = namespaceInfo;
+    end
 end
 
 function mustBeYamlFile(filePath)
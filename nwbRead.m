@@ -20,6 +20,8 @@ function nwb = nwbRead(filename, flags, options)
 %    Flag for setting the mode for the NWBREAD operation. Available options are:
 %    'ignorecache'. If the 'ignorecache' flag is used, classes for NWB data
 %    types are not re-generated based on the embedded schemas in the file.
+%    Without the flag, classes are only re-generated for embedded schemas
+%    which differ from the schemas the existing classes were generated from.
 %
 %  - options (name-value pairs) -
 %    Optional name-value pairs. Available options:
@@ -30,6 +32,32 @@ function nwb = nwbRead(filename, flags, options)
 %    - StorageBackend (string) -
 %      Storage backend used for reading. Default: "auto".
 %
+%    - LazyLoadGroups (logical) -
+%      If true, neurodata types which are entries of sets (e.g. the
+%      TimeSeries of nwb.acquisition or the data interfaces of a processing
+%      module) are parsed when they are first accessed instead of when the
+%      file is read. Soft links are resolved when they are dereferenced.
+%      Default: false.
+%
+%    - UseParsedTreeCache (logical) -
+%      If true, the metadata tree of the file (groups, datasets and
+%      attributes) is cached on disk and reused when the same, unmodified
+%      file is read again, also in other MATLAB sessions. This makes reading
+%      a large file again much faster. A file counts as unmodified if its
+%      path, size, modification time and first 4 KiB are unchanged, so an
+%      in-place edit which keeps the size and the first 4 KiB and happens
+%      within the timestamp resolution of the file system can read a stale
+%      tree; call io.backend.hdf5.HDF5InfoCache.instance().clear() after
+%      such edits. See io.backend.hdf5.HDF5InfoCache for the location and
+%      size limit of the cache. Default: false.
+%
+% Note: By default, the file is closed when nwbRead returns and after
+% every read of its datasets. To keep it open between reads, set
+% io.backend.hdf5.HDF5HandlePool.instance().KeepFilesOpen = true. The
+% file can then not be written by other means than nwbExport (e.g.
+% h5writeatt) or by other processes until it is closed with
+% io.backend.hdf5.HDF5HandlePool.instance().clear().
+%
 % Output Arguments:
 %  - nwb (NwbFile) - Nwb file object
 %
@@ -49,6 +77,11 @@ function nwb = nwbRead(filename, flags, options)
 %
 %    nwb = nwbRead('data.nwb', 'savedir', '.');
 %
+%  Example 4 - Read a large NWB file, parsing groups only when they are accessed::
+%
+%    nwb = nwbRead('data.nwb', 'LazyLoadGroups', true);
+%    timeSeries = nwb.acquisition.get('ElectricalSeries'); % Parsed here
+%
 % See also:
 %   generateCore, generateExtension, NwbFile, nwbExport
     
@@ -61,12 +94,15 @@ function nwb = nwbRead(filename, flags, options)
     arguments
         options.savedir (1,1) string = misc.getMatnwbDir(); % {matnwb.common.compatibility.mustBeFolder} ?
         options.StorageBackend (1,1) string = "auto"
+        options.LazyLoadGroups (1,1) logical = false
+        options.UseParsedTreeCache (1,1) logical = false
     end
 
     shouldRegenerateSchemaClasses = not( any(strcmpi(string(flags), 'ignorecache')) );
 
     reader = io.backend.BackendFactory.createReader(filename, ...
-        StorageBackend=options.StorageBackend);
+        StorageBackend=options.StorageBackend, ...
+        UseInfoCache=options.UseParsedTreeCache);
 
     schemaVersionActive = matnwb.common.getActiveSchemaVersion();
     schemaVersionOfFile = reader.getSchemaVersion();
@@ -103,7 +139,8 @@ function nwb = nwbRead(filename, flags, options)
     softLinkWarningResetObj = types.untyped.SoftLink.disablePathDeprecationWarning(); %#ok<NASGU>
 
     try
-        nwb = io.parseGroup(filename, reader.readRootInfo(), blackList, reader);
+        nwb = io.parseGroup(filename, reader.readRootInfo(), blackList, reader, ...
+            options.LazyLoadGroups);
     catch ME
         if isSchemaVersionMismatch ...
                 && strcmp(ME.identifier, 'MATLAB:class:RequireSuperClass')
@@ -116,11 +153,18 @@ function nwb = nwbRead(filename, flags, options)
         end
     end
 
-    nwb.resolveSoftLinks()
+    if ~options.LazyLoadGroups
+        % Resolving all soft links would parse every group
+        nwb.resolveSoftLinks()
+    end
+    reader.close()
 end
 
 function generateEmbeddedSpec(filename, specLocation, options)
 % generateEmbeddedSpec - Generate embedded specifications / namespaces
+%
+% Namespaces whose embedded specification matches the one the classes in
+% savedir were generated from (see isGeneratedSpecUpToDate) are skipped.
     arguments
         filename (1,1) string {matnwb.common.compatibility.mustBeFile}
         specLocation (1,1) string
@@ -128,6 +172,15 @@ function generateEmbeddedSpec(filename, specLocation, options)
     end
 
     specs = io.spec.readEmbeddedSpecifications(filename, specLocation);
+    specs = specs(~cellfun('isempty', specs));
+    fingerprints = cellfun(@computeSpecFingerprint, specs, 'UniformOutput', false);
+    isUpToDate = cellfun(@(s, f) isGeneratedSpecUpToDate(s.namespaceName, f, options.savedir), ...
+        specs, fingerprints);
+    specs = specs(~isUpToDate);
+    fingerprints = fingerprints(~isUpToDate);
+    if isempty(specs)
+        return
+    end
     specNames = cell(size(specs));
 
     for iSpec = 1:numel(specs)
@@ -160,6 +213,8 @@ function generateEmbeddedSpec(filename, specLocation, options)
         name = specNames{iName};
         try
             file.writeNamespace(name, options.savedir);
+            saveSpecFingerprint(specs{iName}.namespaceName, name, ...
+                fingerprints{iName}, options.savedir)
         catch ME
             % Todo: Can this actually happen?
             if strcmp(ME.identifier, 'NWB:Namespace:CacheMissing')
@@ -177,6 +232,70 @@ function generateEmbeddedSpec(filename, specLocation, options)
         misc.cellPrettyPrint(missingNames));
 end
 
+function fingerprint = computeSpecFingerprint(specInfo)
+% computeSpecFingerprint - Hash of the text of an embedded specification.
+    schemaNames = sort(keys(specInfo.schemaMap));
+    schemaTexts = cellfun(@(name) toRowText(specInfo.schemaMap(name)), ...
+        schemaNames, 'UniformOutput', false);
+    parts = [{specInfo.namespaceName, toRowText(specInfo.namespaceText)}, ...
+        reshape([schemaNames; schemaTexts], 1, [])];
+    fingerprint = matnwb.common.internal.computeHash(strjoin(parts, char(0)));
+end
+
+function text = toRowText(text)
+    text = char(text);
+    text = text(:).';
+end
+
+function fingerprintFile = getFingerprintFile(namespaceName, saveDir)
+% getFingerprintFile - File with the fingerprint of the embedded
+% specification the classes of a namespace were last generated from. Saved
+% in a subfolder, as the namespaces folder must only contain caches.
+    fingerprintFile = fullfile(saveDir, 'namespaces', 'fingerprints', ...
+        [char(namespaceName) '.json']);
+end
+
+function tf = isGeneratedSpecUpToDate(namespaceName, fingerprint, saveDir)
+% isGeneratedSpecUpToDate - Check whether the cache and classes of a
+% namespace were generated from a specification with the given fingerprint.
+%
+% The fingerprint is only valid as long as the namespace cache has not been
+% rewritten (e.g. by generateCore) and the classes have not been deleted.
+    tf = false;
+    fingerprintFile = getFingerprintFile(namespaceName, saveDir);
+    if ~isfile(fingerprintFile)
+        return
+    end
+    try
+        record = jsondecode(fileread(fingerprintFile));
+    catch
+        return
+    end
+    cacheInfo = dir(fullfile(saveDir, 'namespaces', [record.namespace '.mat']));
+    classFileDir = fullfile(saveDir, '+types', ['+' misc.str2validName(record.namespace)]);
+    tf = strcmp(record.fingerprint, fingerprint) ...
+        && isscalar(cacheInfo) ...
+        && abs(cacheInfo.datenum - record.cacheModified) < 1e-6 ... % JSON rounding
+        && cacheInfo.bytes == record.cacheBytes ...
+        && isfolder(classFileDir);
+end
+
+function saveSpecFingerprint(namespaceName, parsedNamespaceName, fingerprint, saveDir)
+    fingerprintFile = getFingerprintFile(namespaceName, saveDir);
+    if ~isfolder(fileparts(fingerprintFile))
+        mkdir(fileparts(fingerprintFile));
+    end
+    cacheInfo = dir(fullfile(saveDir, 'namespaces', [parsedNamespaceName '.mat']));
+    record = struct( ...
+        'fingerprint', fingerprint, ...
+        'namespace', parsedNamespaceName, ...
+        'cacheModified', cacheInfo.datenum, ...
+        'cacheBytes', cacheInfo.bytes);
+    fid = fopen(fingerprintFile, 'w');
+    fileCleanup = onCleanup(@() fclose(fid));
+    fwrite(fid, jsonencode(record), 'char');
+end
+
 function warnIfUnsupportedSchemaVersion(schemaVersionOfFile)
     try
         matnwb.common.mustBeValidSchemaVersion(schemaVersionOfFile)
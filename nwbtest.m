@@ -29,6 +29,11 @@ function results = nwbtest(varargin)
     %     % Run only tests that match the ProcedureName 'testSmoke*'.
     %     nwbtest('ProcedureName', 'testSmoke*')
     %
+    %     % Run the PyNWB interop tests on a parallel pool (requires the
+    %     % Parallel Computing Toolbox). Code coverage is not produced for
+    %     % parallel runs.
+    %     nwbtest('Name', 'tests.system.*IOTest*', 'UseParallel', true)
+    %
     %   See also: matlab.unittest.TestSuite.fromPackage
     
     import matlab.unittest.TestSuite;
@@ -47,11 +52,15 @@ function results = nwbtest(varargin)
         parser.addParameter('Namespace', 'tests')
         parser.addParameter('ProduceCodeCoverage', true)
         parser.addParameter('ReportOutputFolder', '')
+        parser.addParameter('UseParallel', false)
 
         parser.parse(varargin{:});
+
+        useParallel = logical(parser.Results.UseParallel) && canRunInParallel();
+        produceCodeCoverage = parser.Results.ProduceCodeCoverage && ~useParallel;
         
         if isempty(parser.Results.ReportOutputFolder)
-            numReports = 1 + parser.Results.ProduceCodeCoverage;
+            numReports = 1 + produceCodeCoverage;
             [reportOutputFolder, folderCleanupObject] = createReportsFolder(numReports); %#ok<ASGLU>
         else
             reportOutputFolder = parser.Results.ReportOutputFolder;
@@ -73,7 +82,7 @@ function results = nwbtest(varargin)
         resultsFile = fullfile(reportOutputFolder, 'testResults.xml');
         runner.addPlugin(XMLPlugin.producingJUnitFormat(resultsFile));
                 
-        if parser.Results.ProduceCodeCoverage
+        if produceCodeCoverage
             filesForCoverage = getFilesForCoverage();
             if ~verLessThan('matlab', '9.3') && ~isempty(filesForCoverage)
                 coverageResultFile = fullfile(reportOutputFolder, 'coverage.xml');
@@ -83,7 +92,12 @@ function results = nwbtest(varargin)
         end % add cobertura coverage
 
         % Run tests
-        results = runner.run(suite);
+        if useParallel
+            parallelCleanupObject = prepareParallelRun(); %#ok<NASGU>
+            results = runner.runInParallel(suite);
+        else
+            results = runner.run(suite);
+        end
         
         if ~nargout
             display(results)
@@ -94,6 +108,37 @@ function results = nwbtest(varargin)
     end
 end
 
+function tf = canRunInParallel()
+    tf = ~isempty(ver('parallel')) && license('test', 'Distrib_Computing_Toolbox');
+    if ~tf
+        warning('NWB:Test:ParallelUnavailable', ...
+            'Parallel Computing Toolbox is not available. Running tests serially.')
+    end
+end
+
+function cleanupObject = prepareParallelRun()
+% prepareParallelRun - Prepare the MatNWB root folder for a parallel run.
+%
+%   Generated classes in the MatNWB root folder are shared by all pool
+%   workers, so they can not be cleared and regenerated by each worker's
+%   tests.fixtures.NwbClearGeneratedFixture. Clear them once here, tell the
+%   workers to leave the root folder alone, and regenerate the classes when
+%   the run is complete. Every worker generates the classes it uses in its
+%   own temporary folder (tests.fixtures.GenerateCoreFixture) and every
+%   test method runs in its own working folder, so the workers never share
+%   a file.
+
+    pool = gcp();
+    nwbClearGenerated();
+    wait( parfevalOnAll(pool, @setenv, 0, 'NWBTEST_PARALLEL_WORKER', '1') );
+    cleanupObject = onCleanup(@() finishParallelRun(pool));
+end
+
+function finishParallelRun(pool)
+    wait( parfevalOnAll(pool, @setenv, 0, 'NWBTEST_PARALLEL_WORKER', '') );
+    generateCore('savedir', misc.getMatnwbDir());
+end
+
 function pv = struct2pvcell(s)
     p = fieldnames(s);
     v = struct2cell(s);